@@ -5,6 +5,14 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+실시간 이벤트 스트림(/api/events/, core/events.py)은 연결을 계속 열어 두므로 이 ASGI 앱으로 제공해야 합니다.
+비동기 조회 API(core/async_views.py)도 ASGI에서 실행해야 DB 응답을 기다리는 동안 다른 요청을 처리합니다.
+
+운영(render.yaml에서 SERVER_MODE=asgi로 선택, 기본은 config.wsgi의 gthread 워커)
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT
+개발
+    uvicorn config.asgi:application --reload
 """
 
 import os
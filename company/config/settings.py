@@ -35,7 +35,9 @@ INSTALLED_APPS = [
 
 # --- 미들웨어 설정 ---
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',  # 다른 미들웨어 시간까지 재도록 맨 앞에 둡니다. (Server-Timing, /metrics)
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',  # 응답 본문을 읽고 쓰는 미들웨어보다 앞에 둡니다. (brotli/gzip)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,12 +68,20 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# --- 서버 실행 방식 (render.yaml의 startCommand와 같은 값) ---
+# wsgi(기본): gunicorn gthread 워커 (config.wsgi)
+# asgi: gunicorn + uvicorn 워커 (config.asgi). 대시보드 조회 API를 비동기 뷰로 연결하고 실시간 이벤트(/api/events/)를 제공합니다.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
 
 
 # --- 데이터베이스 설정 ---
 DATABASES = {
     'default': dj_database_url.config(
-        conn_max_age=600,
+        # ASGI에서는 sync_to_async 스레드마다 연결이 열리고 요청이 끝나도 닫히지 않아 쌓이므로 지속 연결을 끕니다.
+        # (Django 문서 권장. 연결 재사용이 필요하면 PgBouncer 같은 외부 연결 풀을 사용합니다.)
+        conn_max_age=0 if SERVER_MODE == "asgi" else 600,
         ssl_require=True  # Render에서 SSL 필수
     )
 }
@@ -118,7 +128,11 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # --- REST 프레임워크 설정 ---
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -130,3 +144,75 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "https://your-frontend.onrender.com",  # 실제 프론트 도메인으로 교체
 ]
+
+
+# --- 고객 엑셀 업로드 설정 ---
+# bulk_create 한 번(= 트랜잭션 하나)에 저장할 행 수
+CLIENT_IMPORT_BATCH_SIZE = int(os.getenv("CLIENT_IMPORT_BATCH_SIZE", "1000"))
+
+# --- 고객 목록 열(column) 형식 설정 ---
+# ?layout=columns 요청의 최대 page_size (가상 스크롤용으로 한 번에 많은 행을 받을 수 있습니다)
+CLIENT_COLUMNS_MAX_PAGE_SIZE = int(os.getenv("CLIENT_COLUMNS_MAX_PAGE_SIZE", "10000"))
+
+# ?updated_since= 동기화용 고객 제거 기록 보관 기간(일). 이보다 오래된 기준 시각으로 요청하면 전체 목록을 다시 받아야 합니다.
+CLIENT_TOMBSTONE_RETENTION_DAYS = int(os.getenv("CLIENT_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+# --- 캐시 설정 ---
+# CACHE_BACKEND: locmem(기본, 프로세스별) | file | redis (redis 패키지 필요)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+if CACHE_BACKEND == "redis":
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+    }}
+elif CACHE_BACKEND == "file":
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", os.path.join(BASE_DIR, 'cache')),
+    }}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# 시상 현황판/직원 요약 응답 캐시의 최대 유지 시간(초). 데이터 변경 시에는 즉시 무효화됩니다.
+VIEW_CACHE_TIMEOUT = int(os.getenv("VIEW_CACHE_TIMEOUT", "300"))
+
+# --- 실시간 이벤트(SSE) 설정 ---
+# EVENT_BROKER: memory(기본, 프로세스 안에서만 전달) | redis (redis 패키지 필요, 여러 프로세스) | 브로커 클래스 import 경로
+EVENT_BROKER = os.getenv("EVENT_BROKER", "memory")
+EVENT_BROKER_URL = os.getenv("EVENT_BROKER_URL", "redis://127.0.0.1:6379/2")
+
+# --- 백그라운드 작업 설정 (core/jobs.py) ---
+# JOB_WORKERS: 프로세스별 작업 스레드 수 (0이면 요청 스레드에서 커밋 직후 실행, 테스트/개발용)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# 이 시간(분)이 지나도 끝나지 않은 작업은 prune_jobs 명령이 실패로 표시합니다.
+JOB_TIMEOUT_MINUTES = int(os.getenv("JOB_TIMEOUT_MINUTES", "60"))
+# 끝난 작업과 입력/결과 파일의 보관 기간(일)
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+# --- Idempotency-Key 설정 (core/idempotency.py) ---
+# 같은 키의 재시도에 저장된 응답을 돌려주는 기간(시간)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+# 같은 키의 첫 요청이 처리 중일 때 재시도가 기다리는 최대 시간(초). 프록시 시간 제한보다 짧아야 합니다.
+IDEMPOTENCY_WAIT_SECONDS = int(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "25"))
+
+# --- 요청 계측 설정 (core/metrics.py) ---
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+# 응답에 Server-Timing 헤더를 붙일지 여부 (브라우저 개발자 도구의 Timing 탭에 표시)
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "True") == "True"
+# 개발용 N+1 감지: 한 요청에서 같은 SELECT가 NPLUSONE_THRESHOLD번 이상 반복되면 경고 로그 (기본: DEBUG일 때만, METRICS_ENABLED 필요)
+NPLUSONE_DETECTION = os.getenv("NPLUSONE_DETECTION", str(DEBUG)) == "True"
+NPLUSONE_THRESHOLD = int(os.getenv("NPLUSONE_THRESHOLD", "5"))
+# /metrics 수집용 Bearer 토큰. 비어 있으면 관리자 토큰으로만 조회할 수 있습니다.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- 느린 쿼리 샘플링 (core/slow_queries.py, GET /api/slow-queries/) ---
+# 이 시간(밀리초)보다 오래 걸린 쿼리를 실행 계획과 함께 기록합니다. 0이면 끕니다. (DB 연결이 만들어질 때 적용)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+# 프로세스별로 보관할 최근 느린 쿼리 수
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+# 느린 쿼리의 파라미터 값을 그대로 남길지 여부. 토큰 키나 비밀번호 해시가 담길 수 있으므로 기본은 타입과 길이만 남깁니다.
+SLOW_QUERY_PARAMS = os.getenv("SLOW_QUERY_PARAMS", "False") == "True"
+
+# 토큰 인증 결과(사용자, 그룹) 캐시 유지 시간(초). 로그아웃/권한 변경 시에는 즉시 무효화됩니다.
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv("AUTH_TOKEN_CACHE_TIMEOUT", "60"))
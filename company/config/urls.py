@@ -5,10 +5,13 @@ from rest_framework.authtoken.views import obtain_auth_token
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
     path('api-token-auth/', obtain_auth_token, name='api_token_auth'),
+    path('metrics', metrics_view, name='metrics'),  # Prometheus 수집 (core/metrics.py)
 ]
 
 # 개발 환경에서 미디어 파일에 접근할 수 있도록 URL 패턴을 추가합니다.
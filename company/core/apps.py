@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .metrics import install_sql_wrapper
+        from .slow_queries import install_slow_query_wrapper
+
+        # 새 DB 연결마다 요청 계측용 SQL 래퍼를 붙입니다. (계측 중인 요청이 없으면 바로 실행합니다)
+        connection_created.connect(install_sql_wrapper, dispatch_uid='core.metrics.install_sql_wrapper')
+        # SLOW_QUERY_MS가 설정되어 있으면 느린 쿼리 샘플링 래퍼도 붙입니다.
+        connection_created.connect(install_slow_query_wrapper, dispatch_uid='core.slow_queries.install_slow_query_wrapper')
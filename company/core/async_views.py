@@ -0,0 +1,202 @@
+# core/async_views.py
+"""
+비동기(async) 조회 API
+
+대시보드가 자주 부르는 조회 API(직원 요약, 관리자 통계, 시상 현황판, 오늘 출근 상태)를 Django 비동기 뷰와
+비동기 ORM(aaggregate, afirst, async for)으로 제공합니다. ASGI 서버(uvicorn 워커)에서는 DB 응답을 기다리는 동안
+같은 워커가 다른 요청을 처리하므로, 느린 요청 하나가 워커 전체를 막지 않습니다.
+
+urls.py는 SERVER_MODE=asgi일 때만 이 뷰들을 연결하고, 기본(WSGI)에서는 views.py의 같은 이름의 동기 DRF 뷰를 연결합니다.
+(WSGI에서 비동기 뷰는 요청마다 async_to_sync로 이벤트 루프를 거쳐 더 느립니다) 두 버전의 응답은 같아야 합니다.
+
+DRF APIView는 비동기 뷰를 지원하지 않으므로 async_api_view가 인증(CachedTokenAuthentication)과 권한 확인,
+JSON 응답(ORJSONRenderer)을 DRF와 같은 형식으로 처리합니다. 응답 내용과 캐시/ETag 동작은 기존 API와 같습니다.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.models import User
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .caching import BOARD_SCOPE, aget_or_compute, summary_scope
+from .conditional import aconditional_response, aversion_validators
+from .incentives import aget_incentive_table
+from .metrics import timing_render
+from .models import SUCCESS_STATUSES, AttendanceRecord, ClientData, ClientDailyStat
+from .permissions import is_admin
+from .renderers import ORJSONRenderer
+from .serializers import AttendanceRecordSerializer
+
+_renderer = ORJSONRenderer()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    with timing_render():
+        content = _renderer.render(data)
+    return HttpResponse(content, status=status_code, content_type=_renderer.media_type)
+
+
+def _authenticate(request, admin_only):
+    """DRF Request로 감싸 기본 인증 클래스로 사용자를 확인합니다. (테스트의 force_authenticate도 그대로 동작)"""
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    user = drf_request.user
+    # 관리자 전용 API에서만 그룹을 확인합니다. (직원용 API에 권한 쿼리를 더하지 않도록)
+    return user, admin_only and user.is_authenticated and is_admin(user)
+
+
+def async_api_view(admin_only=False):
+    """
+    GET 전용 비동기 API 뷰 데코레이터
+    - 인증 실패/미인증: 401, 관리자 전용인데 관리자가 아니면 403 (DRF와 같은 {'detail': ...} 형식)
+    - 인증된 사용자는 request.user에 담깁니다.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return json_response({'detail': exceptions.MethodNotAllowed(request.method).detail},
+                                     status.HTTP_405_METHOD_NOT_ALLOWED)
+            try:
+                user, admin = await sync_to_async(_authenticate)(request, admin_only)
+            except exceptions.AuthenticationFailed as exc:
+                return _unauthorized(exc.detail)
+            if not user.is_authenticated:
+                return _unauthorized(exceptions.NotAuthenticated.default_detail)
+            if admin_only and not admin:
+                return json_response({'detail': exceptions.PermissionDenied.default_detail}, status.HTTP_403_FORBIDDEN)
+            request.user = user
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _unauthorized(detail):
+    response = json_response({'detail': detail}, status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = 'Token'
+    return response
+
+
+# -------------------------------------------------------------------
+# 통계 및 대시보드 API
+# -------------------------------------------------------------------
+@async_api_view()
+async def get_my_summary(request):
+    """ 로그인한 직원의 이번 달 등록 고객 현황을 반환합니다. (캐시 사용) """
+    user = request.user
+    this_month = timezone.localdate().replace(day=1)
+
+    async def render():
+        summary = await aget_or_compute(
+            summary_scope(user.id), this_month.strftime('%Y-%m'), lambda: _compute_my_summary(user, this_month)
+        )
+        return json_response(summary)
+    return await aconditional_response(request, render, await aversion_validators(summary_scope(user.id)) + [this_month])
+
+async def _compute_my_summary(user, this_month):
+    """ 이번 달 등록 고객 현황을 일별 통계 테이블에서 합산합니다. """
+    status_counts = (
+        ClientDailyStat.objects.filter(owner=user, day__gte=this_month, day__lt=this_month + relativedelta(months=1))
+        .values('status').annotate(count=Sum('new_clients')).order_by()
+    )
+    summary = {'total': 0, 'PENDING': 0, 'ABSENT': 0, 'FAIL': 0, 'SUCCESS_1': 0, 'SUCCESS_2': 0, 'PROMISING': 0}
+    async for item in status_counts:
+        summary['total'] += item['count']
+        if item['status'] in summary:
+            summary[item['status']] = item['count']
+    success_count = summary['SUCCESS_1'] + summary['SUCCESS_2']
+    summary['success_rate'] = (success_count / summary['total'] * 100) if summary['total'] > 0 else 0
+    return summary
+
+@async_api_view(admin_only=True)
+async def get_performance_statistics(request):
+    """
+    관리자 대시보드 통계를 반환합니다.
+    요약/이번 달 실적과 6개월 계약 추이는 일별 통계 테이블(ClientDailyStat)에서 합산하고,
+    지역 TOP5는 자유 입력 주소(address) 기준이므로 ClientData에서 그룹 집계합니다. (총 3회)
+    """
+    this_month = timezone.localdate().replace(day=1)
+    next_month = this_month + relativedelta(months=1)
+    trend_start = this_month - relativedelta(months=5)
+    in_this_month = Q(day__gte=this_month, day__lt=next_month)
+
+    counts = await ClientDailyStat.objects.aaggregate(
+        total_clients=Coalesce(Sum('new_clients'), 0),
+        unassigned_clients=Coalesce(Sum('new_clients', filter=Q(is_distributed=False)), 0),
+        total_contracts=Coalesce(Sum('contracts'), 0),
+        new_clients=Coalesce(Sum('new_clients', filter=in_this_month), 0),
+        contracts=Coalesce(Sum('contracts', filter=in_this_month), 0),
+    )
+    summary_stats = {key: counts[key] for key in ('total_clients', 'unassigned_clients', 'total_contracts')}
+    monthly_stats = {key: counts[key] for key in ('new_clients', 'contracts')}
+
+    region_top5 = [row async for row in ClientData.objects.values('address').annotate(count=Count('id')).order_by('-count')[:5]]
+
+    contracts_by_month = {
+        row['month'].strftime("%Y-%m"): row['contracts']
+        async for row in ClientDailyStat.objects.filter(day__gte=trend_start, day__lt=next_month)
+        .annotate(month=TruncMonth('day')).values('month').annotate(contracts=Sum('contracts')).order_by()
+    }
+    monthly_trend = []
+    for i in range(5, -1, -1):
+        month = (this_month - relativedelta(months=i)).strftime("%Y-%m")
+        monthly_trend.append({'month': month, 'contracts': contracts_by_month.get(month, 0)})
+    return json_response({'summary': summary_stats, 'monthly_performance': monthly_stats, 'region_top5': region_top5, 'monthly_contract_trend': monthly_trend})
+
+@async_api_view()
+async def get_incentive_board_data(request):
+    """ 이번 달 상담사별 성공 건수와 해당 시상금을 반환합니다. (캐시 사용) """
+    this_month = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    async def render():
+        board_data = await aget_or_compute(
+            BOARD_SCOPE, this_month.strftime('%Y-%m'), lambda: _compute_incentive_board(this_month)
+        )
+        return json_response(board_data)
+    return await aconditional_response(request, render, await aversion_validators(BOARD_SCOPE) + [this_month.date()])
+
+async def _compute_incentive_board(this_month):
+    """
+    상담사별 성공 건수를 쿼리 한 번으로 집계하고 시상금 테이블에서 보상을 찾습니다. (쿼리 2회)
+    건수는 상담사마다 상관 서브쿼리로 세므로, 계약 고객 부분 인덱스(core_client_success_idx)의 (owner, updated_at) 범위만 읽습니다.
+    """
+    incentive_table = await aget_incentive_table()
+    success_counts = (
+        ClientData.objects.filter(
+            owner=OuterRef('pk'), status__in=SUCCESS_STATUSES,
+            updated_at__gte=this_month, updated_at__lt=this_month + relativedelta(months=1),
+        )
+        .order_by().values('owner').annotate(count=Count('id')).values('count')
+    )
+    staff_users = User.objects.filter(groups__name='Staff').annotate(
+        success_count=Coalesce(Subquery(success_counts), 0)
+    ).values('first_name', 'username', 'success_count')
+    board_data = [
+        {
+            'employee_name': user['first_name'] or user['username'],
+            'success_count': user['success_count'],
+            'reward_amount': incentive_table.reward_for(user['success_count']),
+        }
+        async for user in staff_users
+    ]
+    return sorted(board_data, key=lambda x: x['success_count'], reverse=True)
+
+
+# -------------------------------------------------------------------
+# 출퇴근 기록 API
+# -------------------------------------------------------------------
+@async_api_view()
+async def get_today_attendance_status(request):
+    record = await (
+        AttendanceRecord.objects.select_related('employee')
+        .filter(employee=request.user, work_date=timezone.now().date()).afirst()
+    )
+    if record:
+        return json_response(AttendanceRecordSerializer(record).data)
+    return json_response({})
@@ -0,0 +1,55 @@
+# core/authentication.py
+"""
+캐시를 사용하는 토큰 인증
+
+DRF TokenAuthentication은 요청마다 Token + User 조회 쿼리를 실행하고, 권한 확인에서 그룹 조회가 또 일어납니다.
+CachedTokenAuthentication은 토큰 → 사용자(그룹 이름 포함) 조회 결과를 AUTH_TOKEN_CACHE_TIMEOUT(초) 동안
+캐시에 보관하므로, 일반적인 인증 요청은 인증/권한 확인에 쿼리를 쓰지 않습니다.
+
+캐시는 다음 경우에 즉시 무효화됩니다. (signals.py)
+- 토큰 삭제(로그아웃) 및 재발급
+- 사용자 정보 저장(is_active 변경 등), 사용자 그룹 변경
+로컬 메모리 캐시(CACHE_BACKEND=locmem)는 프로세스마다 따로 있으므로, 워커가 여러 개라면 다른 워커의
+캐시는 TTL이 지나야 만료됩니다. 즉시 무효화가 필요하면 공유 캐시(redis, file)를 사용하세요.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .permissions import user_group_names
+
+
+def _cache_key(token_key):
+    # 토큰 원문을 캐시 키로 쓰지 않도록 해시합니다.
+    return 'core:auth:token:' + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+def invalidate_token(token_key):
+    cache.delete(_cache_key(token_key))
+
+
+def invalidate_user_tokens(user_id):
+    for token_key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(token_key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """토큰 → 사용자 조회와 사용자 그룹 목록을 캐시하는 TokenAuthentication"""
+
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            user_group_names(user)  # 그룹 이름을 사용자 객체에 담아 함께 캐시합니다.
+            cached = (user, token)
+            cache.set(cache_key, cached, timeout=getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 60))
+        user, token = cached
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return user, token
@@ -0,0 +1,155 @@
+# core/caching.py
+"""
+조회 API 응답 캐시 (시상 현황판, 직원별 요약) 및 조건부 요청(ETag)용 버전
+
+- 저장소는 Django 캐시 프레임워크(settings.CACHES)를 사용하므로 CACHE_BACKEND 설정으로
+  로컬 메모리 / 파일 / Redis 중에서 고를 수 있습니다.
+- 키에 버전 번호를 붙여 두고, 고객 현황/담당 직원이 바뀌거나 시상금 규칙이 바뀌면 버전을 올려 무효화합니다.
+  계산 도중 무효화가 일어나도 이전 버전 키에 저장되므로 오래된 값이 새 버전으로 보이지 않습니다.
+- 이벤트를 놓친 경우에도 VIEW_CACHE_TIMEOUT(초)이 지나면 만료됩니다.
+- 캐시가 비어 있을 때 동시에 들어온 요청 중 하나만 계산하고(single-flight), 나머지는 그 결과를 기다립니다.
+- 비동기 뷰(async_views.py)는 같은 키/버전을 쓰는 aget_version / aget_or_compute를 사용합니다.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+BOARD_SCOPE = 'incentive-board'
+SUMMARY_SCOPE = 'my-summary'
+# 아래 범위는 응답을 캐시하지 않고 ETag 버전으로만 사용합니다. (core/conditional.py)
+INCENTIVE_SCOPE = 'incentives'
+SITE_CONFIG_SCOPE = 'site-configurations'
+STAFF_SCOPE = 'staff'
+
+LOCK_TIMEOUT = 30       # 계산 중 잠금의 최대 유지 시간(초)
+WAIT_TIMEOUT = 5        # 다른 요청의 계산 결과를 기다리는 최대 시간(초)
+WAIT_INTERVAL = 0.05
+
+
+def _version_key(scope):
+    return f'core:version:{scope}'
+
+
+def get_version(scope):
+    version = cache.get(_version_key(scope))
+    if version is None:
+        # 버전 키가 없으면(최초 실행, 캐시 재시작) 현재 시각으로 시작하여 이전 값과 겹치지 않게 합니다.
+        cache.add(_version_key(scope), int(time.time() * 1000), timeout=None)
+        version = cache.get(_version_key(scope))
+    return version
+
+
+async def aget_version(scope):
+    version = await cache.aget(_version_key(scope))
+    if version is None:
+        await cache.aadd(_version_key(scope), int(time.time() * 1000), timeout=None)
+        version = await cache.aget(_version_key(scope))
+    return version
+
+
+def bump_version(scope):
+    try:
+        cache.incr(_version_key(scope))
+    except ValueError:
+        cache.set(_version_key(scope), int(time.time() * 1000), timeout=None)
+
+
+def summary_scope(user_id):
+    return f'{SUMMARY_SCOPE}:{user_id}'
+
+
+def _bump_after_commit(scopes):
+    # 트랜잭션 안에서 버전을 먼저 올리면, 커밋 전 데이터로 계산된 값이 새 버전에 저장될 수 있으므로 커밋 후에 올립니다.
+    transaction.on_commit(lambda: [bump_version(scope) for scope in scopes])
+
+
+def invalidate_client_views(owner_ids):
+    """고객의 현황 또는 담당 직원이 바뀌었을 때 호출합니다. (해당 직원들의 요약과 시상 현황판 무효화)"""
+    scopes = [summary_scope(owner_id) for owner_id in set(owner_ids) if owner_id is not None]
+    _bump_after_commit(scopes + [BOARD_SCOPE])
+
+
+def invalidate_incentive_views():
+    """시상금 규칙이 바뀌었을 때 호출합니다."""
+    _bump_after_commit([BOARD_SCOPE, INCENTIVE_SCOPE])
+
+
+def invalidate_site_config_views():
+    """사이트 설정이 바뀌었을 때 호출합니다."""
+    _bump_after_commit([SITE_CONFIG_SCOPE])
+
+
+def invalidate_staff_views():
+    """직원 정보/그룹 또는 출퇴근 기록이 바뀌었을 때 호출합니다. (직원 목록)"""
+    _bump_after_commit([STAFF_SCOPE])
+
+
+def get_or_compute(scope, key, compute, timeout=None):
+    """
+    scope의 현재 버전으로 key에 캐시된 값을 반환하고, 없으면 compute()로 계산해 저장합니다.
+    같은 키를 동시에 계산하는 요청은 하나뿐이며, 나머지는 최대 WAIT_TIMEOUT초 동안 결과를 기다립니다.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'VIEW_CACHE_TIMEOUT', 300)
+    cache_key = f'core:{scope}:{key}:v{get_version(scope)}'
+    value = cache.get(cache_key)
+    if value is not None:
+        return value
+
+    lock_key = f'{cache_key}:lock'
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(cache_key, value, timeout=timeout)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        value = cache.get(cache_key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            value = cache.get(cache_key)
+            if value is not None:
+                return value
+            break
+    # 계산하던 요청이 실패했거나 너무 오래 걸리면 직접 계산합니다.
+    return compute()
+
+
+async def aget_or_compute(scope, key, compute, timeout=None):
+    """get_or_compute의 비동기 버전입니다. compute는 코루틴 함수이며, 기다리는 동안 이벤트 루프를 막지 않습니다."""
+    if timeout is None:
+        timeout = getattr(settings, 'VIEW_CACHE_TIMEOUT', 300)
+    cache_key = f'core:{scope}:{key}:v{await aget_version(scope)}'
+    value = await cache.aget(cache_key)
+    if value is not None:
+        return value
+
+    lock_key = f'{cache_key}:lock'
+    if await cache.aadd(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = await compute()
+            await cache.aset(cache_key, value, timeout=timeout)
+            return value
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL)
+        value = await cache.aget(cache_key)
+        if value is not None:
+            return value
+        if await cache.aget(lock_key) is None:
+            value = await cache.aget(cache_key)
+            if value is not None:
+                return value
+            break
+    return await compute()
@@ -0,0 +1,92 @@
+# core/conditional.py
+"""
+조건부 GET (ETag / 304 Not Modified)
+
+응답 본문을 만들기 전에 값싼 검증자(validator)만 먼저 구해 If-None-Match와 비교하고,
+바뀌지 않았으면 조회/직렬화 없이 304를 반환합니다.
+
+- 고객 목록/상세: 필터된 QuerySet의 (MAX(updated_at), COUNT(*)) 쿼리 1회와 직원(STAFF_SCOPE) 버전
+  (응답의 담당 직원 이름이 바뀌어도 updated_at은 그대로이므로 직원 버전을 함께 넣습니다)
+- 시상금 규칙, 사이트 설정, 직원 목록, 직원별 요약, 시상 현황판: caching.py의 범위(scope)별 버전 번호
+  버전은 Django 캐시에 있으므로 프로세스별 캐시(locmem)에서는 다른 프로세스의 변경을 바로 알 수 없습니다.
+  그래서 버전 ETag에는 VIEW_CACHE_TIMEOUT 단위의 시간 구간을 함께 넣어, 응답 캐시와 같은 최대 지연만 허용합니다.
+
+Last-Modified는 보내지 않습니다. 초 단위 시각은 같은 초 안의 두 번째 수정, 최신 행이 아닌 행의 삭제,
+담당 직원 이름 변경을 드러내지 못해 If-Modified-Since만 보내는 클라이언트가 잘못된 304를 받기 때문입니다.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+
+from .caching import aget_version, get_version
+
+
+def make_etag(request, *parts):
+    """요청 경로/쿼리, 응답 형식(Accept), 사용자와 검증자 값으로 ETag를 만듭니다."""
+    source = '|'.join(str(part) for part in (
+        request.get_full_path(), getattr(request, 'accepted_media_type', ''), request.user.pk, *parts
+    ))
+    return '"%s"' % hashlib.md5(source.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def queryset_validators(queryset):
+    """(마지막 수정 시각, 행 수)를 반환합니다. 삭제는 행 수로, 생성/수정은 updated_at으로 드러납니다."""
+    state = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    return state['last_modified'], state['count']
+
+
+def version_validators(*scopes):
+    """범위별 현재 버전 번호와 VIEW_CACHE_TIMEOUT 단위의 시간 구간"""
+    return [get_version(scope) for scope in scopes] + [int(time.time() // settings.VIEW_CACHE_TIMEOUT)]
+
+
+async def aversion_validators(*scopes):
+    return [await aget_version(scope) for scope in scopes] + [int(time.time() // settings.VIEW_CACHE_TIMEOUT)]
+
+
+def conditional_response(request, render, etag_parts):
+    """
+    검증자가 요청의 If-None-Match와 일치하면 render()를 호출하지 않고 304를 반환합니다.
+    일치하지 않으면 render()가 만든 응답에 ETag를 붙여 반환합니다.
+    """
+    etag = make_etag(request, *etag_parts)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    response = render()
+    if response.status_code == 200:
+        response['ETag'] = etag
+    return response
+
+
+async def aconditional_response(request, render, etag_parts):
+    """conditional_response의 비동기 버전입니다. render는 응답을 돌려주는 코루틴 함수입니다."""
+    etag = make_etag(request, *etag_parts)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    response = await render()
+    if response.status_code == 200:
+        response['ETag'] = etag
+    return response
+
+
+class VersionConditionalMixin:
+    """list/retrieve 응답에 conditional_scopes의 버전으로 만든 ETag를 붙이고, 바뀌지 않았으면 304를 반환합니다."""
+    conditional_scopes = ()
+
+    def get_etag_parts(self):
+        return version_validators(*self.conditional_scopes)
+
+    def list(self, request, *args, **kwargs):
+        render = lambda: super(VersionConditionalMixin, self).list(request, *args, **kwargs)
+        return conditional_response(request, render, self.get_etag_parts())
+
+    def retrieve(self, request, *args, **kwargs):
+        render = lambda: super(VersionConditionalMixin, self).retrieve(request, *args, **kwargs)
+        return conditional_response(request, render, self.get_etag_parts())
@@ -0,0 +1,319 @@
+# core/distribution.py
+"""
+고객 배분(distribution) 로직
+
+배분 결과는 메모리에서 먼저 계산한 뒤(plan), 상담사별로 묶어
+`UPDATE ... SET owner_id, is_distributed, distribution_date, updated_at WHERE id IN (...)`
+형태로 한꺼번에 저장합니다(apply). 고객 한 명마다 save()를 호출하지 않으므로
+트랜잭션이 잡고 있는 행 잠금 시간이 고객 수에 비례해 늘어나지 않습니다.
+
+배분 방식
+- round_robin: 상담사 목록을 순서대로(또는 섞은 뒤) 돌아가며 배정합니다.
+- balanced: 상담사별 미처리(PENDING) 고객 수를 최소 힙으로 관리하여 부하가 가장 적은
+  상담사에게 먼저 배정합니다. (고객 n명, 상담사 k명일 때 O(n log k))
+  지역 우선 배정(region_affinity)과 상담사별 상한(max_open_per_staff)을 지원합니다.
+"""
+import heapq
+import random
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from .caching import invalidate_client_views
+from .events import publish_event
+from .models import ClientData
+from .stats import apply_deltas, deltas_for_update, merge_deltas
+from .sync import record_reassignments
+
+# SQLite의 바인드 변수 제한(999)을 넘지 않도록 IN (...) 목록을 나누는 크기
+UPDATE_CHUNK_SIZE = 900
+
+
+# 배분 방식
+STRATEGY_ROUND_ROBIN = 'round_robin'
+STRATEGY_BALANCED = 'balanced'
+STRATEGIES = (STRATEGY_ROUND_ROBIN, STRATEGY_BALANCED)
+
+# 지역 우선 배정 단위
+REGION_AFFINITY_LEVELS = ('sido', 'gugun')
+
+# 폼(multipart/x-www-form-urlencoded) 요청에서 여러 값으로 보내는 항목
+LIST_FIELDS = ('client_ids', 'staff_ids')
+
+# 지역 담당 상담사의 부하가 전체 최소 부하보다 이 값 이하로만 많으면 지역 담당자에게 배정합니다.
+DEFAULT_REGION_SLACK = 5
+
+
+def fetch_clients(client_ids):
+    """요청된 고객 ID 중 실제로 존재하는 고객의 (id, sido, gugun) 목록을 id 순으로 반환합니다."""
+    client_ids = list(client_ids)
+    found = []
+    for start in range(0, len(client_ids), UPDATE_CHUNK_SIZE):
+        found.extend(
+            ClientData.objects.filter(id__in=client_ids[start:start + UPDATE_CHUNK_SIZE])
+            .values_list('id', 'sido', 'gugun')
+        )
+    return sorted(found)
+
+
+def existing_client_ids(client_ids):
+    """요청된 고객 ID 중 실제로 존재하는 ID만 id 순으로 반환합니다."""
+    return [client_id for client_id, _, _ in fetch_clients(client_ids)]
+
+
+def _region_key(sido, gugun, level):
+    if not sido:
+        return None
+    return (sido, gugun or '') if level == 'gugun' else (sido,)
+
+
+def load_staff_workloads(staff_users, region_level=None):
+    """
+    상담사별 미처리(PENDING) 고객 수와 주 담당 지역을 집계 쿼리 한 번으로 가져옵니다.
+    반환값: ({상담사 id: 미처리 고객 수}, {상담사 id: 주 담당 지역 키 또는 None})
+    """
+    staff_ids = [staff.id for staff in staff_users]
+    workloads = dict.fromkeys(staff_ids, 0)
+    region_counts = {}
+    rows = (
+        ClientData.objects.filter(owner_id__in=staff_ids)
+        .values('owner_id', 'sido', 'gugun')
+        .annotate(total=Count('id'), pending=Count('id', filter=Q(status='PENDING')))
+        .order_by()
+    )
+    for row in rows:
+        workloads[row['owner_id']] += row['pending']
+        region = _region_key(row['sido'], row['gugun'], region_level)
+        if region is not None:
+            counts = region_counts.setdefault(row['owner_id'], {})
+            counts[region] = counts.get(region, 0) + row['total']
+    home_regions = {}
+    for staff_id in staff_ids:
+        counts = region_counts.get(staff_id)
+        # 가장 많은 고객을 담당하고 있는 지역을 주 담당 지역으로 봅니다.
+        home_regions[staff_id] = max(counts, key=lambda region: (counts[region], region)) if counts else None
+    return workloads, home_regions
+
+
+def _heap_top(heap, loads, capped):
+    """
+    힙의 최소 부하 상담사 항목을 반환합니다.
+    상한에 도달한 상담사는 제거하고, 다른 힙에서 배정되어 부하가 바뀐(stale) 항목은 현재 값으로 고칩니다.
+    상담사마다 힙 안의 항목은 하나뿐이므로 힙 크기는 항상 k 이하입니다.
+    """
+    while heap:
+        load, order, staff_id = heap[0]
+        if staff_id in capped:
+            heapq.heappop(heap)
+        elif load != loads[staff_id]:
+            heapq.heapreplace(heap, (loads[staff_id], order, staff_id))
+        else:
+            return heap[0]
+    return None
+
+
+def plan_balanced(clients, staff_users, workloads, home_regions=None, region_level=None,
+                  max_open_per_staff=None, region_slack=DEFAULT_REGION_SLACK):
+    """
+    (id, sido, gugun) 고객 목록을 부하가 가장 적은 상담사부터 배정한 계획을 반환합니다.
+    반환값: ({상담사 id: [고객 id, ...]}, [배정하지 못한 고객 id, ...])
+
+    - region_level('sido' 또는 'gugun')을 주면 고객 지역을 주로 담당하는 상담사의 부하가
+      전체 최소 부하 + region_slack 이하일 때 그 상담사에게 우선 배정합니다.
+    - max_open_per_staff를 주면 상담사의 미처리 고객 수(기존 + 신규)가 그 값을 넘지 않으며,
+      모든 상담사가 상한에 도달하면 남은 고객은 배정하지 않습니다.
+    """
+    loads = {staff.id: workloads.get(staff.id, 0) for staff in staff_users}
+    assignments = {staff.id: [] for staff in staff_users}
+    capped = set()
+    if max_open_per_staff is not None:
+        capped = {staff_id for staff_id, load in loads.items() if load >= max_open_per_staff}
+
+    global_heap = [(loads[staff.id], order, staff.id) for order, staff in enumerate(staff_users)]
+    heapq.heapify(global_heap)
+    region_heaps = {}
+    if region_level:
+        for order, staff in enumerate(staff_users):
+            region = (home_regions or {}).get(staff.id)
+            if region is not None:
+                region_heaps.setdefault(region, []).append((loads[staff.id], order, staff.id))
+        for heap in region_heaps.values():
+            heapq.heapify(heap)
+
+    unassigned = []
+    for client_id, sido, gugun in clients:
+        top = _heap_top(global_heap, loads, capped)
+        if top is None:
+            unassigned.append(client_id)
+            continue
+        heap = global_heap
+        region_heap = region_heaps.get(_region_key(sido, gugun, region_level)) if region_level else None
+        if region_heap:
+            region_top = _heap_top(region_heap, loads, capped)
+            if region_top is not None and region_top[0] <= top[0] + region_slack:
+                heap, top = region_heap, region_top
+
+        _, order, staff_id = top
+        assignments[staff_id].append(client_id)
+        loads[staff_id] += 1
+        if max_open_per_staff is not None and loads[staff_id] >= max_open_per_staff:
+            capped.add(staff_id)
+        else:
+            heapq.heapreplace(heap, (loads[staff_id], order, staff_id))
+    return assignments, unassigned
+
+
+def plan_round_robin(client_ids, staff_users, randomize=False):
+    """
+    고객 ID 목록을 상담사에게 순차(또는 상담사 순서를 섞은 뒤 순차) 배정한 계획을 반환합니다.
+    반환값: {상담사 id: [고객 id, ...]}
+    """
+    staff_users = list(staff_users)
+    if randomize:
+        random.shuffle(staff_users)
+    staff_count = len(staff_users)
+    assignments = {staff.id: [] for staff in staff_users}
+    for i, client_id in enumerate(client_ids):
+        assignments[staff_users[i % staff_count].id].append(client_id)
+    return assignments
+
+
+def describe_plan(assignments, staff_users, workloads=None):
+    """배분 계획을 미리보기(dry-run) 응답용 목록으로 변환합니다."""
+    return [
+        {
+            'staff_id': staff.id,
+            'staff_name': staff.first_name or staff.username,
+            'current_load': (workloads or {}).get(staff.id),
+            'assigned_count': len(assignments[staff.id]),
+            'client_ids': assignments[staff.id],
+        }
+        for staff in staff_users
+    ]
+
+
+def apply_distribution(assignments, distribution_date):
+    """배분 계획을 상담사별 UPDATE 문으로 저장하고, 갱신된 고객 수를 반환합니다."""
+    now = timezone.now()
+    updated = 0
+    stat_deltas = []
+    with transaction.atomic():
+        for staff_id, client_ids in assignments.items():
+            for start in range(0, len(client_ids), UPDATE_CHUNK_SIZE):
+                clients = ClientData.objects.filter(id__in=client_ids[start:start + UPDATE_CHUNK_SIZE])
+                stat_deltas.append(deltas_for_update(clients, owner_id=staff_id, is_distributed=True))
+                record_reassignments(clients, staff_id)
+                updated += clients.update(
+                    owner_id=staff_id, is_distributed=True,
+                    distribution_date=distribution_date, updated_at=now,
+                )
+        stat_deltas = merge_deltas(*stat_deltas)
+        apply_deltas(stat_deltas)
+    # 이전 담당 직원과 새 담당 직원의 요약 캐시를 무효화합니다.
+    invalidate_client_views({key[1] for key in stat_deltas} | set(assignments))
+    assigned = {staff_id: len(client_ids) for staff_id, client_ids in assignments.items() if client_ids}
+    publish_event('distribution.done', users=list(assigned), assigned={str(staff_id): count for staff_id, count in assigned.items()})
+    return updated
+
+
+def distribution_params(data):
+    """
+    요청 본문(QueryDict 또는 dict)을 작업 옵션으로 저장할 수 있는 dict로 바꿉니다.
+    QueryDict의 목록 항목(client_ids, staff_ids)은 마지막 값만 남지 않도록 getlist로 모두 읽습니다.
+    """
+    if not hasattr(data, 'getlist'):
+        return dict(data)
+    return {key: data.getlist(key) if key in LIST_FIELDS else data.get(key) for key in data}
+
+
+class DistributionOptionsSerializer(serializers.Serializer):
+    """배분 요청 값 검증 (distribute_clients 요청 본문, 배분 작업 옵션)"""
+    client_ids = serializers.ListField(child=serializers.IntegerField())
+    staff_ids = serializers.ListField(child=serializers.IntegerField())
+    distribution_date = serializers.DateField(input_formats=['%Y-%m-%d'])
+    strategy = serializers.ChoiceField(choices=STRATEGIES, default=STRATEGY_ROUND_ROBIN)
+    region_affinity = serializers.ChoiceField(choices=REGION_AFFINITY_LEVELS, required=False)
+    max_open_per_staff = serializers.IntegerField(min_value=0, required=False)
+    # true/false, 1/0 등만 허용합니다. (문자열 'false'를 참으로 읽지 않도록)
+    randomize = serializers.BooleanField(default=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        # 순차 배분은 부하와 지역을 보지 않으므로, 무시될 옵션은 받지 않습니다.
+        if attrs['strategy'] != STRATEGY_BALANCED:
+            for field in ('region_affinity', 'max_open_per_staff'):
+                if field in attrs:
+                    raise serializers.ValidationError(f"{field}는 strategy='balanced'에서만 사용할 수 있습니다.")
+        return attrs
+
+
+# 항목별 오류 메시지 (DRF 기본 메시지 대신 사용자에게 보여줍니다)
+_OPTION_ERRORS = {
+    'client_ids': 'client_ids는 고객 id(정수) 목록이어야 합니다.',
+    'staff_ids': 'staff_ids는 상담사 id(정수) 목록이어야 합니다.',
+    'distribution_date': '배분날짜(YYYY-MM-DD)가 올바르지 않습니다.',
+    'strategy': f"strategy는 {', '.join(STRATEGIES)} 중 하나여야 합니다.",
+    'region_affinity': "region_affinity는 'sido' 또는 'gugun'이어야 합니다.",
+    'max_open_per_staff': '상담사별 상한(max_open_per_staff)은 0 이상의 정수여야 합니다.',
+    'randomize': 'randomize 값은 true 또는 false여야 합니다.',
+    'dry_run': 'dry_run 값은 true 또는 false여야 합니다.',
+}
+
+
+def parse_distribution_options(data):
+    """
+    배분 요청 값(distribute_clients 요청 본문 또는 작업 옵션)을 DistributionOptionsSerializer로 검증하여 옵션 dict를 반환합니다.
+    값이 올바르지 않으면 사용자에게 보여줄 메시지로 ValueError를 발생시킵니다.
+    """
+    # 빈 문자열은 값을 보내지 않은 것으로 봅니다. (폼 요청의 빈 선택 항목)
+    data = {key: value for key, value in distribution_params(data).items() if value not in (None, '')}
+    if not all(data.get(field) for field in ('client_ids', 'staff_ids', 'distribution_date')):
+        raise ValueError('고객, 상담사, 배분날짜를 모두 선택해야 합니다.')
+    serializer = DistributionOptionsSerializer(data=data)
+    if not serializer.is_valid():
+        field, messages = next(iter(serializer.errors.items()))
+        raise ValueError(_OPTION_ERRORS.get(field) or str(messages[0]))
+    options = serializer.validated_data
+    return {
+        'client_ids': options['client_ids'], 'staff_ids': options['staff_ids'],
+        'distribution_date': options['distribution_date'], 'randomize': options['randomize'],
+        'strategy': options['strategy'], 'region_level': options.get('region_affinity'),
+        'max_open_per_staff': options.get('max_open_per_staff'), 'dry_run': options['dry_run'],
+    }
+
+
+def run_distribution(options):
+    """
+    parse_distribution_options의 옵션으로 배분 계획을 계산하고, dry_run이 아니면 저장합니다.
+    응답 본문(dict)을 반환하며, 유효한 상담사가 없으면 ValueError를 발생시킵니다.
+    """
+    staff_users = list(User.objects.filter(id__in=options['staff_ids'], groups__name='Staff').order_by('id'))
+    if not staff_users:
+        raise ValueError('유효한 상담사가 없습니다.')
+
+    # 실제 존재하는 고객만 조회한 뒤, 배분 계획은 메모리에서 계산하여 상담사별로 일괄 저장합니다.
+    if options['strategy'] == STRATEGY_BALANCED:
+        workloads, home_regions = load_staff_workloads(staff_users, options['region_level'])
+        assignments, unassigned_ids = plan_balanced(
+            fetch_clients(options['client_ids']), staff_users, workloads, home_regions,
+            region_level=options['region_level'], max_open_per_staff=options['max_open_per_staff'],
+        )
+    else:
+        workloads, unassigned_ids = None, []
+        assignments = plan_round_robin(existing_client_ids(options['client_ids']), staff_users, randomize=options['randomize'])
+
+    if options['dry_run']:
+        return {
+            'dry_run': True, 'strategy': options['strategy'],
+            'plan': describe_plan(assignments, staff_users, workloads),
+            'unassigned_client_ids': unassigned_ids,
+        }
+
+    distributed_count = apply_distribution(assignments, options['distribution_date'])
+    message = f'{distributed_count}명의 고객을 {len(staff_users)}명의 상담사에게 배분했습니다.'
+    if unassigned_ids:
+        message += f' (상한 초과로 {len(unassigned_ids)}명 미배분)'
+    return {'message': message, 'unassigned_client_ids': unassigned_ids}
@@ -0,0 +1,162 @@
+# core/events.py
+"""
+대시보드 실시간 이벤트 (Server-Sent Events)
+
+브라우저는 GET /api/events/?token=<토큰> 으로 EventSource 연결을 하나 열어 두고,
+변경이 있을 때만 작은 이벤트를 받아 해당 화면만 다시 불러옵니다. (통계/요약/직원/현황판 주기적 폴링 대체)
+
+이벤트 종류
+- client.status: 고객 현황 변경 {client_id, owner_id, status}
+- distribution.done: 고객 배분 완료 {assigned: {직원 id: 배정 수}}
+- attendance.check_in / attendance.check_out: 출퇴근 {employee_id}
+- incentive.rules: 시상금 규칙 변경 {}
+- job.done: 백그라운드 작업 종료 {job_id, kind, status} (요청자에게만)
+- resync: 이벤트가 밀려 일부를 버렸음. 화면 전체를 다시 불러와야 합니다.
+
+이벤트는 트랜잭션 커밋 후에 발행되며(publish_event), 관리자는 모든 이벤트를,
+직원은 대상(users)이 없거나 자신이 포함된 이벤트만 받습니다.
+
+브로커(EVENT_BROKER 설정)
+- memory(기본): 프로세스 안의 구독자에게만 전달합니다. 프로세스가 하나이거나 테스트/개발용입니다.
+- redis: Redis pub/sub 채널로 모든 프로세스에 전달합니다. (redis 패키지 필요, EVENT_BROKER_URL)
+- 그 밖의 값은 브로커 클래스의 import 경로로 보고 불러옵니다.
+  publish(event)와, aclose()를 가진 비동기 반복자를 돌려주는 subscribe()를 구현하면 됩니다.
+
+ASGI 서버 필수 (config.asgi, render.yaml의 SERVER_MODE=asgi)
+연결은 응답이 끝나지 않는 비동기 스트리밍입니다. WSGI는 비동기 스트림을 끝까지 읽은 뒤에 보내므로
+이 스트림은 WSGI에서 아무것도 보내지 못하고 워커 스레드만 영원히 점유합니다.
+그래서 기본 WSGI 서버에서는 GET /api/events/ 가 스트림을 열지 않고 501을 반환합니다. (views.event_stream)
+메모리 브로커의 구독은 프로세스 단위이므로, ASGI 워커가 여러 개면 redis 브로커를 사용해야 합니다.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+SUBSCRIBER_QUEUE_SIZE = 100
+RESYNC_EVENT = {'type': 'resync', 'data': {}, 'users': None}
+
+
+class InMemoryBroker:
+    """같은 프로세스의 구독자(asyncio 큐)에게 이벤트를 전달하는 브로커"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        # 시그널/뷰(동기 스레드)에서 호출되므로, 각 구독자의 이벤트 루프에 넘겨서 큐에 넣습니다.
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(_offer, subscription.queue, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 구독자(정리되지 않은 연결)는 빼고 나머지에게 계속 전달합니다.
+                self._unregister(subscription)
+
+    def subscribe(self):
+        """호출하는 즉시 등록되므로, 이후에 발행된 이벤트는 빠짐없이 받습니다. (실행 중인 이벤트 루프 안에서 호출)"""
+        return _Subscription(self)
+
+    def _register(self, subscription):
+        with self._lock:
+            self._subscribers.add(subscription)
+
+    def _unregister(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class _Subscription:
+    def __init__(self, broker):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        broker._register(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    async def aclose(self):
+        self.broker._unregister(self)
+
+
+def _offer(queue, event):
+    """큐가 가득 찬 느린 구독자에게는 밀린 이벤트를 버리고 resync 이벤트 하나만 남깁니다."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC_EVENT)
+
+
+class RedisBroker:
+    """Redis pub/sub 채널로 여러 프로세스의 구독자에게 이벤트를 전달하는 브로커"""
+
+    def __init__(self, url=None, channel='core:events'):
+        import redis
+        import redis.asyncio
+
+        self.url = url or getattr(settings, 'EVENT_BROKER_URL', 'redis://127.0.0.1:6379/2')
+        self.channel = channel
+        self._client = redis.Redis.from_url(self.url)
+        self._async_redis = redis.asyncio
+
+    def publish(self, event):
+        self._client.publish(self.channel, json.dumps(event, ensure_ascii=False))
+
+    async def subscribe(self):
+        client = self._async_redis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    yield json.loads(message['data'])
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await client.aclose()
+
+
+BROKERS = {'memory': InMemoryBroker, 'redis': RedisBroker}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                name = getattr(settings, 'EVENT_BROKER', 'memory')
+                _broker = (BROKERS.get(name) or import_string(name))()
+    return _broker
+
+
+def publish_event(event_type, users=None, **data):
+    """
+    트랜잭션 커밋 후 이벤트를 발행합니다.
+    users: 이 이벤트를 받을 직원 id 목록 (None이면 모든 사용자, 관리자는 항상 받습니다)
+    """
+    event = {'type': event_type, 'data': data, 'users': sorted(set(users)) if users is not None else None}
+    # 브로커 장애가 이미 커밋된 요청을 실패로 만들지 않도록 robust=True로 예외를 기록만 합니다.
+    transaction.on_commit(lambda: get_broker().publish(event), robust=True)
+
+
+def is_visible(event, user_id, admin):
+    return admin or event['users'] is None or user_id in event['users']
+
+
+def format_sse(event):
+    """이벤트 하나를 SSE 메시지(event/data 줄)로 변환합니다. 대상 목록(users)은 보내지 않습니다."""
+    payload = json.dumps(event['data'], ensure_ascii=False, separators=(',', ':'))
+    return f"event: {event['type']}\ndata: {payload}\n\n"
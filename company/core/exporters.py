@@ -0,0 +1,113 @@
+# core/exporters.py
+"""
+고객 데이터 엑셀/CSV 내보내기(export)
+
+- 담당 직원 이름은 values_list()의 owner__first_name JOIN으로 가져오므로 행 수와 무관하게 쿼리는 1회입니다.
+- iterator(chunk_size)로 행을 나누어 읽어 전체 QuerySet을 메모리에 올리지 않습니다.
+- CSV는 StreamingHttpResponse로 바로 흘려보내고, XLSX는 openpyxl write-only 워크북을
+  임시 파일에 기록한 뒤 FileResponse로 스트리밍합니다.
+- 백그라운드 작업(core/jobs.py)은 같은 함수(write_clients_csv/xlsx)로 결과 파일을 만듭니다.
+"""
+import csv
+import tempfile
+from datetime import datetime
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
+
+from .models import ClientData
+from .stats import day_range_bounds
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_HEADERS = ['고객명', '연락처', '주소', '상담사', '가입일', '상태', '메모']
+_EXPORT_FIELDS = ('name', 'contact', 'address', 'owner_id', 'owner__first_name', 'created_at', 'status', 'note')
+_STATUS_DISPLAY = dict(ClientData.STATUS_CHOICES)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def export_queryset(start_date_str=None, end_date_str=None):
+    """내보낼 고객 QuerySet과 파일 이름(확장자 제외)을 반환합니다. 날짜가 없거나 형식이 틀리면 전체를 내보냅니다."""
+    queryset = ClientData.objects.all().order_by('-created_at')
+    if start_date_str and end_date_str:
+        try:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return queryset, "client_data_all"
+        # created_at__date 대신 같은 구간의 created_at 범위로 조회하여 등록일 인덱스를 사용합니다.
+        start, end = day_range_bounds(start_date, end_date)
+        return queryset.filter(created_at__gte=start, created_at__lt=end), f"client_data_{start_date_str}_to_{end_date_str}"
+    return queryset, "client_data_all"
+
+
+def iter_client_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """QuerySet을 내보내기용 행(list)으로 변환하여 하나씩 돌려줍니다."""
+    rows = queryset.values_list(*_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for name, contact, address, owner_id, owner_first_name, created_at, status, note in rows:
+        yield [
+            name, contact, address,
+            owner_first_name if owner_id else '미지정',
+            created_at.strftime('%Y-%m-%d %H:%M'),
+            _STATUS_DISPLAY.get(status, status), note,
+        ]
+
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 반환하는 의사(pseudo) 버퍼"""
+    def write(self, value):
+        return value
+
+
+def write_clients_csv(queryset, output, progress=None):
+    """고객 데이터를 CSV(UTF-8 BOM, 엑셀 호환)로 텍스트 파일 output에 기록합니다."""
+    writer = csv.writer(output)
+    output.write('\ufeff')
+    writer.writerow(EXPORT_HEADERS)
+    for count, row in enumerate(iter_client_rows(queryset), start=1):
+        writer.writerow(row)
+        if progress and count % EXPORT_CHUNK_SIZE == 0:
+            progress(count)
+
+
+def stream_clients_csv(queryset, filename):
+    """고객 데이터를 CSV(UTF-8 BOM, 엑셀 호환)로 스트리밍합니다."""
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield '\ufeff' + writer.writerow(EXPORT_HEADERS)
+        for row in iter_client_rows(queryset):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def write_clients_xlsx(queryset, output, progress=None):
+    """고객 데이터를 write-only 워크북으로 output(바이너리 파일)에 기록합니다. progress(처리한 행 수)는 청크마다 호출됩니다."""
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title='고객 데이터')
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(worksheet, value=header)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+    for count, row in enumerate(iter_client_rows(queryset), start=1):
+        worksheet.append(row)
+        if progress and count % EXPORT_CHUNK_SIZE == 0:
+            progress(count)
+    workbook.save(output)
+
+
+def stream_clients_xlsx(queryset, filename):
+    """고객 데이터를 write-only 워크북으로 임시 파일에 기록한 뒤 스트리밍합니다."""
+    # 임시 파일은 FileResponse가 전송을 마치고 닫을 때 삭제됩니다.
+    output = tempfile.TemporaryFile()
+    write_clients_xlsx(queryset, output)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -0,0 +1,149 @@
+# core/idempotency.py
+"""
+무거운 POST 요청의 멱등성 (Idempotency-Key 헤더)
+
+관리자 화면이 느린 배분/엑셀 업로드 요청을 재시도하면 작업 전체가 다시 실행되어
+고객이 중복 등록되거나 배분이 다시 섞입니다. 요청에 Idempotency-Key 헤더가 있으면
+- 처음 온 요청: (사용자, 키)로 처리 중 기록을 먼저 커밋한 뒤 뷰를 실행하고, 응답(상태 코드, 본문)을 저장합니다.
+- 같은 키로 다시 온 요청: 저장된 응답을 그대로 돌려줍니다. (Idempotent-Replayed: true 헤더)
+- 첫 요청이 아직 처리 중이면 IDEMPOTENCY_WAIT_SECONDS 동안 기다렸다가 그 결과를 돌려주고,
+  그래도 끝나지 않으면 409와 Retry-After를 반환합니다.
+- 같은 키에 다른 경로/본문을 보내면 422를 반환합니다.
+
+5xx 응답이나 예외로 끝난 요청은 기록을 지우므로 같은 키로 다시 시도할 수 있습니다.
+기록은 IDEMPOTENCY_KEY_TTL_HOURS 동안 유효하며, 오래된 기록은 prune_jobs 명령이 함께 지웁니다.
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+WAIT_INTERVAL = 0.2
+# 처리 중 기록이 이 시간보다 오래되면 프로세스가 중단된 것으로 보고 새 요청이 이어받습니다.
+ABANDONED_AFTER = timedelta(minutes=10)
+
+
+def request_fingerprint(request):
+    """경로와 본문(업로드 파일은 내용 해시)으로 요청 지문을 만듭니다."""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode() + b' ' + request.path.encode())
+    data = request.data
+    items = data.lists() if hasattr(data, 'lists') else data.items()
+    for name, value in sorted(items, key=lambda item: item[0]):
+        digest.update(b'\0' + name.encode())
+        for part in (value if isinstance(value, list) and hasattr(data, 'lists') else [value]):
+            if isinstance(part, UploadedFile):
+                for chunk in part.chunks():
+                    digest.update(chunk)
+                part.seek(0)
+            else:
+                digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode())
+    return digest.hexdigest()
+
+
+def _error(message, status_code, **headers):
+    return Response({'error': message}, status=status_code, headers=headers)
+
+
+def _replay(record):
+    return Response(record.response_body, status=record.response_status, headers={'Idempotent-Replayed': 'true'})
+
+
+def _claim(user, key, fingerprint):
+    """
+    처리 중 기록을 만들어 이 요청이 처리를 맡으면 (None, True)를, 이미 기록이 있으면 (기록, False)를 반환합니다.
+    만료되었거나 중단된 기록은 이어받습니다.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return IdempotencyRecord.objects.create(user=user, key=key, fingerprint=fingerprint, created_at=now), True
+    except IntegrityError:
+        pass
+    record = IdempotencyRecord.objects.filter(user=user, key=key).first()
+    if record is None:
+        return _claim(user, key, fingerprint)
+    expired = record.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    abandoned = record.status == 'IN_PROGRESS' and record.created_at < now - ABANDONED_AFTER
+    if expired or abandoned:
+        # 조건부 UPDATE로 이어받으므로 동시에 여러 요청이 이어받지 않습니다.
+        taken = IdempotencyRecord.objects.filter(pk=record.pk, created_at=record.created_at).update(
+            fingerprint=fingerprint, status='IN_PROGRESS', response_status=None, response_body=None, created_at=now,
+        )
+        if taken:
+            record.refresh_from_db()
+            return record, True
+        record.refresh_from_db()
+    return record, False
+
+
+def _wait_for(record):
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while record is not None and record.status == 'IN_PROGRESS' and time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        record = IdempotencyRecord.objects.filter(pk=record.pk).first()
+    return record
+
+
+def idempotent(view):
+    """
+    Idempotency-Key 헤더를 지원하는 뷰 데코레이터 (@api_view 함수와 ViewSet 액션 모두 사용 가능)
+    트랜잭션 안에서 호출하면 다른 요청이 처리 중 기록을 볼 수 없으므로 ATOMIC_REQUESTS 없이 사용합니다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request = next(arg for arg in args if isinstance(arg, Request))
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f'{HEADER}는 {MAX_KEY_LENGTH}자를 넘을 수 없습니다.', status.HTTP_400_BAD_REQUEST)
+
+        fingerprint = request_fingerprint(request)
+        record, claimed = _claim(request.user, key, fingerprint)
+        if not claimed:
+            if record.fingerprint != fingerprint:
+                return _error(f'같은 {HEADER}로 다른 요청을 보낼 수 없습니다.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+            record = _wait_for(record)
+            if record is None:
+                # 기다리는 동안 첫 요청이 실패하여 기록이 지워졌습니다. 클라이언트가 다시 시도하면 처리됩니다.
+                return _error('같은 키의 이전 요청이 실패했습니다. 다시 시도해 주세요.', status.HTTP_409_CONFLICT, **{'Retry-After': '1'})
+            if record.status == 'IN_PROGRESS':
+                return _error('같은 키의 요청을 아직 처리 중입니다.', status.HTTP_409_CONFLICT,
+                              **{'Retry-After': str(settings.IDEMPOTENCY_WAIT_SECONDS)})
+            return _replay(record)
+
+        try:
+            response = view(*args, **kwargs)
+        except BaseException:
+            record.delete()
+            raise
+        if response.status_code >= 500 or not isinstance(response, Response):
+            record.delete()
+            return response
+        record.status, record.response_status, record.response_body = 'DONE', response.status_code, response.data
+        record.save(update_fields=['status', 'response_status', 'response_body'])
+        return response
+    return wrapper
+
+
+def prune_idempotency_records(now=None):
+    """유효 기간이 지난 기록을 지우고, 지운 행 수를 반환합니다."""
+    now = now or timezone.now()
+    deleted, _ = IdempotencyRecord.objects.filter(
+        created_at__lt=now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    ).delete()
+    return deleted
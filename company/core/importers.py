@@ -0,0 +1,137 @@
+# core/importers.py
+"""
+고객 엑셀 일괄 등록(import) 파이프라인
+
+- openpyxl read_only 모드로 한 행씩 읽으므로 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+- 행 단위로 검증한 뒤 batch_size 단위로 bulk_create 하며, 배치마다 별도의 트랜잭션을 사용합니다.
+- 실패한 행은 행 번호와 사유를 담은 오류 리포트로 반환합니다. (최대 MAX_REPORTED_ERRORS 건)
+"""
+import logging
+import time
+
+import openpyxl
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .models import ClientData
+from .stats import record_clients_created
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 500
+
+# 엑셀 컬럼 순서: 고객명, 연락처, 주소, 메모
+IMPORT_COLUMNS = ('name', 'contact', 'address', 'note')
+_MAX_LENGTHS = {
+    field: ClientData._meta.get_field(field).max_length
+    for field in ('name', 'contact', 'address')
+}
+_FIELD_LABELS = {'name': '고객명', 'contact': '연락처', 'address': '주소'}
+
+
+def resolve_batch_size(value=None):
+    """요청값 또는 설정값(CLIENT_IMPORT_BATCH_SIZE)을 1 ~ MAX_BATCH_SIZE 범위의 정수로 변환합니다."""
+    default = getattr(settings, 'CLIENT_IMPORT_BATCH_SIZE', 1000)
+    try:
+        batch_size = int(value) if value not in (None, '') else default
+    except (ValueError, TypeError):
+        batch_size = default
+    return max(1, min(batch_size, MAX_BATCH_SIZE))
+
+
+def _clean_cell(value):
+    """셀 값을 문자열로 정리합니다. (엑셀이 숫자로 저장한 연락처의 '.0' 제거 포함)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def validate_row(row):
+    """엑셀 한 행을 검증하여 (ClientData 인스턴스 또는 None, 오류 메시지 또는 None)을 반환합니다."""
+    values = dict(zip(IMPORT_COLUMNS, (_clean_cell(cell) for cell in tuple(row)[:len(IMPORT_COLUMNS)])))
+    for field in IMPORT_COLUMNS:
+        values.setdefault(field, '')
+
+    if not values['name']:
+        return None, '고객명이 비어 있습니다.'
+    if not values['contact']:
+        return None, '연락처가 비어 있습니다.'
+    for field, max_length in _MAX_LENGTHS.items():
+        if len(values[field]) > max_length:
+            return None, f'{_FIELD_LABELS[field]}은(는) {max_length}자를 넘을 수 없습니다.'
+    return ClientData(**values), None
+
+
+def _is_blank(row):
+    return not row or all(cell is None or str(cell).strip() == '' for cell in row)
+
+
+def import_clients_from_excel(excel_file, batch_size=None, progress=None):
+    """
+    엑셀 파일(첫 행은 헤더)을 스트리밍으로 읽어 ClientData를 일괄 생성하고 결과 리포트를 반환합니다.
+    progress(처리한 행 수, 전체 행 수)는 배치를 저장할 때마다 호출됩니다. (전체 행 수는 시트 크기 기준 추정값)
+
+    반환값 예시:
+        {'total_rows': 1000, 'created': 998, 'skipped': 3, 'error_count': 2,
+         'errors': [{'row': 15, 'error': '연락처가 비어 있습니다.'}, ...],
+         'batch_size': 1000, 'elapsed_seconds': 1.234, 'rows_per_second': 810.4}
+    """
+    batch_size = resolve_batch_size(batch_size)
+    report = {'total_rows': 0, 'created': 0, 'skipped': 0, 'error_count': 0, 'errors': []}
+
+    def add_error(row_number, message):
+        report['error_count'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': message})
+
+    def flush(batch, first_row, last_row):
+        try:
+            with transaction.atomic():
+                ClientData.objects.bulk_create(batch, batch_size=batch_size)
+                record_clients_created(batch)
+            report['created'] += len(batch)
+        except DatabaseError as e:
+            # 배치 하나가 실패해도 이미 커밋된 배치와 이후 배치는 영향을 받지 않습니다.
+            report['error_count'] += len(batch) - 1
+            add_error(f'{first_row}-{last_row}', f'저장 실패: {e}')
+
+    started = time.perf_counter()
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        total_rows = max((sheet.max_row or 1) - 1, 0)
+        batch, batch_first_row = [], None
+        for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            if _is_blank(row):
+                report['skipped'] += 1
+                continue
+            report['total_rows'] += 1
+            client, error = validate_row(row)
+            if error:
+                add_error(row_number, error)
+                continue
+            if not batch:
+                batch_first_row = row_number
+            batch.append(client)
+            if len(batch) >= batch_size:
+                flush(batch, batch_first_row, row_number)
+                batch = []
+                if progress:
+                    progress(row_number - 1, total_rows)
+        if batch:
+            flush(batch, batch_first_row, row_number)
+    finally:
+        workbook.close()
+
+    elapsed = time.perf_counter() - started
+    report['batch_size'] = batch_size
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['rows_per_second'] = round(report['total_rows'] / elapsed, 1) if elapsed > 0 else 0.0
+    logger.info(
+        '고객 엑셀 업로드: %d행 처리, %d건 생성, %d건 오류 (%.1f rows/sec)',
+        report['total_rows'], report['created'], report['error_count'], report['rows_per_second'],
+    )
+    return report
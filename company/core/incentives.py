@@ -0,0 +1,87 @@
+# core/incentives.py
+"""
+건수별 시상금(Incentive) 규칙 테이블
+
+Incentive.case_count 문자열("10", "3~4", "5~6건")을 한 번만 파싱하여 정렬된 구간 테이블로 컴파일하고,
+성공 건수에 해당하는 시상금은 bisect로 찾습니다. (규칙 r개일 때 O(log r))
+
+- "N": N건 이상, "A~B": A건 이상 B건 이하
+- 여러 규칙이 겹치면 시작 건수가 가장 큰(가장 높은 단계의) 규칙, 같으면 보상이 큰 규칙을 적용합니다.
+- 해석할 수 없는 규칙은 무시합니다.
+
+컴파일된 테이블은 프로세스마다 보관하며, 규칙 목록이 바뀐 경우(IncentiveViewSet.bulk_update 등)에만 다시 컴파일합니다.
+"""
+import threading
+from bisect import bisect_right
+
+from .models import Incentive
+
+
+def parse_case_count(case_count):
+    """조건 문자열을 (시작 건수, 끝 건수 또는 None) 으로 변환합니다. 해석할 수 없으면 None을 반환합니다."""
+    text = str(case_count).strip().removesuffix('건').strip()
+    try:
+        if '~' in text:
+            start, end = (int(part.strip()) for part in text.split('~', 1))
+            return (start, end) if start <= end else None
+        return (int(text), None) if text.isdigit() else None
+    except ValueError:
+        return None
+
+
+class IncentiveTable:
+    """성공 건수 구간별 시상금 조회 테이블"""
+
+    def __init__(self, rules):
+        intervals = []
+        for case_count, reward_amount in rules:
+            parsed = parse_case_count(case_count)
+            if parsed is not None:
+                intervals.append((parsed[0], parsed[1], reward_amount))
+
+        # 구간 경계마다 적용되는 시상금을 미리 계산해 둡니다.
+        boundaries = sorted({start for start, _, _ in intervals} | {end + 1 for _, end, _ in intervals if end is not None})
+        self._starts, self._rewards = [], []
+        for point in boundaries:
+            matching = [(start, reward) for start, end, reward in intervals if start <= point and (end is None or point <= end)]
+            reward = max(matching)[1] if matching else 0
+            if self._rewards and self._rewards[-1] == reward:
+                continue
+            self._starts.append(point)
+            self._rewards.append(reward)
+
+    def reward_for(self, success_count):
+        index = bisect_right(self._starts, success_count) - 1
+        return self._rewards[index] if index >= 0 else 0
+
+
+_lock = threading.Lock()
+_compiled = {'rules': None, 'table': None}
+
+
+def get_incentive_table(rules=None):
+    """
+    현재 규칙으로 컴파일된 IncentiveTable을 반환합니다.
+    규칙 조회는 작은 쿼리 1회이며, 이전과 같은 규칙이면 컴파일을 다시 하지 않으므로
+    다른 워커 프로세스에서 규칙이 바뀌어도 올바른 테이블을 사용합니다.
+    """
+    if rules is None:
+        rules = tuple(Incentive.objects.order_by('id').values_list('case_count', 'reward_amount'))
+    with _lock:
+        if _compiled['rules'] != rules:
+            _compiled['table'] = IncentiveTable(rules)
+            _compiled['rules'] = rules
+        return _compiled['table']
+
+
+async def aget_incentive_table():
+    """get_incentive_table의 비동기 버전 (규칙 조회만 비동기 ORM으로 합니다)"""
+    rules = tuple([rule async for rule in Incentive.objects.order_by('id').values_list('case_count', 'reward_amount')])
+    return get_incentive_table(rules)
+
+
+def refresh_incentive_table():
+    """규칙이 바뀐 직후 호출하여 테이블을 다시 컴파일합니다."""
+    with _lock:
+        _compiled['rules'] = None
+    return get_incentive_table()
@@ -0,0 +1,202 @@
+# core/jobs.py
+"""
+관리자 백그라운드 작업 (Job 모델)
+
+엑셀 업로드/내보내기와 대량 배분은 요청 안에서 실행하면 프록시 시간 제한에 걸리고 워커를 오래 점유하므로,
+요청은 작업을 등록(submit_job)하고 바로 202를 반환합니다. 작업은 트랜잭션 커밋 후 서버 프로세스 안의
+스레드 풀(JOB_WORKERS개)에서 실행되므로 별도의 브로커(Redis/Celery)가 필요 없습니다.
+
+- 진행률(progress)과 결과(result, result_file)는 Job 행에 기록되고, 끝나면 요청자에게 job.done 이벤트를 보냅니다.
+- 내보내기는 (필터, 고객 데이터의 MAX(updated_at)/COUNT, 직원 버전) 으로 만든 cache_key가 같은 완료/진행 중 작업이 있으면
+  새로 만들지 않고 그 작업(결과 파일)을 그대로 돌려줍니다. 고객 데이터나 직원 이름이 바뀌면 키가 달라집니다.
+- JOB_WORKERS=0이면 커밋 직후 요청 스레드에서 바로 실행합니다. (테스트/개발용)
+- 작업은 등록한 프로세스에서 실행되므로, 프로세스가 재시작되면 실행 중이던 작업은 남지 않습니다.
+  prune_jobs 명령이 JOB_TIMEOUT_MINUTES가 지나도 끝나지 않은 작업을 실패로 표시하고 오래된 작업과 파일을 지웁니다.
+"""
+import hashlib
+import io
+import json
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .caching import STAFF_SCOPE, get_version
+from .conditional import queryset_validators
+from .distribution import parse_distribution_options, run_distribution
+from .events import publish_event
+from .exporters import export_queryset, write_clients_csv, write_clients_xlsx
+from .importers import import_clients_from_excel
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    """kind 작업을 실행하는 함수를 등록합니다. 함수는 (job, progress)를 받아 결과(dict)를 반환합니다."""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+# -------------------------------------------------------------------
+# 등록 및 실행
+# -------------------------------------------------------------------
+def submit_job(kind, user, params=None, input_file=None, cache_key=''):
+    """작업을 등록하고, 트랜잭션 커밋 후 실행되도록 예약합니다."""
+    job = Job(kind=kind, params=params or {}, cache_key=cache_key, created_by=user)
+    if input_file is not None:
+        job.input_file.save(input_file.name, input_file, save=False)
+    job.save()
+    transaction.on_commit(lambda: _dispatch(job.pk))
+    return job
+
+
+def find_reusable_job(cache_key):
+    """같은 결과를 만드는 대기/실행 중 작업이나, 결과 파일이 남아 있는 완료 작업을 찾습니다."""
+    for job in Job.objects.filter(cache_key=cache_key, status__in=(*ACTIVE_STATUSES, 'SUCCEEDED')).order_by('-created_at')[:3]:
+        if job.status in ACTIVE_STATUSES or (job.result_file and job.result_file.storage.exists(job.result_file.name)):
+            return job
+    return None
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix='core-job')
+    return _executor
+
+
+def _dispatch(job_id):
+    if settings.JOB_WORKERS <= 0:
+        run_job(job_id)
+    else:
+        get_executor().submit(_run_in_worker, job_id)
+
+
+def _run_in_worker(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        # 작업 스레드가 연 DB 연결을 닫아, 스레드가 재사용될 때 끊긴 연결을 쓰지 않도록 합니다.
+        connections.close_all()
+
+
+def run_job(job_id):
+    """대기 중인 작업 하나를 실행하고 상태/결과를 기록합니다."""
+    if not Job.objects.filter(pk=job_id, status='PENDING').update(status='RUNNING', started_at=timezone.now()):
+        return
+    job = Job.objects.get(pk=job_id)
+    try:
+        result = JOB_HANDLERS[job.kind](job, _ProgressReporter(job_id))
+    except Exception as e:
+        logger.exception('백그라운드 작업 실패: %s', job)
+        job.status, job.error = 'FAILED', str(e)
+    else:
+        job.status, job.progress, job.result = 'SUCCEEDED', 100, result
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'result', 'result_file', 'error', 'finished_at'])
+    if job.created_by_id is not None:
+        publish_event('job.done', users=[job.created_by_id], job_id=job.pk, kind=job.kind, status=job.status)
+
+
+class _ProgressReporter:
+    """진행률이 바뀔 때만 UPDATE 하도록 마지막 값을 기억합니다. 완료 전에는 최대 99%입니다."""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.last = 0
+
+    def __call__(self, done, total):
+        percent = min(int(done * 100 / total), 99) if total else 0
+        if percent > self.last:
+            self.last = percent
+            Job.objects.filter(pk=self.job_id).update(progress=percent)
+
+
+def prune_jobs(now=None):
+    """
+    JOB_TIMEOUT_MINUTES가 지나도 끝나지 않은 작업을 실패로 표시하고,
+    JOB_RETENTION_DAYS가 지난 작업을 입력/결과 파일과 함께 지웁니다. (실패 처리 수, 삭제 수)를 반환합니다.
+    """
+    now = now or timezone.now()
+    stale = Job.objects.filter(status__in=ACTIVE_STATUSES, created_at__lt=now - timedelta(minutes=settings.JOB_TIMEOUT_MINUTES))
+    failed = stale.update(status='FAILED', error='작업이 제한 시간 안에 끝나지 않았습니다. (서버 재시작 등)', finished_at=now)
+    deleted = 0
+    for job in Job.objects.filter(created_at__lt=now - timedelta(days=settings.JOB_RETENTION_DAYS)).exclude(status__in=ACTIVE_STATUSES):
+        for field in (job.input_file, job.result_file):
+            if field:
+                field.delete(save=False)
+        job.delete()
+        deleted += 1
+    return failed, deleted
+
+
+# -------------------------------------------------------------------
+# 고객 내보내기
+# -------------------------------------------------------------------
+EXPORT_FORMATS = ('xlsx', 'csv')
+
+
+def export_cache_key(params):
+    """필터, 고객 데이터의 현재 상태(MAX(updated_at), COUNT)와 직원 버전(상담사 이름 열)으로 내보내기 결과 재사용 키를 만듭니다."""
+    queryset, _ = export_queryset(params.get('start_date'), params.get('end_date'))
+    last_modified, count = queryset_validators(queryset)
+    source = json.dumps(
+        ['CLIENT_EXPORT', params, last_modified.isoformat() if last_modified else None, count, get_version(STAFF_SCOPE)],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+@job_handler('CLIENT_EXPORT')
+def run_client_export(job, progress):
+    queryset, filename = export_queryset(job.params.get('start_date'), job.params.get('end_date'))
+    file_format = job.params.get('file_format', 'xlsx')
+    total = queryset.count()
+    report = lambda done: progress(done, total)
+    # 결과는 임시 파일에 기록한 뒤 저장소로 복사하므로 행 수와 무관하게 메모리 사용량이 일정합니다.
+    with tempfile.TemporaryFile() as output:
+        if file_format == 'csv':
+            text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+            write_clients_csv(queryset, text, progress=report)
+            text.detach()
+        else:
+            write_clients_xlsx(queryset, output, progress=report)
+        output.seek(0)
+        job.result_file.save(f"{filename}.{file_format}", File(output), save=False)
+    return {'rows': total, 'filename': f"{filename}.{file_format}"}
+
+
+# -------------------------------------------------------------------
+# 고객 엑셀 업로드
+# -------------------------------------------------------------------
+@job_handler('CLIENT_IMPORT')
+def run_client_import(job, progress):
+    with job.input_file.open('rb') as excel_file:
+        return import_clients_from_excel(excel_file, batch_size=job.params.get('batch_size'), progress=progress)
+
+
+# -------------------------------------------------------------------
+# 고객 배분
+# -------------------------------------------------------------------
+@job_handler('DISTRIBUTION')
+def run_distribution_job(job, progress):
+    return run_distribution(parse_distribution_options(job.params))
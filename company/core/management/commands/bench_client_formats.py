@@ -0,0 +1,42 @@
+import gzip
+import statistics
+import time
+
+import brotli
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.middleware import BROTLI_QUALITY
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.serializers import ClientDataColumnsSerializer, ClientDataListSerializer
+from .bench_serializers import build_clients
+
+
+class Command(BaseCommand):
+    help = "고객 목록 응답 형식(객체/열 형식, JSON/MessagePack)별 크기(bytes)와 직렬화+렌더링 시간을 비교합니다. (DB를 사용하지 않습니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='고객 수')
+        parser.add_argument('--repeat', type=int, default=5, help='반복 횟수')
+
+    def handle(self, *args, **options):
+        clients = build_clients(options['rows'])
+        self.stdout.write(f"고객 {len(clients):,}건, {options['repeat']}회 반복 (중앙값 기준)")
+        self.stdout.write(f"{'형식':<34} {'시간':>9} {'원본':>12} {'gzip':>11} {'brotli':>11}")
+
+        cases = (
+            ('객체 + DRF JSONRenderer', ClientDataListSerializer, JSONRenderer()),
+            ('객체 + ORJSONRenderer', ClientDataListSerializer, ORJSONRenderer()),
+            ('열 형식 + ORJSONRenderer', ClientDataColumnsSerializer, ORJSONRenderer()),
+            ('열 형식 + MessagePackRenderer', ClientDataColumnsSerializer, MessagePackRenderer()),
+        )
+        for label, serializer_class, renderer in cases:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                body = renderer.render({'results': serializer_class(clients, many=True).data})
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                f"{label:<34} {statistics.median(timings) * 1000:7.1f}ms {len(body):12,} "
+                f"{len(gzip.compress(body, compresslevel=6)):11,} {len(brotli.compress(body, quality=BROTLI_QUALITY)):11,}"
+            )
@@ -0,0 +1,145 @@
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from core import signals
+from core.distribution import apply_distribution, existing_client_ids, plan_round_robin
+from core.models import ClientDailyStat, ClientData, ClientTombstone
+from core.stats import apply_deltas, deltas_for_clients, record_clients_created
+
+# 기존 방식에는 없던 ClientData 저장 시그널 (일별 통계 증감, 제거 기록, 캐시 무효화, 이벤트)
+SAVE_RECEIVERS = (
+    (pre_save, signals.remember_previous_stat_key),
+    (post_save, signals.update_daily_stats_on_save),
+    (post_save, signals.record_reassignment_tombstone),
+)
+DELETE_RECEIVERS = (
+    (pre_delete, signals.update_daily_stats_on_delete),
+    (post_delete, signals.record_delete_tombstone),
+)
+
+
+def _negated(deltas):
+    return {key: (-new_clients, -contracts) for key, (new_clients, contracts) in deltas.items()}
+
+
+@contextmanager
+def _disconnected(receivers):
+    for signal, receiver in receivers:
+        signal.disconnect(receiver, sender=ClientData)
+    try:
+        yield
+    finally:
+        for signal, receiver in receivers:
+            signal.connect(receiver, sender=ClientData)
+
+
+class Command(BaseCommand):
+    help = (
+        "고객 배분의 기존(행별 save) 방식과 일괄 UPDATE 방식의 처리량, 잠금 유지 시간, 커밋 시간을 비교합니다. "
+        "방식마다 초기 상태로 되돌린 고객을 별도 트랜잭션으로 배분해 실제로 커밋하며, 가상 데이터는 측정 후 삭제합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=20000, help='배분할 고객 수')
+        parser.add_argument('--staff', type=int, default=30, help='상담사 수')
+        parser.add_argument('--skip-legacy', action='store_true', help='기존 방식 측정을 건너뜁니다.')
+        parser.add_argument(
+            '--legacy-with-signals', action='store_true',
+            help='기존 방식을 현재 저장 시그널을 켠 채로 한 번 더 측정해 따로 표시합니다.',
+        )
+
+    def handle(self, *args, **options):
+        client_ids, staff_users = self._seed(options['clients'], options['staff'])
+        try:
+            if not options['skip_legacy']:
+                # 기존 구현에는 저장 시그널이 없었으므로 기준값은 시그널을 끈 상태로 측정합니다.
+                with _disconnected(SAVE_RECEIVERS):
+                    self._report('기존 방식 (행별 save)', len(client_ids), self._run_legacy(client_ids, staff_users))
+                self._reset(client_ids, stats_recorded=False)
+                if options['legacy_with_signals']:
+                    self._report('기존 방식 (행별 save, 현재 시그널 포함)', len(client_ids),
+                                 self._run_legacy(client_ids, staff_users))
+                    self._reset(client_ids)
+            self._report('일괄 UPDATE 방식', len(client_ids), self._run_bulk(client_ids, staff_users))
+        finally:
+            self._cleanup(client_ids, staff_users)
+
+    def _seed(self, client_count, staff_count):
+        staff_users = User.objects.bulk_create(
+            [User(username=f'bench_staff_{i}', first_name=f'상담사{i}') for i in range(staff_count)]
+        )
+        with transaction.atomic():
+            clients = ClientData.objects.bulk_create(
+                [ClientData(name=f'벤치고객{i}', contact=f'010{i:08d}') for i in range(client_count)],
+                batch_size=2000,
+            )
+            record_clients_created(clients)
+        return [client.id for client in clients], staff_users
+
+    def _reset(self, client_ids, stats_recorded=True):
+        """
+        배분 전 상태(미배분, 담당 없음)로 되돌리고 측정 중 생긴 제거 기록을 지웁니다.
+        stats_recorded가 False이면 시그널을 끈 측정이라 일별 통계가 바뀌지 않았으므로 통계는 그대로 둡니다.
+        """
+        clients = ClientData.objects.filter(id__in=client_ids)
+        with transaction.atomic():
+            if stats_recorded:
+                apply_deltas(_negated(deltas_for_clients(clients)))
+            clients.update(owner=None, is_distributed=False, distribution_date=None)
+            if stats_recorded:
+                apply_deltas(deltas_for_clients(clients))
+            ClientTombstone.objects.filter(client_id__in=client_ids).delete()
+
+    def _cleanup(self, client_ids, staff_users):
+        clients = ClientData.objects.filter(id__in=client_ids)
+        staff_ids = [user.id for user in staff_users]
+        with transaction.atomic(), _disconnected(DELETE_RECEIVERS):
+            apply_deltas(_negated(deltas_for_clients(clients)))
+            clients.delete()
+            ClientTombstone.objects.filter(client_id__in=client_ids).delete()
+            # 가상 상담사의 집계 행은 위에서 0이 되었으므로, owner가 NULL로 남지 않게 먼저 지웁니다.
+            ClientDailyStat.objects.filter(owner_id__in=staff_ids).delete()
+            User.objects.filter(id__in=staff_ids).delete()
+
+    def _run_legacy(self, client_ids, staff_users):
+        """기존 distribute_clients 구현과 같은 방식: 고객마다 전체 컬럼 UPDATE"""
+        distribution_date = timezone.now().date()
+        started = time.perf_counter()
+        locked = started
+        with transaction.atomic():
+            staff_count = len(staff_users)
+            for i, client in enumerate(ClientData.objects.filter(id__in=client_ids)):
+                if i == 0:
+                    locked = time.perf_counter()
+                client.owner = staff_users[i % staff_count]
+                client.is_distributed = True
+                client.distribution_date = distribution_date
+                client.save()
+            committing = time.perf_counter()
+        finished = time.perf_counter()
+        return finished - started, finished - locked, finished - committing
+
+    def _run_bulk(self, client_ids, staff_users):
+        distribution_date = timezone.now().date()
+        started = time.perf_counter()
+        assignments = plan_round_robin(existing_client_ids(client_ids), staff_users)
+        locked = time.perf_counter()
+        # apply_distribution의 트랜잭션을 이 블록이 감싸므로, 블록을 빠져나올 때의 시간이 커밋 시간입니다.
+        with transaction.atomic():
+            apply_distribution(assignments, distribution_date)
+            committing = time.perf_counter()
+        finished = time.perf_counter()
+        return finished - started, finished - locked, finished - committing
+
+    def _report(self, label, row_count, timing):
+        elapsed, lock_held, commit = timing
+        self.stdout.write(
+            f'{label}: {row_count}건, 전체 {elapsed:.3f}s, 잠금 유지 {lock_held:.3f}s (커밋 {commit:.3f}s), '
+            f'{row_count / elapsed:,.0f} rows/sec'
+        )
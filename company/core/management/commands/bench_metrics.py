@@ -0,0 +1,90 @@
+import statistics
+import time
+
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from core import metrics
+from core.metrics import registry
+from core.middleware import MetricsMiddleware
+from core.models import ClientData
+
+ROUTES = ('clientdata-list', 'site-configuration-list', 'performance-statistics')
+
+
+class Command(BaseCommand):
+    help = "요청 계측 미들웨어(MetricsMiddleware)를 켜고 끈 상태의 요청 처리 시간을 비교합니다. 가상 데이터는 측정 후 롤백됩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='라우트/상태별 요청 수')
+        parser.add_argument('--rounds', type=int, default=5, help='켜기/끄기를 번갈아 반복할 횟수')
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*']):
+            admin = User.objects.create_user(username='bench-metrics-admin')
+            admin.groups.add(Group.objects.get_or_create(name='Admin')[0])
+            token = Token.objects.create(user=admin)
+            ClientData.objects.bulk_create([ClientData(name=f'고객{i}', contact='010') for i in range(200)])
+
+            clients = {}
+            for enabled in (False, True):
+                # 미들웨어 목록은 Client가 처음 요청할 때 읽으므로, 설정을 바꾼 상태에서 한 번 요청해 둡니다.
+                with override_settings(METRICS_ENABLED=enabled):
+                    client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+                    client.get(reverse(ROUTES[0]))
+                clients[enabled] = client
+
+            self.stdout.write(f"라우트별 {options['requests']}회 x {options['rounds']}라운드 (요청당 중앙값)")
+            for route in ROUTES:
+                timings = {False: [], True: []}
+                for _ in range(options['rounds']):
+                    for enabled in (False, True):
+                        timings[enabled].extend(self._measure(clients[enabled], reverse(route), options['requests']))
+                off, on = statistics.median(timings[False]), statistics.median(timings[True])
+                self.stdout.write(
+                    f"{route:<26} off {off * 1000:6.3f}ms  on {on * 1000:6.3f}ms  "
+                    f"+{(on - off) * 1e6:6.1f}µs ({(on - off) / off * 100:+.1f}%)"
+                )
+            self._micro(options['requests'] * options['rounds'])
+            registry.reset()
+            transaction.set_rollback(True)
+
+    def _micro(self, count):
+        """요청 간 편차 없이 미들웨어 자체 비용(요청당)과 SQL 래퍼 비용(쿼리당)만 잽니다."""
+        request = RequestFactory().get('/')
+        middleware = MetricsMiddleware(lambda request: HttpResponse())
+        started = time.perf_counter()
+        for _ in range(count):
+            middleware(request)
+        per_request = (time.perf_counter() - started) / count
+
+        metrics.install_sql_wrapper(connection)
+        per_query = {}
+        with connection.cursor() as cursor:
+            for active in (False, True):
+                token = metrics.begin_request()[1] if active else None
+                started = time.perf_counter()
+                for _ in range(count):
+                    cursor.execute('SELECT 1')
+                per_query[active] = (time.perf_counter() - started) / count
+                if token is not None:
+                    metrics.end_request(token)
+        self.stdout.write(
+            f"미들웨어 고정 비용: 요청당 {per_request * 1e6:.1f}µs | "
+            f"SELECT 1: 계측 없음 {per_query[False] * 1e6:.1f}µs, 계측 중 {per_query[True] * 1e6:.1f}µs "
+            f"(쿼리당 +{(per_query[True] - per_query[False]) * 1e6:.1f}µs)"
+        )
+
+    @staticmethod
+    def _measure(client, url, count):
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - started)
+        return timings
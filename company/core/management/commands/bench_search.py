@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import ClientData
+from core.search import search_clients
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서지현수영준호예은도윤하진우성'
+SIDO_GUGUN = [('서울', '강남구'), ('서울', '마포구'), ('부산', '해운대구'), ('대구', '수성구'), ('인천', '남동구'), ('경기', '수원시')]
+
+
+class Command(BaseCommand):
+    help = "고객 검색(?search=) 지연 시간을 측정합니다. 가상 데이터는 측정 후 롤백됩니다. (예: --rows 1000000)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='생성할 고객 수')
+        parser.add_argument('--repeat', type=int, default=20, help='검색어별 반복 횟수')
+        parser.add_argument('--terms', nargs='*', default=['홍길동', '5678', '해운대', '강남구 민서', '재통화'])
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options['rows'])
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('ANALYZE core_clientdata')
+            self.stdout.write(f"DB: {connection.vendor}, 고객 {options['rows']:,}건, 검색어별 {options['repeat']}회")
+            for term in options['terms']:
+                self._measure(term, options['repeat'])
+            transaction.set_rollback(True)
+
+    def _seed(self, rows):
+        rng = random.Random(42)
+        batch = []
+        for i in range(rows):
+            sido, gugun = rng.choice(SIDO_GUGUN)
+            batch.append(ClientData(
+                name=rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN),
+                contact=f'010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}',
+                address=f'{sido} {gugun} {rng.randint(1, 999)}번길', sido=sido, gugun=gugun,
+                note='재통화 요청' if i % 50 == 0 else '',
+            ))
+            if len(batch) == 5000:
+                ClientData.objects.bulk_create(batch)
+                batch = []
+        ClientData.objects.bulk_create(batch)
+
+    def _measure(self, term, repeat):
+        queryset = search_clients(ClientData.objects.order_by('-created_at'), term.split())[:50]
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.values_list('id', flat=True))
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        # 실행 계획에서 테이블/인덱스 접근 방식만 추려 인덱스 사용 여부를 보여줍니다.
+        scans = [
+            line.strip(' ->').split('  (')[0]
+            for line in queryset.explain().splitlines()
+            if 'Scan' in line or 'SCAN' in line or 'SEARCH' in line
+        ]
+        self.stdout.write(
+            f"'{term}': p50 {statistics.median(timings):.1f}ms, p95 {p95:.1f}ms | {'; '.join(scans)}"
+        )
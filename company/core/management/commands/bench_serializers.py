@@ -0,0 +1,57 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ClientData
+from core.serializers import ClientDataListSerializer, ClientDataSerializer
+
+
+class Command(BaseCommand):
+    help = "고객 목록 Serializer의 직렬화 속도(rows/sec)를 기존 ClientDataSerializer와 비교합니다. (DB를 사용하지 않습니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='직렬화할 고객 수')
+        parser.add_argument('--repeat', type=int, default=5, help='반복 횟수')
+
+    def handle(self, *args, **options):
+        clients = build_clients(options['rows'])
+        self.stdout.write(f"고객 {len(clients):,}건, {options['repeat']}회 반복 (중앙값 기준)")
+
+        baseline = None
+        for label, serializer_class in (('ClientDataSerializer', ClientDataSerializer),
+                                        ('ClientDataListSerializer', ClientDataListSerializer)):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                serializer_class(clients, many=True).data
+                timings.append(time.perf_counter() - started)
+            elapsed = statistics.median(timings)
+            rows_per_second = len(clients) / elapsed
+            baseline = baseline or rows_per_second
+            self.stdout.write(
+                f"{label:<26} {elapsed * 1000:8.1f}ms  {rows_per_second:12,.0f} rows/sec  x{rows_per_second / baseline:.1f}"
+            )
+
+
+def build_clients(rows):
+    """select_related('owner')로 조회한 것과 같은 상태의 고객 인스턴스를 메모리에서 만듭니다."""
+    rng = random.Random(42)
+    staff = [User(id=i, username=f'staff{i}', first_name=f'상담사{i}') for i in range(1, 21)]
+    now = timezone.now()
+    clients = []
+    for i in range(rows):
+        owner = rng.choice(staff) if i % 4 else None
+        clients.append(ClientData(
+            id=i + 1, owner=owner, name=f'고객{i}', contact=f'010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}',
+            address='서울 강남구 테헤란로', note='', employee_note=None, sido='서울', gugun='강남구',
+            gender=rng.choice('MF'), status=rng.choice(ClientData.STATUS_CHOICES)[0],
+            is_distributed=owner is not None, distribution_date=now.date() if owner else None,
+            audio_file='audio_files/sample.mp3' if i % 10 == 0 else None,
+            created_at=now - timedelta(minutes=i), updated_at=now,
+        ))
+    return clients
@@ -0,0 +1,296 @@
+import gzip
+import http.client
+import io
+import json
+import random
+import subprocess
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from urllib.parse import urlencode, urlsplit
+
+import brotli
+import openpyxl
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from .seed_bench_data import BENCH_CONTACT_PREFIX, SIDO_GUGUN
+
+DEFAULT_PATHS = ['/api/my-summary/', '/api/statistics/', '/api/incentive-board/', '/api/attendance/today/']
+OK_STATUSES = (200, 201, 202, 204)
+SEARCH_TERMS = ['김', '해운대', '재통화', '강남구', '0001']
+STATUSES = ['ABSENT', 'FAIL', 'PROMISING', 'SUCCESS_1', 'SUCCESS_2']
+PERCENTILES = (50, 95, 99)
+
+
+# -------------------------------------------------------------------
+# 시나리오: 가상 사용자가 한 번 반복할 때 보내는 요청 흐름 (세션, 난수, 옵션)
+# -------------------------------------------------------------------
+def consultant_flow(session, rng, options):
+    """상담사: 내 고객 목록 -> 검색/기간 필터 -> 고객 한 명 현황 수정 -> 내 요약"""
+    page = session.get_json('clientdata-list', '/api/clientdata/')
+    today = timezone.localdate()
+    session.get('clientdata-filter', '/api/clientdata/?' + urlencode({
+        'search': rng.choice(SEARCH_TERMS), 'ordering': '-created_at',
+        'start_date': (today - timedelta(days=30)).isoformat(), 'end_date': today.isoformat(),
+    }))
+    if page and page.get('results'):
+        client = rng.choice(page['results'])
+        session.send_json('clientdata-update', 'PATCH', f"/api/clientdata/{client['id']}/", {
+            'status': rng.choice(STATUSES), 'employee_note': f'통화 {rng.randint(1, 99)}회차',
+        })
+    session.get('my-summary', '/api/my-summary/')
+
+
+def admin_flow(session, rng, options):
+    """관리자: 대시보드 -> 미배분 고객/직원 조회 -> 배분(계획만) -> 엑셀 업로드 -> 최근 30일 내보내기"""
+    for label, path in (('performance-statistics', '/api/statistics/'), ('incentive-board', '/api/incentive-board/'),
+                        ('attendance-today', '/api/attendance/today/')):
+        session.get(label, path)
+    staff = session.get_json('staff-list', '/api/staff/') or []
+    unassigned = session.get_json('clientdata-unassigned', '/api/clientdata/?distributed=false&ordering=owner__first_name&page_size=100')
+    if staff and unassigned and unassigned.get('results'):
+        # 반복 실행해도 데이터가 바뀌지 않도록 배분 계획만 계산합니다. (dry_run)
+        session.send_json('distribute-clients', 'POST', '/api/distribute/', {
+            'client_ids': [client['id'] for client in unassigned['results']],
+            'staff_ids': [user['id'] for user in staff],
+            'distribution_date': timezone.localdate().isoformat(), 'strategy': 'balanced', 'dry_run': True,
+        })
+    if options['upload_rows']:
+        session.upload('upload-clients', '/api/upload-clients/', 'excel_file', 'bench.xlsx', options['upload_file'])
+    today = timezone.localdate()
+    session.get('download-clients', '/api/download-clients/?' + urlencode({
+        'file_format': 'csv', 'start_date': (today - timedelta(days=30)).isoformat(), 'end_date': today.isoformat(),
+    }))
+
+
+def dashboard_flow(session, rng, options):
+    """관리자 대시보드 조회 API만 차례로 요청합니다. (--paths로 경로 변경 가능)"""
+    for path in options['paths']:
+        session.get(path, path)
+
+
+SCENARIOS = {
+    'consultant': consultant_flow,
+    'admin': admin_flow,
+    'dashboard': dashboard_flow,
+    'mixed': None,  # 사용자 10명 중 1명은 admin, 나머지는 consultant
+}
+
+
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, label, elapsed, ok):
+        with self.lock:
+            if ok:
+                self.timings[label].append(elapsed)
+            else:
+                self.errors[label] += 1
+
+
+class _Session:
+    """가상 사용자 한 명: 연결 하나를 유지(keep-alive)하며 요청하고, 라벨(엔드포인트)별 지연 시간을 기록합니다."""
+
+    def __init__(self, target, token, recorder):
+        self.target = target
+        self.connection_class = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+        self.connection = self.connection_class(target.netloc, timeout=60)
+        self.headers = {'Authorization': f'Token {token}', 'Accept-Encoding': 'gzip, br'}
+        self.recorder = recorder
+
+    def request(self, label, method, path, body=None, content_type=None):
+        headers = dict(self.headers)
+        if content_type:
+            headers['Content-Type'] = content_type
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            ok = response.status in OK_STATUSES
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = self.connection_class(self.target.netloc, timeout=60)
+            response, data, ok = None, b'', False
+        self.recorder.record(label, time.perf_counter() - started, ok)
+        return (response, data) if ok else (None, None)
+
+    def get(self, label, path):
+        return self.request(label, 'GET', path)
+
+    def get_json(self, label, path):
+        response, data = self.get(label, path)
+        if response is None:
+            return None
+        encoding = response.getheader('Content-Encoding')
+        if encoding == 'br':
+            data = brotli.decompress(data)
+        elif encoding == 'gzip':
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    def send_json(self, label, method, path, payload):
+        return self.request(label, method, path, json.dumps(payload).encode('utf-8'), 'application/json')
+
+    def upload(self, label, path, field, filename, content):
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+        return self.request(label, 'POST', path, body, f'multipart/form-data; boundary={boundary}')
+
+    def close(self):
+        self.connection.close()
+
+
+def _upload_file(rows, seed):
+    """업로드 시나리오용 엑셀 파일 (연락처는 seed_bench_data와 같은 000- 규칙)"""
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['고객명', '연락처', '주소', '메모'])
+    for i in range(rows):
+        sido, gugun = rng.choice(SIDO_GUGUN)
+        sheet.append([f'업로드{i}', f'{BENCH_CONTACT_PREFIX}9{rng.randrange(10 ** 7):07d}', f'{sido} {gugun}', ''])
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def _percentile(sorted_timings, percent):
+    return sorted_timings[min(len(sorted_timings) - 1, int(len(sorted_timings) * percent / 100))]
+
+
+def _summary(timings, errors, wall):
+    summary = {'requests': len(timings), 'errors': errors, 'rps': round(len(timings) / wall, 2)}
+    if timings:
+        timings = sorted(timings)
+        for percent in PERCENTILES:
+            summary[f'p{percent}_ms'] = round(_percentile(timings, percent) * 1000, 2)
+    return summary
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버에 동시 사용자 부하를 주고 엔드포인트별 p50/p95/p99 지연 시간과 처리량(RPS)을 측정합니다.\n"
+        "  1) 벤치마크 전용 DB에서 seed_bench_data로 데이터와 토큰 파일을 만들고 서버를 띄웁니다.\n"
+        "  2) load_test --tokens-file bench_tokens.json --scenario mixed --output results.json\n"
+        "  3) 다른 커밋에서 같은 조건으로 실행하고 --baseline results.json으로 비교합니다.\n"
+        "시나리오: consultant(목록/검색/수정/요약), admin(대시보드/배분 계획/업로드/내보내기), dashboard(조회 API), mixed.\n"
+        "admin 시나리오의 업로드는 매번 고객을 추가하므로, 커밋 간 비교는 같은 시드로 새로 만든 DB에서 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='서버 주소')
+        parser.add_argument('--tokens-file', help='seed_bench_data가 만든 토큰 파일')
+        parser.add_argument('--token', help='인증 토큰 (--tokens-file 대신 dashboard 시나리오에 사용, 관리자 토큰이어야 통계 API까지 측정됩니다)')
+        parser.add_argument('--scenario', choices=SCENARIOS, default='dashboard')
+        parser.add_argument('--users', type=int, default=50, help='동시 사용자 수')
+        parser.add_argument('--duration', type=float, default=20, help='측정 시간(초)')
+        parser.add_argument('--paths', nargs='*', default=DEFAULT_PATHS, help='dashboard 시나리오에서 차례로 요청할 경로')
+        parser.add_argument('--upload-rows', type=int, default=200, help='admin 시나리오의 엑셀 업로드 행 수 (0이면 업로드 생략)')
+        parser.add_argument('--seed', type=int, default=1, help='시나리오 난수 시드 (사용자별로 seed+번호)')
+        parser.add_argument('--output', help='결과를 기록할 JSON 파일')
+        parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일')
+
+    def handle(self, *args, **options):
+        target = urlsplit(options['url'])
+        if target.scheme not in ('http', 'https'):
+            raise CommandError('--url은 http(s)://호스트:포트 형식이어야 합니다.')
+        admin_token, staff_tokens = self._tokens(options)
+        if options['scenario'] in ('consultant', 'mixed') and not staff_tokens:
+            raise CommandError(f"{options['scenario']} 시나리오는 직원 토큰이 든 --tokens-file이 필요합니다.")
+        if options['scenario'] in ('admin', 'dashboard', 'mixed') and not admin_token:
+            raise CommandError('관리자 토큰(--token 또는 --tokens-file)이 필요합니다.')
+        if options['scenario'] in ('admin', 'mixed') and options['upload_rows']:
+            options['upload_file'] = _upload_file(options['upload_rows'], options['seed'])
+
+        recorder = _Recorder()
+        deadline = time.perf_counter() + options['duration']
+
+        def user(number):
+            flow = SCENARIOS[options['scenario']]
+            token = admin_token
+            if flow is None:
+                flow = admin_flow if number % 10 == 0 else consultant_flow
+            if flow is consultant_flow:
+                token = staff_tokens[number % len(staff_tokens)]
+            session = _Session(target, token, recorder)
+            rng = random.Random(options['seed'] + number)
+            while time.perf_counter() < deadline:
+                flow(session, rng, options)
+            session.close()
+
+        threads = [threading.Thread(target=user, args=(n,)) for n in range(options['users'])]
+        started_at = timezone.now()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        labels = sorted(set(recorder.timings) | set(recorder.errors))
+        result = {
+            'commit': _git_commit(),
+            'started_at': started_at.isoformat(),
+            'url': options['url'],
+            'scenario': options['scenario'],
+            'users': options['users'],
+            'duration_s': round(wall, 2),
+            'total': _summary([t for label in labels for t in recorder.timings[label]], sum(recorder.errors.values()), wall),
+            'endpoints': {label: _summary(recorder.timings[label], recorder.errors[label], wall) for label in labels},
+        }
+        self._report(result)
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as f:
+                self._compare(json.load(f), result)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과: {options['output']}")
+
+    def _tokens(self, options):
+        if options['tokens_file']:
+            with open(options['tokens_file'], encoding='utf-8') as f:
+                tokens = json.load(f)
+            return options['token'] or tokens.get('admin'), tokens.get('staff', [])
+        return options['token'], []
+
+    def _report(self, result):
+        self.stdout.write(
+            f"{result['url']} | {result['scenario']} | 동시 사용자 {result['users']}명, {result['duration_s']:.1f}초 | 커밋 {result['commit']}"
+        )
+        self.stdout.write(f"{'엔드포인트':<28} {'요청':>7} {'오류':>5} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for label, summary in [*result['endpoints'].items(), ('전체', result['total'])]:
+            latencies = ' '.join(f"{summary[f'p{p}_ms']:7.1f}ms" if f'p{p}_ms' in summary else f"{'-':>9}" for p in PERCENTILES)
+            self.stdout.write(f"{label:<28} {summary['requests']:>7,} {summary['errors']:>5} {summary['rps']:>8,.1f} {latencies}")
+
+    def _compare(self, baseline, result):
+        """이전 결과 대비 처리량과 p95 변화 (엔드포인트별)"""
+        self.stdout.write(f"기준 결과 대비 (커밋 {baseline.get('commit')} -> {result['commit']})")
+        rows = [*result['endpoints'].items(), ('전체', result['total'])]
+        for label, summary in rows:
+            before = baseline['total'] if label == '전체' else baseline.get('endpoints', {}).get(label)
+            if not before or not before.get('rps') or 'p95_ms' not in before or 'p95_ms' not in summary:
+                continue
+            self.stdout.write(
+                f"{label:<28} req/s {(summary['rps'] / before['rps'] - 1) * 100:+6.1f}%  "
+                f"p95 {before['p95_ms']:.1f}ms -> {summary['p95_ms']:.1f}ms ({(summary['p95_ms'] / before['p95_ms'] - 1) * 100:+.1f}%)"
+            )
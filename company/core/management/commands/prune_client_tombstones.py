@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "보관 기간(CLIENT_TOMBSTONE_RETENTION_DAYS)이 지난 고객 제거 기록(ClientTombstone)을 지웁니다."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'{settings.CLIENT_TOMBSTONE_RETENTION_DAYS}일이 지난 고객 제거 기록 {deleted}건을 지웠습니다.'
+        ))
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.idempotency import prune_idempotency_records
+from core.jobs import prune_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "제한 시간(JOB_TIMEOUT_MINUTES)이 지나도 끝나지 않은 백그라운드 작업을 실패로 표시하고, "
+        "보관 기간(JOB_RETENTION_DAYS)이 지난 작업과 입력/결과 파일, 유효 기간이 지난 Idempotency-Key 기록을 지웁니다."
+    )
+
+    def handle(self, *args, **options):
+        failed, deleted = prune_jobs()
+        records = prune_idempotency_records()
+        self.stdout.write(self.style.SUCCESS(
+            f'끝나지 않은 작업 {failed}건을 실패로 표시하고, '
+            f'{settings.JOB_RETENTION_DAYS}일이 지난 작업 {deleted}건과 '
+            f'{settings.IDEMPOTENCY_KEY_TTL_HOURS}시간이 지난 Idempotency-Key 기록 {records}건을 지웠습니다.'
+        ))
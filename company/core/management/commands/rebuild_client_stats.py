@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.stats import rebuild_daily_stats
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        raise CommandError(f'날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}')
+
+
+class Command(BaseCommand):
+    help = "고객 일별 통계(ClientDailyStat)를 ClientData에서 다시 계산합니다. 기간을 주지 않으면 전체를 재계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='재계산 시작 등록일 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='재계산 종료 등록일 (YYYY-MM-DD, 포함)')
+
+    def handle(self, *args, **options):
+        start_date, end_date = _parse_date(options['start']), _parse_date(options['end'])
+        if start_date and end_date and start_date > end_date:
+            raise CommandError('시작일이 종료일보다 늦을 수 없습니다.')
+        created = rebuild_daily_stats(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f'일별 통계 {created}행을 다시 계산했습니다.'))
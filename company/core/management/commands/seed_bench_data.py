@@ -0,0 +1,169 @@
+import json
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.caching import invalidate_client_views, invalidate_incentive_views, invalidate_staff_views
+from core.incentives import refresh_incentive_table
+from core.models import AttendanceRecord, ClientData, Incentive, PerformanceRecord
+from core.stats import rebuild_daily_stats
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서지현수영준호예은도윤하진우성'
+SIDO_GUGUN = [
+    ('서울', '강남구'), ('서울', '마포구'), ('서울', '송파구'), ('부산', '해운대구'), ('부산', '부산진구'),
+    ('대구', '수성구'), ('인천', '남동구'), ('광주', '서구'), ('대전', '유성구'), ('경기', '수원시'), ('경기', '성남시'),
+]
+# 배분된 고객의 현황 분포 (작업전이 가장 많고 계약은 드뭅니다)
+STATUS_WEIGHTS = {'PENDING': 40, 'ABSENT': 20, 'FAIL': 15, 'PROMISING': 10, 'SUCCESS_1': 10, 'SUCCESS_2': 5}
+RECORD_TYPES = ('통화', '계약')
+INCENTIVES = [('1~2건', 50000), ('3~4건', 150000), ('5~6건', 300000), ('7건 이상', 500000)]
+BENCH_PASSWORD = 'bench'
+# 벤치마크 고객 연락처는 실제 번호와 겹치지 않는 000- 으로 시작합니다. (load_test의 업로드 파일도 같은 규칙)
+BENCH_CONTACT_PREFIX = '000-'
+BATCH_SIZE = 5000
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """bulk_create가 auto_now/auto_now_add 값을 현재 시각으로 덮어쓰지 않도록 잠시 끕니다."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "부하 테스트(load_test)용 가상 데이터를 bulk insert로 빠르게 만듭니다. (고객, 직원, 출퇴근/실적 기록)\n"
+        "같은 --seed면 같은 데이터가 만들어지고, 날짜는 실행일 기준 최근 --days일에 퍼집니다.\n"
+        "운영 DB가 아닌 벤치마크 전용 DB에서 실행하세요. 관리자/직원 토큰은 --tokens-file에 기록됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=20000, help='고객 수')
+        parser.add_argument('--staff', type=int, default=20, help='상담사(Staff) 수')
+        parser.add_argument('--days', type=int, default=180, help='고객 등록일/출퇴근/실적 기록을 퍼뜨릴 기간(일)')
+        parser.add_argument('--assigned', type=float, default=0.7, help='상담사에게 배분된 고객 비율')
+        parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+        parser.add_argument('--tokens-file', default='bench_tokens.json', help='생성한 관리자/직원 토큰을 기록할 파일')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith='bench-').exists():
+            raise CommandError('이미 벤치마크 데이터가 있습니다. 빈 DB에서 migrate 후 다시 실행하세요.')
+        if options['staff'] < 1 or options['days'] < 1:
+            raise CommandError('--staff, --days는 1 이상이어야 합니다.')
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+
+        with transaction.atomic():
+            admin, staff = self._create_users(options['staff'])
+            self._create_clients(rng, staff, options['clients'], options['days'], options['assigned'], now)
+            attendance = self._create_attendance(rng, staff, options['days'], now)
+            performance = self._create_performance(rng, staff, options['days'], now)
+            if not Incentive.objects.exists():
+                Incentive.objects.bulk_create([Incentive(case_count=c, reward_amount=r) for c, r in INCENTIVES])
+            stats = rebuild_daily_stats()
+            # bulk insert는 시그널을 보내지 않으므로 캐시/ETag 버전을 직접 올립니다. (커밋 후)
+            invalidate_client_views([user.pk for user in staff])
+            invalidate_staff_views()
+            invalidate_incentive_views()
+        refresh_incentive_table()
+
+        tokens = {
+            'admin': Token.objects.get(user=admin).key,
+            'staff': list(Token.objects.filter(user__in=staff).order_by('user__username').values_list('key', flat=True)),
+        }
+        with open(options['tokens_file'], 'w', encoding='utf-8') as f:
+            json.dump(tokens, f, indent=2)
+        elapsed = (timezone.now() - now).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"고객 {options['clients']:,}명, 상담사 {len(staff)}명, 출퇴근 {attendance:,}건, 실적 {performance:,}건, "
+            f"일별 통계 {stats:,}행 ({elapsed:.1f}초)"
+        ))
+        self.stdout.write(f"토큰: {options['tokens_file']} (비밀번호: {BENCH_PASSWORD})")
+
+    def _create_users(self, count):
+        # 해시는 느리므로 한 번만 만들어 모든 벤치마크 계정에 씁니다.
+        password = make_password(BENCH_PASSWORD)
+        admin_group = Group.objects.get_or_create(name='Admin')[0]
+        staff_group = Group.objects.get_or_create(name='Staff')[0]
+        users = User.objects.bulk_create(
+            [User(username='bench-admin', first_name='벤치관리자', password=password)]
+            + [User(username=f'bench-staff-{i:04d}', first_name=f'상담사{i}', password=password) for i in range(count)]
+        )
+        admin, staff = users[0], users[1:]
+        Membership = User.groups.through
+        Membership.objects.bulk_create(
+            [Membership(user_id=admin.pk, group_id=admin_group.pk)]
+            + [Membership(user_id=user.pk, group_id=staff_group.pk) for user in staff]
+        )
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+        return admin, staff
+
+    def _create_clients(self, rng, staff, count, days, assigned_ratio, now):
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        fields = [ClientData._meta.get_field(name) for name in ('created_at', 'updated_at')]
+        batch = []
+        with explicit_timestamps(*fields):
+            for i in range(count):
+                created_at = now - timedelta(seconds=rng.randrange(days * 86400))
+                sido, gugun = rng.choice(SIDO_GUGUN)
+                owner = rng.choice(staff) if rng.random() < assigned_ratio else None
+                batch.append(ClientData(
+                    name=rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN),
+                    contact=f'{BENCH_CONTACT_PREFIX}{i:08d}',
+                    address=f'{sido} {gugun} {rng.randint(1, 999)}번길', sido=sido, gugun=gugun,
+                    gender=rng.choice('MF'),
+                    owner=owner, is_distributed=owner is not None,
+                    distribution_date=(created_at + timedelta(days=1)).date() if owner else None,
+                    status=rng.choices(statuses, weights)[0] if owner else 'PENDING',
+                    note='재통화 요청' if i % 50 == 0 else '',
+                    created_at=created_at,
+                    updated_at=min(created_at + timedelta(days=rng.randint(0, 14)), now),
+                ))
+                if len(batch) == BATCH_SIZE:
+                    ClientData.objects.bulk_create(batch)
+                    batch = []
+            ClientData.objects.bulk_create(batch)
+
+    def _create_attendance(self, rng, staff, days, now):
+        """평일(오늘은 요일과 무관)마다 출근 기록을 만듭니다. 오늘 기록은 퇴근 전 상태입니다."""
+        tz = timezone.get_current_timezone()
+        today = timezone.localdate(now)
+        fields = [AttendanceRecord._meta.get_field(name) for name in ('work_date', 'check_in_time')]
+        records = []
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            if offset and day.weekday() >= 5:
+                continue
+            for user in staff:
+                check_in = timezone.make_aware(datetime.combine(day, time(8, 30)), tz) + timedelta(minutes=rng.randint(0, 60))
+                check_out = None if offset == 0 else check_in + timedelta(hours=9, minutes=rng.randint(0, 60))
+                records.append(AttendanceRecord(employee=user, work_date=day, check_in_time=check_in, check_out_time=check_out))
+        with explicit_timestamps(*fields):
+            AttendanceRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+        return len(records)
+
+    def _create_performance(self, rng, staff, days, now):
+        today = timezone.localdate(now)
+        records = [
+            PerformanceRecord(employee=user, date=today - timedelta(days=offset), record_type=record_type,
+                              value=rng.randint(20, 80) if record_type == '통화' else rng.randint(0, 3))
+            for offset in range(0, days, 7)
+            for user in staff
+            for record_type in RECORD_TYPES
+        ]
+        PerformanceRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+        return len(records)
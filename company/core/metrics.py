@@ -0,0 +1,231 @@
+# core/metrics.py
+"""
+요청별 SQL/시간 계측과 Prometheus 지표
+
+MetricsMiddleware(core/middleware.py)가 요청마다 RequestMetrics를 만들어 ContextVar에 넣고,
+- SQL: 모든 DB 연결에 붙인 실행 래퍼(sql_wrapper)가 쿼리 수와 시간을 더합니다.
+  ContextVar는 sync_to_async/async_to_sync를 거쳐도 이어지므로 비동기 뷰의 ORM 쿼리도 집계됩니다.
+- render(직렬화): DRF 응답 렌더링(JSON/MessagePack 인코딩) 시간. 비동기 뷰는 json_response에서 직접 잽니다.
+  serializer.data(to_representation)는 DRF가 뷰 안에서 계산하므로 view 시간에 포함됩니다.
+- view: 뷰 실행 시간에서 SQL 시간을 뺀 값
+
+응답에는 Server-Timing 헤더(db;dur=, render;dur=, view;dur=, total;dur=)를 붙이고,
+라우트 이름(clientdata-list, performance-statistics 등)별 히스토그램으로 모아 /metrics에서 Prometheus 텍스트로 내보냅니다.
+
+N+1 감지(NPLUSONE_DETECTION, 개발용): 한 요청 안에서 같은 모양의 SELECT가 NPLUSONE_THRESHOLD번 이상 반복되면
+(반복문 안의 지연 로딩) 라우트, SQL, 처음 반복된 코드 위치를 경고 로그로 남깁니다.
+
+지표는 프로세스별로 모읍니다. gunicorn 워커가 여러 개면 /metrics는 요청을 받은 워커의 값만 보여주므로,
+Prometheus에서는 워커별로 수집하거나 워커 수로 보정해서 봅니다.
+"""
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_current = ContextVar('core_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = (
+        'started', 'route', 'queries', 'sql_seconds', 'render_seconds', 'view_started', 'view_seconds', 'shapes', 'sites',
+    )
+
+    def __init__(self, detect_n_plus_one=False):
+        self.started = time.perf_counter()
+        self.route = None
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.render_seconds = 0.0
+        self.view_started = None
+        self.view_seconds = None
+        # N+1 감지를 켠 경우에만 SQL 모양별 실행 횟수와 반복이 시작된 코드 위치를 모읍니다.
+        self.shapes = {} if detect_n_plus_one else None
+        self.sites = {}
+
+
+def begin_request(detect_n_plus_one=False):
+    metrics = RequestMetrics(detect_n_plus_one)
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    """connection.execute_wrappers에 항상 붙어 있는 래퍼. 계측 중인 요청이 없으면 그대로 실행합니다."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_seconds += time.perf_counter() - started
+        metrics.queries += 1
+        if metrics.shapes is not None:
+            _record_shape(metrics, sql)
+
+
+def install_sql_wrapper(connection, **kwargs):
+    """connection_created 시그널 수신자 (CoreConfig.ready에서 연결하므로 모든 DB 연결에 붙습니다)"""
+    if sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_wrapper)
+
+
+@contextmanager
+def timing_render():
+    """응답 인코딩(직렬화) 시간을 현재 요청의 render 시간에 더합니다."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.render_seconds += time.perf_counter() - started
+
+
+def server_timing(metrics, total):
+    view = max((metrics.view_seconds if metrics.view_seconds is not None else total) - metrics.sql_seconds - metrics.render_seconds, 0.0)
+    return ', '.join((
+        f'db;dur={metrics.sql_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+        f'render;dur={metrics.render_seconds * 1000:.1f}',
+        f'view;dur={view * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ))
+
+
+# -------------------------------------------------------------------
+# N+1 감지 (개발용)
+# -------------------------------------------------------------------
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def query_shape(sql):
+    """바인드 값은 이미 %s로 분리되어 있으므로, 길이가 다른 IN (...) 목록만 하나로 맞춥니다."""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _record_shape(metrics, sql):
+    if sql.lstrip()[:6].upper() != 'SELECT':
+        return
+    shape = query_shape(sql)
+    count = metrics.shapes.get(shape, 0) + 1
+    metrics.shapes[shape] = count
+    if count == 2:
+        metrics.sites[shape] = _call_site()
+
+
+def _call_site():
+    """프로젝트 코드 중 쿼리를 일으킨 가장 안쪽 위치 (Django/DRF 내부와 이 모듈은 건너뜁니다)"""
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(_PROJECT_DIR) and not frame.filename.endswith('metrics.py'):
+            return f'{os.path.relpath(frame.filename, _PROJECT_DIR)}:{frame.lineno} ({frame.name})'
+    return '알 수 없음'
+
+
+def report_n_plus_one(metrics, method, path):
+    threshold = settings.NPLUSONE_THRESHOLD
+    for shape, count in metrics.shapes.items():
+        if count >= threshold:
+            logger.warning(
+                'N+1 의심: %s %s (%s) 같은 SELECT %d회, 위치 %s\n%s',
+                method, path, metrics.route, count, metrics.sites.get(shape), shape,
+            )
+
+
+# -------------------------------------------------------------------
+# 지표 저장소 (프로세스별)
+# -------------------------------------------------------------------
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # bisect_left: 값이 경계와 같으면 그 구간(le=경계)에 넣습니다.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """(라우트, 메서드)별 히스토그램과 (라우트, 메서드, 상태 코드)별 요청 수"""
+
+    METRICS = (
+        ('http_request_duration_seconds', '요청 처리 시간 (미들웨어 진입부터 응답 반환까지)', DURATION_BUCKETS),
+        ('http_request_sql_seconds', '요청당 SQL 실행 시간 합계', DURATION_BUCKETS),
+        ('http_request_render_seconds', '요청당 응답 렌더링(직렬화) 시간', DURATION_BUCKETS),
+        ('http_request_sql_queries', '요청당 SQL 쿼리 수', QUERY_COUNT_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+
+    def observe(self, route, method, status_code, total, metrics):
+        values = (total, metrics.sql_seconds, metrics.render_seconds, metrics.queries)
+        with self._lock:
+            histograms = self._histograms.get((route, method))
+            if histograms is None:
+                histograms = self._histograms[(route, method)] = [Histogram(buckets) for _, _, buckets in self.METRICS]
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+            key = (route, method, status_code)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def render(self):
+        """Prometheus 텍스트 형식(0.0.4)으로 변환합니다."""
+        with self._lock:
+            histograms = {key: [(list(h.counts), h.sum, h.count) for h in value] for key, value in self._histograms.items()}
+            requests = dict(self._requests)
+        lines = [
+            '# HELP http_requests_total 라우트/메서드/상태 코드별 요청 수',
+            '# TYPE http_requests_total counter',
+        ]
+        for (route, method, status_code), count in sorted(requests.items()):
+            lines.append(f'http_requests_total{{route="{route}",method="{method}",status="{status_code}"}} {count}')
+        for index, (name, help_text, buckets) in enumerate(self.METRICS):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (route, method), values in sorted(histograms.items()):
+                counts, total, count = values[index]
+                labels = f'route="{route}",method="{method}"'
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, '+Inf'), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {total:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,114 @@
+# core/middleware.py
+"""
+응답 압축 미들웨어 (CompressionMiddleware)
+
+- 브라우저가 `Accept-Encoding: br`을 보내면 brotli로, 아니면 Django GZipMiddleware와 같이 gzip으로 압축합니다.
+- 스트리밍 응답(CSV 내보내기 등)은 gzip으로만 압축합니다.
+- FileResponse(엑셀 파일 등)는 이미 압축된 형식이 많으므로 압축하지 않습니다.
+- 실시간 이벤트 스트림(text/event-stream)은 압축 버퍼에 묶이지 않도록 압축하지 않습니다.
+
+요청 계측 미들웨어 (MetricsMiddleware, core/metrics.py)
+- 요청별 SQL 쿼리 수/시간, 렌더링(직렬화) 시간, 뷰 시간을 Server-Timing 헤더로 붙이고 라우트별 히스토그램에 모읍니다.
+- NPLUSONE_DETECTION이 켜져 있으면 같은 SELECT가 반복되는 요청(N+1)을 경고 로그로 남깁니다.
+- 모든 미들웨어의 시간을 포함하도록 MIDDLEWARE의 맨 앞에 둡니다. 스트리밍 응답은 본문 전송 시간을 포함하지 않습니다.
+"""
+import re
+import time
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+
+_accepts_brotli = re.compile(r'\bbr\b').search
+
+# 200바이트 미만은 압축해도 줄어드는 양보다 헤더/CPU 비용이 큽니다. (GZipMiddleware와 같은 기준)
+MIN_COMPRESS_LENGTH = 200
+# 응답마다 압축하므로 속도 위주의 품질을 씁니다. (0~11, 11이 최고 압축률)
+BROTLI_QUALITY = 5
+
+
+class CompressionMiddleware(GZipMiddleware):
+
+    def process_response(self, request, response):
+        if isinstance(response, FileResponse) or response.has_header('Content-Encoding'):
+            return response
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+        if response.streaming or len(response.content) < MIN_COMPRESS_LENGTH:
+            return super().process_response(request, response)
+        if not _accepts_brotli(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        if response.has_header('ETag'):
+            response.headers['ETag'] = re.sub(r'^"', 'W/"', response.headers['ETag'])
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request_metrics, token = metrics.begin_request(settings.NPLUSONE_DETECTION)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.begin_request(settings.NPLUSONE_DETECTION)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, request_metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request_metrics = metrics.current()
+        if request_metrics is not None:
+            match = request.resolver_match
+            request_metrics.route = (match.url_name or match.route) if match else None
+            request_metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF Response는 뷰가 끝난 뒤 렌더링되므로, 여기서 뷰 시간을 끊고 렌더링 시간을 따로 잽니다.
+        # (가장 바깥 미들웨어라 마지막에 호출되며, 이미 렌더링된 응답은 Django가 다시 렌더링하지 않습니다.)
+        request_metrics = metrics.current()
+        if request_metrics is not None and request_metrics.view_started is not None:
+            request_metrics.view_seconds = time.perf_counter() - request_metrics.view_started
+            with metrics.timing_render():
+                response.render()
+        return response
+
+    def _finish(self, request, response, request_metrics):
+        total = time.perf_counter() - request_metrics.started
+        metrics.registry.observe(request_metrics.route or 'unmatched', request.method, response.status_code, total, request_metrics)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing(request_metrics, total)
+        if request_metrics.shapes is not None:
+            metrics.report_n_plus_one(request_metrics, request.method, request.path)
+        return response
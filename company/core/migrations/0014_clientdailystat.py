@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    """기존 고객 데이터로 일별 통계 테이블을 채웁니다."""
+    ClientData = apps.get_model('core', 'ClientData')
+    ClientDailyStat = apps.get_model('core', 'ClientDailyStat')
+    rows = (
+        ClientData.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'owner_id', 'status', 'sido', 'is_distributed')
+        .annotate(new_clients=Count('id'), contracts=Count('id', filter=Q(status__in=['SUCCESS_1', 'SUCCESS_2'])))
+    )
+    ClientDailyStat.objects.bulk_create(
+        [
+            ClientDailyStat(
+                day=row['day'], owner_id=row['owner_id'], status=row['status'], sido=row['sido'] or '',
+                is_distributed=row['is_distributed'], new_clients=row['new_clients'], contracts=row['contracts'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_alter_incentive_options_alter_incentive_case_count_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='등록일')),
+                ('status', models.CharField(max_length=20, verbose_name='현황')),
+                ('sido', models.CharField(blank=True, default='', max_length=50, verbose_name='시/도')),
+                ('is_distributed', models.BooleanField(default=False, verbose_name='배분여부')),
+                ('new_clients', models.IntegerField(default=0, verbose_name='신규 고객 수')),
+                ('contracts', models.IntegerField(default=0, verbose_name='계약 수')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='담당 직원')),
+            ],
+            options={
+                'verbose_name': '고객 일별 통계',
+                'verbose_name_plural': '고객 일별 통계',
+                'indexes': [models.Index(fields=['day', 'owner'], name='core_stat_day_owner_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
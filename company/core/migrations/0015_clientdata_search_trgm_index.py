@@ -0,0 +1,52 @@
+import warnings
+
+from django.db import DatabaseError, migrations, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat, Upper
+
+# core/search.py 의 search_document()와 같은 식이어야 검색 쿼리가 인덱스를 사용합니다.
+SEARCH_FIELDS = ('name', 'contact', 'address', 'sido', 'gugun', 'note', 'employee_note')
+INDEX_NAME = 'core_client_search_trgm'
+
+
+def _search_index():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+
+    parts = []
+    for field in SEARCH_FIELDS:
+        parts.extend([F(field), Value(' ')])
+    expression = Upper(Concat(*parts[:-1], output_field=TextField()))
+    return GinIndex(OpClass(expression, name='gin_trgm_ops'), name=INDEX_NAME)
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL에서만 pg_trgm 확장과 검색용 GIN 트라이그램 인덱스를 만듭니다. (SQLite는 건너뜀)
+    pg_trgm을 설치할 수 없는 서버에서는 인덱스 없이 진행하며, 검색은 전체 스캔으로 동작합니다.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError as e:
+        warnings.warn(f'pg_trgm 확장을 사용할 수 없어 검색 인덱스를 만들지 않습니다: {e}')
+        return
+    schema_editor.add_index(apps.get_model('core', 'ClientData'), _search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_clientdailystat'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_clientdata_search_trgm_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['created_at', 'id'], name='core_client_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['is_distributed', 'created_at', 'id'], name='core_client_dist_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='core_client_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['status', 'id'], name='core_client_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['name', 'id'], name='core_client_name_id_idx'),
+        ),
+    ]
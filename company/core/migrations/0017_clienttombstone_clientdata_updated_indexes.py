@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_clientdata_ordering_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_id', models.BigIntegerField(verbose_name='고객 ID')),
+                ('reason', models.CharField(choices=[('DELETED', '삭제'), ('REASSIGNED', '담당 변경')], max_length=20, verbose_name='사유')),
+                ('removed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='제거 시각')),
+            ],
+            options={
+                'verbose_name': '고객 제거 기록',
+                'verbose_name_plural': '고객 제거 기록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['updated_at', 'id'], name='core_client_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(fields=['owner', 'updated_at', 'id'], name='core_client_owner_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='clienttombstone',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='이전 담당 직원'),
+        ),
+        migrations.AddIndex(
+            model_name='clienttombstone',
+            index=models.Index(fields=['removed_at'], name='core_tombstone_removed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clienttombstone',
+            index=models.Index(fields=['owner', 'removed_at'], name='core_tombstone_owner_idx'),
+        ),
+    ]
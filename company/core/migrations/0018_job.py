@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_clienttombstone_clientdata_updated_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CLIENT_IMPORT', '고객 엑셀 업로드'), ('CLIENT_EXPORT', '고객 내보내기'), ('DISTRIBUTION', '고객 배분')], max_length=20, verbose_name='작업 종류')),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('RUNNING', '실행 중'), ('SUCCEEDED', '완료'), ('FAILED', '실패')], default='PENDING', max_length=20, verbose_name='상태')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='진행률 (%)')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='작업 옵션')),
+                ('cache_key', models.CharField(blank=True, max_length=64, verbose_name='결과 재사용 키')),
+                ('input_file', models.FileField(blank=True, upload_to='jobs/input/', verbose_name='입력 파일')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='결과')),
+                ('result_file', models.FileField(blank=True, upload_to='jobs/results/', verbose_name='결과 파일')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청 시각')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작 시각')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시각')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+            ],
+            options={
+                'verbose_name': '백그라운드 작업',
+                'verbose_name_plural': '백그라운드 작업',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['cache_key', 'status'], name='core_job_cache_key_idx'), models.Index(fields=['created_at'], name='core_job_created_idx')],
+            },
+        ),
+    ]
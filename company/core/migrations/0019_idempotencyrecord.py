@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, verbose_name='Idempotency-Key')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='요청 지문 (경로/본문 해시)')),
+                ('status', models.CharField(choices=[('IN_PROGRESS', '처리 중'), ('DONE', '완료')], default='IN_PROGRESS', max_length=20, verbose_name='상태')),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='응답 코드')),
+                ('response_body', models.JSONField(blank=True, null=True, verbose_name='응답 본문')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='요청 시각')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+            ],
+            options={
+                'verbose_name': '멱등 요청 기록',
+                'verbose_name_plural': '멱등 요청 기록',
+                'indexes': [models.Index(fields=['created_at'], name='core_idempotency_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'key'), name='core_idempotency_user_key_uniq')],
+            },
+        ),
+    ]
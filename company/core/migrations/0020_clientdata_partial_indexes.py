@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_idempotencyrecord'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='clientdata',
+            name='core_client_dist_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['work_date'], name='core_attendance_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdailystat',
+            index=models.Index(fields=['owner', 'day'], name='core_stat_owner_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(condition=models.Q(('is_distributed', False)), fields=['created_at', 'id'], name='core_client_undist_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientdata',
+            index=models.Index(condition=models.Q(('status__in', ('SUCCESS_1', 'SUCCESS_2'))), fields=['owner', 'updated_at'], name='core_client_success_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+# 계약(성공) 현황. 시상 현황판 부분 인덱스(core_client_success_idx)의 조건과 같은 값/순서를 써야 인덱스를 탑니다.
+SUCCESS_STATUSES = ('SUCCESS_1', 'SUCCESS_2')
 
 class ClientData(models.Model):
     # --- 담당 직원 필드 ---
@@ -45,9 +49,91 @@ class ClientData(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
 
+    # 일별 통계(ClientDailyStat) 집계 기준이 되는 필드 (attname 기준)
+    STAT_FIELDS = ('created_at', 'owner_id', 'status', 'sido', 'is_distributed')
+
     def __str__(self):
         return self.name
 
+    class Meta:
+        # 목록 API의 주요 정렬(+ id 동순위 정렬)과 키셋 페이지네이션을 위한 복합 인덱스
+        # 등록일 조건은 created_at__date 대신 created_at 범위(stats.day_range_bounds)로 걸어야 인덱스를 탑니다.
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='core_client_created_id_idx'),
+            models.Index(fields=['owner', 'created_at', 'id'], name='core_client_owner_created_idx'),
+            # 미배분 고객 목록(?distributed=false): 배분된 고객은 인덱스에 넣지 않는 부분 인덱스
+            models.Index(
+                fields=['created_at', 'id'], name='core_client_undist_created_idx', condition=models.Q(is_distributed=False),
+            ),
+            # 시상 현황판: 상담사별 이번 달 계약 건수 (계약 고객만 담는 부분 인덱스)
+            models.Index(
+                fields=['owner', 'updated_at'], name='core_client_success_idx', condition=models.Q(status__in=SUCCESS_STATUSES),
+            ),
+            models.Index(fields=['status', 'id'], name='core_client_status_id_idx'),
+            models.Index(fields=['name', 'id'], name='core_client_name_id_idx'),
+            # ?updated_since= 동기화: 관리자(전체)와 상담사(담당 고객)의 변경분 조회
+            models.Index(fields=['updated_at', 'id'], name='core_client_updated_id_idx'),
+            models.Index(fields=['owner', 'updated_at', 'id'], name='core_client_owner_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 일별 통계(ClientDailyStat) 증분 갱신을 위해 DB에서 읽은 시점의 집계 기준 값을 보관합니다.
+        instance._loaded_stat_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.STAT_FIELDS
+        }
+        return instance
+
+class ClientDailyStat(models.Model):
+    """
+    고객 데이터 일별 통계 집계 테이블 (등록일 x 담당 직원 x 현황 x 시/도 x 배분여부)
+    ClientData 저장/삭제 및 일괄 처리 시 증분 갱신되며, rebuild_client_stats 명령으로 재계산할 수 있습니다.
+    """
+    day = models.DateField(verbose_name="등록일")
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="담당 직원")
+    status = models.CharField(max_length=20, verbose_name="현황")
+    sido = models.CharField(max_length=50, blank=True, default='', verbose_name="시/도")
+    is_distributed = models.BooleanField(default=False, verbose_name="배분여부")
+    new_clients = models.IntegerField(default=0, verbose_name="신규 고객 수")
+    contracts = models.IntegerField(default=0, verbose_name="계약 수")
+
+    def __str__(self):
+        return f"{self.day} - {self.owner_id} - {self.status}: {self.new_clients}"
+
+    class Meta:
+        verbose_name = "고객 일별 통계"
+        verbose_name_plural = "고객 일별 통계"
+        indexes = [
+            # 관리자 통계(기간 전체)와 직원별 요약(직원 한 명의 기간)
+            models.Index(fields=['day', 'owner'], name='core_stat_day_owner_idx'),
+            models.Index(fields=['owner', 'day'], name='core_stat_owner_day_idx'),
+        ]
+
+class ClientTombstone(models.Model):
+    """
+    고객 목록 동기화(?updated_since=)용 제거 기록
+    - 삭제(DELETED): 고객이 삭제됨. 관리자와 마지막 담당 직원에게 전달됩니다.
+    - 담당 변경(REASSIGNED): 고객이 owner의 목록에서 빠짐. 해당 직원에게만 전달됩니다.
+    보관 기간(CLIENT_TOMBSTONE_RETENTION_DAYS)이 지난 기록은 prune_client_tombstones 명령으로 지웁니다.
+    """
+    REASON_CHOICES = [('DELETED', '삭제'), ('REASSIGNED', '담당 변경')]
+    client_id = models.BigIntegerField(verbose_name="고객 ID")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, verbose_name="이전 담당 직원")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, verbose_name="사유")
+    removed_at = models.DateTimeField(default=timezone.now, verbose_name="제거 시각")
+
+    def __str__(self):
+        return f"{self.client_id} - {self.reason} ({self.removed_at})"
+
+    class Meta:
+        verbose_name = "고객 제거 기록"
+        verbose_name_plural = "고객 제거 기록"
+        indexes = [
+            models.Index(fields=['removed_at'], name='core_tombstone_removed_idx'),
+            models.Index(fields=['owner', 'removed_at'], name='core_tombstone_owner_idx'),
+        ]
+
 class EmployeeProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, verbose_name="사용자", related_name='profile')
     birth_date = models.CharField(max_length=8, blank=True, null=True, verbose_name="생년월일(8자리)")
@@ -74,6 +160,10 @@ class AttendanceRecord(models.Model):
         # 한 명의 직원은 하루에 하나의 출근 기록만 가질 수 있도록 제약 조건 추가
         unique_together = ('employee', 'work_date')
         ordering = ['-work_date', '-check_in_time']
+        # 월별 출퇴근 기록 목록 (work_date 범위)
+        indexes = [
+            models.Index(fields=['work_date'], name='core_attendance_date_idx'),
+        ]
 
 
 class PerformanceRecord(models.Model):
@@ -104,3 +194,64 @@ class SiteConfiguration(models.Model):
 
     def __str__(self):
         return self.key
+
+
+class Job(models.Model):
+    """
+    관리자 백그라운드 작업 (엑셀 업로드/내보내기, 대량 배분)
+    요청은 작업을 등록하고 바로 응답하며, 작업은 서버 프로세스 안의 작업 스레드(core/jobs.py)에서 실행됩니다.
+    브라우저는 /api/jobs/<id>/ 로 진행률을 확인하고, 결과 파일은 /api/jobs/<id>/download/ 로 받습니다.
+    """
+    KIND_CHOICES = [('CLIENT_IMPORT', '고객 엑셀 업로드'), ('CLIENT_EXPORT', '고객 내보내기'), ('DISTRIBUTION', '고객 배분')]
+    STATUS_CHOICES = [('PENDING', '대기'), ('RUNNING', '실행 중'), ('SUCCEEDED', '완료'), ('FAILED', '실패')]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="작업 종류")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', verbose_name="상태")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="진행률 (%)")
+    params = models.JSONField(default=dict, blank=True, verbose_name="작업 옵션")
+    # 같은 조건의 결과를 다시 쓸 수 있는 작업(내보내기)만 값을 가집니다.
+    cache_key = models.CharField(max_length=64, blank=True, verbose_name="결과 재사용 키")
+    input_file = models.FileField(upload_to='jobs/input/', blank=True, verbose_name="입력 파일")
+    result = models.JSONField(null=True, blank=True, verbose_name="결과")
+    result_file = models.FileField(upload_to='jobs/results/', blank=True, verbose_name="결과 파일")
+    error = models.TextField(blank=True, verbose_name="오류")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="요청자")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="요청 시각")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="시작 시각")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="종료 시각")
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+    class Meta:
+        verbose_name = "백그라운드 작업"
+        verbose_name_plural = "백그라운드 작업"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['cache_key', 'status'], name='core_job_cache_key_idx'),
+            models.Index(fields=['created_at'], name='core_job_created_idx'),
+        ]
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Idempotency-Key 헤더로 보낸 무거운 POST 요청(배분, 엑셀 업로드)의 처리 기록 (core/idempotency.py)
+    같은 키로 다시 오면 저장된 응답을 그대로 돌려주고, 처리 중이면 끝날 때까지 기다립니다.
+    """
+    STATUS_CHOICES = [('IN_PROGRESS', '처리 중'), ('DONE', '완료')]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="요청자")
+    key = models.CharField(max_length=255, verbose_name="Idempotency-Key")
+    fingerprint = models.CharField(max_length=64, verbose_name="요청 지문 (경로/본문 해시)")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='IN_PROGRESS', verbose_name="상태")
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="응답 코드")
+    response_body = models.JSONField(null=True, blank=True, verbose_name="응답 본문")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="요청 시각")
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.status})"
+
+    class Meta:
+        verbose_name = "멱등 요청 기록"
+        verbose_name_plural = "멱등 요청 기록"
+        constraints = [models.UniqueConstraint(fields=['user', 'key'], name='core_idempotency_user_key_uniq')]
+        indexes = [models.Index(fields=['created_at'], name='core_idempotency_created_idx')]
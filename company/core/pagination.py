@@ -1,6 +1,184 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+class KnownCountPaginator(DjangoPaginator):
+    """전체 개수를 이미 알고 있으면 COUNT(*) 쿼리를 다시 하지 않는 Django Paginator"""
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.__dict__['count'] = count  # cached_property 값을 미리 채웁니다.
 
 class FiftyResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # 뷰가 같은 QuerySet의 개수를 미리 구했다면(view.known_count, 조건부 요청 검증 등) 그대로 사용합니다.
+        self.django_paginator_class = partial(KnownCountPaginator, count=getattr(view, 'known_count', None))
+        return super().paginate_queryset(queryset, request, view)
+
+class KeysetPagination(BasePagination):
+    """
+    키셋(커서) 기반 페이지네이션
+    - COUNT(*)와 OFFSET 없이 `WHERE (정렬키) > (마지막 행의 정렬키)`로 다음 페이지를 가져오므로
+      몇 번째 페이지든 조회 비용이 같습니다.
+    - OrderingFilter가 지정한 정렬을 그대로 쓰고, 값이 같은 행은 id로 구분합니다.
+    - NULL이 가능한 정렬 필드(distribution_date, owner__first_name 등)는 DB와 무관하게 NULL을 마지막에 둡니다.
+    - 응답: {'next': url, 'previous': url, 'results': [...]} (전체 개수는 제공하지 않습니다)
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        reverse, position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position, reverse))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # 이전 페이지 방향으로 왔다면 다음 페이지는 반드시 있고, 더 가져온 행이 있으면 이전 페이지가 있습니다.
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data})
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        """(필드 경로, 내림차순 여부, NULL 가능 여부) 목록을 반환합니다. 마지막에는 항상 id가 옵니다."""
+        ordering = [item for item in queryset.query.order_by if isinstance(item, str) and item != '?']
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering) or ['-id']
+        fields = []
+        for item in ordering:
+            descending = item.startswith('-')
+            path = item.lstrip('-')
+            path = 'id' if path == 'pk' else path
+            fields.append((path, descending, self._is_nullable(queryset.model, path)))
+        if not any(path == 'id' for path, _, _ in fields):
+            fields.append(('id', fields[0][1], False))
+        return fields
+
+    @staticmethod
+    def _is_nullable(model, path):
+        nullable = False
+        for part in path.split('__'):
+            field = model._meta.get_field(part)
+            nullable = nullable or field.null
+            if field.is_relation:
+                model = field.related_model
+        return nullable
+
+    def _order_by(self, reverse):
+        expressions = []
+        for path, descending, nullable in self.ordering:
+            descending = descending != reverse
+            if not nullable:
+                expressions.append(F(path).desc() if descending else F(path).asc())
+            else:
+                # 정방향은 NULL을 마지막에, 역방향(이전 페이지)은 그 반대로 둡니다.
+                nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+                expressions.append(F(path).desc(**nulls) if descending else F(path).asc(**nulls))
+        return expressions
+
+    def _after(self, position, reverse):
+        """정렬 순서상 position 바로 다음 행부터 남기는 조건 (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ..."""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (path, descending, nullable), value in zip(self.ordering, position):
+            descending = descending != reverse
+            nulls_last = nullable and not reverse
+            if value is None:
+                greater = Q(**{f'{path}__isnull': False}) if nullable and not nulls_last else None
+                same = Q(**{f'{path}__isnull': True})
+            else:
+                greater = Q(**{f'{path}__{"lt" if descending else "gt"}': value})
+                if nulls_last:
+                    greater |= Q(**{f'{path}__isnull': True})
+                same = Q(**{path: value})
+            if greater is not None:
+                condition |= equal & greater
+            equal &= same
+
+        # 첫 정렬 필드의 범위 조건을 함께 주면 (정렬키, id) 인덱스를 범위 스캔할 수 있습니다.
+        (path, descending, nullable), value = self.ordering[0], position[0]
+        if not nullable and value is not None:
+            descending = descending != reverse
+            condition &= Q(**{f'{path}__{"lte" if descending else "gte"}': value})
+        return condition
+
+    def _position(self, instance):
+        values = []
+        for path, _, _ in self.ordering:
+            value = instance
+            for part in path.split('__'):
+                value = getattr(value, part, None) if value is not None else None
+            if hasattr(value, 'pk'):
+                value = value.pk
+            values.append(value.isoformat() if isinstance(value, date) else value)
+        return values
+
+    def encode_cursor(self, reverse, position):
+        payload = json.dumps({'r': reverse, 'p': position}, ensure_ascii=False, separators=(',', ':'))
+        encoded = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """(역방향 여부, 정렬키 값 목록 또는 None)을 반환합니다."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return bool(payload['r']), position
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self._position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self._position(self.page[0]))
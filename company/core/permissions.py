@@ -1,10 +1,28 @@
 # core/permissions.py
 from rest_framework import permissions
 
+
+def user_group_names(user):
+    """
+    사용자의 그룹 이름 집합을 반환합니다.
+    한 번 조회한 결과는 사용자 객체에 보관하므로 같은 요청 안에서 다시 쿼리하지 않으며,
+    CachedTokenAuthentication이 캐시한 사용자는 쿼리 없이 바로 반환합니다.
+    """
+    names = getattr(user, '_group_names', None)
+    if names is None:
+        names = frozenset(user.groups.values_list('name', flat=True))
+        user._group_names = names
+    return names
+
+
+def is_admin(user):
+    return bool(user and user.is_authenticated and 'Admin' in user_group_names(user))
+
+
 class IsAdminUser(permissions.BasePermission):
     """
     'Admin' 그룹에 속한 사용자에게만 접근을 허용하는 커스텀 권한
     """
     def has_permission(self, request, view):
         # 요청을 보낸 사용자가 로그인했고, 'Admin' 그룹에 속해 있는지 확인합니다.
-        return request.user and request.user.is_authenticated and request.user.groups.filter(name='Admin').exists()
\ No newline at end of file
+        return is_admin(request.user)
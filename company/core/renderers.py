@@ -0,0 +1,52 @@
+# core/renderers.py
+"""
+API 응답 렌더러
+
+- ORJSONRenderer: DRF JSONRenderer와 같은 JSON을 orjson으로 만듭니다. (기본 렌더러)
+  datetime/Decimal 등 orjson이 DRF와 다르게 출력하는 값은 DRF JSONEncoder 규칙을 그대로 따릅니다.
+- MessagePackRenderer: `Accept: application/msgpack` 요청에 MessagePack으로 응답합니다.
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """orjson/msgpack이 직접 처리하지 않는 값(datetime, Decimal, 지연 번역 문자열 등)은 DRF 규칙으로 변환합니다."""
+    return _drf_encoder.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None  # JSON은 항상 UTF-8입니다. (DRF JSONRenderer와 같음)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if self._indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+
+    @staticmethod
+    def _indent(accepted_media_type, renderer_context):
+        # `Accept: application/json; indent=4` 또는 렌더러 컨텍스트의 indent로 보기 좋게 출력할 수 있습니다.
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            return True
+        return bool((renderer_context or {}).get('indent'))
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -0,0 +1,46 @@
+# core/search.py
+"""
+고객 데이터 검색 백엔드
+
+고객명, 연락처, 주소, 시/도, 구/군, 관리자/직원 메모를 하나의 검색 문서
+UPPER(name || ' ' || contact || ...)로 이어 붙이고, 검색어마다 `LIKE '%검색어%'` 조건을 겁니다.
+
+- PostgreSQL: 0015 마이그레이션이 pg_trgm 확장과 이 식(expression)에 대한 GIN 트라이그램 인덱스
+  (core_client_search_trgm)를 만들어 두므로, 부분 문자열 검색도 전체 테이블을 읽지 않습니다.
+  검색어가 3글자 미만이면 트라이그램을 만들 수 없어 인덱스 효과가 줄어듭니다.
+- SQLite(개발용): 인덱스 없이 같은 조건으로 전체 스캔합니다. 기능은 같고 속도만 다릅니다.
+
+SEARCH_FIELDS 또는 search_document()를 바꾸면 인덱스 식과 달라져 인덱스를 타지 못하므로,
+반드시 같은 식으로 인덱스를 다시 만드는 마이그레이션을 추가해야 합니다.
+"""
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat, Upper
+from rest_framework.filters import SearchFilter
+
+SEARCH_FIELDS = ('name', 'contact', 'address', 'sido', 'gugun', 'note', 'employee_note')
+SEARCH_INDEX_NAME = 'core_client_search_trgm'
+
+
+def search_document():
+    """검색 대상 필드를 공백으로 이어 붙여 대문자로 바꾼 식 (인덱스 식과 동일해야 합니다)"""
+    parts = []
+    for field in SEARCH_FIELDS:
+        parts.extend([F(field), Value(' ')])
+    return Upper(Concat(*parts[:-1], output_field=TextField()))
+
+
+def search_clients(queryset, terms):
+    """검색어 목록의 모든 단어를 포함하는 고객만 남깁니다. (검색 문서는 SELECT 목록에 넣지 않습니다)"""
+    if not terms:
+        return queryset
+    queryset = queryset.alias(search_document=search_document())
+    for term in terms:
+        queryset = queryset.filter(search_document__contains=term.upper())
+    return queryset
+
+
+class ClientSearchFilter(SearchFilter):
+    """?search= 파라미터로 고객명/연락처/주소/지역/메모를 검색하는 DRF 필터"""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_clients(queryset, self.get_search_terms(request))
@@ -1,8 +1,13 @@
+from django.conf import settings
+from django.utils import timezone
+from django.db import models
+from django.urls import reverse
 from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import ReturnDict
 from django.contrib.auth.models import User, Group
 from .models import (
     ClientData, PerformanceRecord, Incentive, SiteConfiguration, 
-    EmployeeProfile, AttendanceRecord
+    EmployeeProfile, AttendanceRecord, Job
 )
 
 # -------------------------------------------------------------------
@@ -68,11 +73,21 @@ class StaffSerializer(serializers.ModelSerializer):
 # -------------------------------------------------------------------
 
 class ClientDataSerializer(serializers.ModelSerializer):
-    """고객 데이터 Serializer"""
+    """
+    고객 데이터 Serializer
+    - fields 인자로 출력할 필드 이름을 넘기면 그 필드만 출력합니다. (?fields= / ?omit= sparse fieldset)
+    """
     consultant = serializers.SerializerMethodField()
     gender_display = serializers.CharField(source='get_gender_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
 
+    # 계산 필드를 출력하려면 읽어야 하는 모델 필드 (나머지 필드는 같은 이름의 모델 필드를 읽습니다)
+    FIELD_SOURCES = {
+        'consultant': ('owner', 'owner__first_name', 'owner__username'),
+        'gender_display': ('gender',),
+        'status_display': ('status',),
+    }
+
     class Meta:
         model = ClientData
         fields = [
@@ -84,13 +99,161 @@ class ClientDataSerializer(serializers.ModelSerializer):
             'consultant', 'gender_display', 'status_display'
         ]
         extra_kwargs = {'owner': {'write_only': True}}
-    
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def readable_field_names(cls):
+        """응답에 나오는 필드 이름 목록 (write_only 필드 제외)"""
+        return [name for name in cls.Meta.fields if not cls.Meta.extra_kwargs.get(name, {}).get('write_only')]
+
+    @classmethod
+    def model_columns(cls, names):
+        """출력 필드 이름 목록을 only()에 넘길 모델 필드 경로 집합으로 바꿉니다."""
+        columns = {'id'}
+        for name in names:
+            columns.update(cls.FIELD_SOURCES.get(name, (name,)))
+        return columns
+
     def get_consultant(self, obj):
         if obj.owner:
             name = obj.owner.first_name or obj.owner.username
             return f"{name} ({obj.owner.username})"
         return "미지정"
 
+class ClientDataListSerializer(ClientDataSerializer):
+    """
+    고객 목록(list) 조회 전용 Serializer
+    - 출력 형식은 ClientDataSerializer와 같지만, 필드 객체를 하나씩 거치지 않고 한 번에 dict를 만듭니다.
+    - 담당 직원은 select_related('owner')로 미리 조인된 값을 사용하므로 행마다 쿼리하지 않습니다.
+    - 성별/현황 표시명은 미리 만들어 둔 선택지 사전에서 찾습니다.
+    - fields 인자로 필드를 고르면 고른 필드의 값만 읽으므로, only()로 제외한 컬럼을 다시 조회하지 않습니다.
+    """
+    GENDER_DISPLAY = dict(ClientData.GENDER_CHOICES)
+    STATUS_DISPLAY = dict(ClientData.STATUS_CHOICES)
+
+    def to_representation(self, obj):
+        tz = self._output_timezone()
+        request = self.context.get('request')
+        return {name: value(self, obj, request, tz) for name, value in self._value_getters()}
+
+    def get_consultant(self, obj):
+        # owner_id로 먼저 확인하여, 담당 직원이 없는 고객은 owner 조회 자체를 하지 않습니다.
+        if obj.owner_id is None:
+            return "미지정"
+        return super().get_consultant(obj)
+
+    def _value_getters(self):
+        # 출력할 필드의 (이름, 값 함수) 목록도 목록 전체에서 한 번만 만듭니다.
+        if not hasattr(self, '_getters'):
+            self._getters = [(field.field_name, _LIST_VALUE_GETTERS[field.field_name]) for field in self._readable_fields]
+        return self._getters
+
+    def _output_timezone(self):
+        # 목록 전체에 같은 시간대를 쓰므로 한 번만 구합니다. (DRF DateTimeField와 같은 규칙)
+        if not hasattr(self, '_timezone'):
+            self._timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        return self._timezone
+
+class ClientDataColumnsListSerializer(serializers.ListSerializer):
+    """고객 목록 전체를 하나의 열 형식 dict로 출력하는 ListSerializer"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return self.child.to_columns(iterable)
+
+    @property
+    def data(self):
+        # ListSerializer.data는 목록(ReturnList)을 가정하므로 dict 결과를 직접 감쌉니다.
+        if not hasattr(self, '_data'):
+            self._data = self.to_representation(self.instance)
+        return ReturnDict(self._data, serializer=self)
+
+class ClientDataColumnsSerializer(ClientDataListSerializer):
+    """
+    고객 목록 열(column) 형식 Serializer (?layout=columns)
+    - 행마다 키를 반복하지 않고 {'columns': [...], 'rows': [[...], ...], 'consultants': {...}}로 출력합니다.
+    - 성별/현황 등 선택지 값은 코드 그대로 두고 표시명(*_display)은 넣지 않습니다.
+    - consultant 대신 owner(담당 직원 id) 열을 넣고, 담당 직원 이름은 consultants에 직원별로 한 번만 넣습니다.
+    """
+    DECODED_FIELDS = ('consultant', 'gender_display', 'status_display')
+
+    class Meta(ClientDataSerializer.Meta):
+        list_serializer_class = ClientDataColumnsListSerializer
+
+    def get_columns(self):
+        selected = {field.field_name for field in self._readable_fields}
+        return [
+            name for name in self.Meta.fields
+            if (name == 'owner' and 'consultant' in selected)
+            or (name in selected and name not in self.DECODED_FIELDS)
+        ]
+
+    def to_columns(self, instances):
+        columns = self.get_columns()
+        getters = [_LIST_VALUE_GETTERS[name] for name in columns]
+        tz = self._output_timezone()
+        request = self.context.get('request')
+        rows = []
+        consultants = {} if 'owner' in columns else None
+        for obj in instances:
+            rows.append([value(self, obj, request, tz) for value in getters])
+            if consultants is not None and obj.owner_id is not None and str(obj.owner_id) not in consultants:
+                consultants[str(obj.owner_id)] = self.get_consultant(obj)
+        data = {'columns': columns, 'rows': rows}
+        if consultants is not None:
+            data['consultants'] = consultants
+        return data
+
+def _datetime_iso(value, tz):
+    """DRF DateTimeField(ISO 8601) 출력과 같은 문자열로 변환합니다."""
+    if value is None:
+        return None
+    if tz is not None and timezone.is_aware(value):
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+def _file_url(value, request):
+    """DRF FileField 출력과 같이 파일 URL(요청이 있으면 절대 URL)을 반환합니다."""
+    if not value:
+        return None
+    try:
+        url = value.url
+    except AttributeError:
+        return None
+    return request.build_absolute_uri(url) if request is not None else url
+
+def _attribute(name):
+    return lambda serializer, obj, request, tz: getattr(obj, name)
+
+# ClientDataListSerializer의 출력 필드별 값 함수 (serializer, obj, request, tz) -> 값
+_LIST_VALUE_GETTERS = {
+    name: _attribute(name) for name in (
+        'id', 'name', 'contact', 'address', 'note', 'employee_note', 'sido', 'gugun', 'detailed_address',
+        'birth_date', 'gender', 'policy_count', 'premium_range', 'status', 'is_distributed', 'transmission_status',
+    )
+}
+_LIST_VALUE_GETTERS.update({
+    'owner': lambda serializer, obj, request, tz: obj.owner_id,
+    'audio_file': lambda serializer, obj, request, tz: _file_url(obj.audio_file, request),
+    'audio_file_2': lambda serializer, obj, request, tz: _file_url(obj.audio_file_2, request),
+    'distribution_date': lambda serializer, obj, request, tz: obj.distribution_date.isoformat() if obj.distribution_date else None,
+    'info_file': lambda serializer, obj, request, tz: _file_url(obj.info_file, request),
+    'created_at': lambda serializer, obj, request, tz: _datetime_iso(obj.created_at, tz),
+    'updated_at': lambda serializer, obj, request, tz: _datetime_iso(obj.updated_at, tz),
+    'consultant': lambda serializer, obj, request, tz: serializer.get_consultant(obj),
+    'gender_display': lambda serializer, obj, request, tz: serializer.GENDER_DISPLAY.get(obj.gender, obj.gender),
+    'status_display': lambda serializer, obj, request, tz: serializer.STATUS_DISPLAY.get(obj.status, obj.status),
+})
+
 class PerformanceRecordSerializer(serializers.ModelSerializer):
     """개인 실적 데이터 Serializer"""
     employee_username = serializers.CharField(source='employee.username', read_only=True)
@@ -124,6 +287,26 @@ class IncentiveSerializer(serializers.ModelSerializer):
         # id 필드를 추가하여 각 항목을 식별할 수 있도록 합니다.
         fields = ['id', 'case_count', 'reward_amount']
 
+class JobSerializer(serializers.ModelSerializer):
+    """백그라운드 작업 상태 Serializer (결과 파일이 있으면 download_url 포함)"""
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'kind_display', 'status', 'status_display', 'progress', 'params',
+            'result', 'error', 'download_url', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != 'SUCCEEDED' or not obj.result_file:
+            return None
+        url = reverse('job-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
 class SiteConfigurationSerializer(serializers.ModelSerializer):
     """사이트 설정(응원 메시지 등) Serializer"""
     class Meta:
@@ -0,0 +1,136 @@
+# core/signals.py
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .caching import (
+    invalidate_client_views, invalidate_incentive_views, invalidate_site_config_views, invalidate_staff_views,
+)
+from .events import publish_event
+from .models import AttendanceRecord, ClientData, Incentive, SiteConfiguration
+from .stats import key_from_instance, previous_key, record_client_change, record_client_delete
+from .sync import record_removals, touch_owner_clients
+
+
+@receiver(pre_save, sender=ClientData)
+def remember_previous_stat_key(sender, instance, raw=False, **kwargs):
+    """수정 전 집계 키를 보관해 두었다가 post_save에서 일별 통계 증감에 사용합니다."""
+    if raw or instance._state.adding:
+        return
+    instance._previous_stat_key = previous_key(instance)
+
+
+@receiver(post_save, sender=ClientData)
+def update_daily_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_key = getattr(instance, '_previous_stat_key', None)
+    new_key = key_from_instance(instance)
+    record_client_change(instance, created, old_key)
+    # 담당 직원(key[1]) 또는 현황(key[2])이 바뀐 경우에만 요약/시상 현황판 캐시를 무효화합니다.
+    if created or old_key is None or old_key[1:3] != new_key[1:3]:
+        invalidate_client_views([new_key[1]] + ([old_key[1]] if old_key else []))
+    if not created and old_key is not None and old_key[2] != new_key[2]:
+        publish_event('client.status', users=[instance.owner_id] if instance.owner_id else [],
+                      client_id=instance.pk, owner_id=instance.owner_id, status=instance.status)
+
+
+@receiver(pre_delete, sender=ClientData)
+def update_daily_stats_on_delete(sender, instance, **kwargs):
+    record_client_delete(instance)
+    invalidate_client_views([instance.owner_id])
+
+
+@receiver(post_save, sender=ClientData)
+def record_reassignment_tombstone(sender, instance, created, raw=False, **kwargs):
+    """담당 직원이 바뀌면 이전 담당 직원의 동기화 목록에서 빠지도록 제거 기록을 남깁니다."""
+    old_key = getattr(instance, '_previous_stat_key', None)
+    if raw or created or old_key is None:
+        return
+    if old_key[1] is not None and old_key[1] != instance.owner_id:
+        record_removals([(instance.pk, old_key[1])], 'REASSIGNED')
+
+
+@receiver(post_delete, sender=ClientData)
+def record_delete_tombstone(sender, instance, **kwargs):
+    record_removals([(instance.pk, instance.owner_id)], 'DELETED')
+
+
+@receiver(pre_delete, sender=User)
+def touch_clients_of_deleted_user(sender, instance, **kwargs):
+    """직원 삭제 시 담당 고객의 owner가 NULL로 바뀌므로, 관리자 동기화에 잡히도록 updated_at을 갱신합니다."""
+    touch_owner_clients(instance.pk)
+
+
+_incentive_bulk = threading.local()
+
+
+@contextmanager
+def incentive_bulk_change():
+    """
+    시상금 규칙을 한꺼번에 바꾸는 동안 행마다 보내던 무효화와 incentive.rules 이벤트를 멈추고,
+    블록이 끝나면 (커밋 후) 한 번만 보냅니다. 블록에서 예외가 나면 보내지 않습니다.
+    """
+    _incentive_bulk.active = True
+    try:
+        yield
+    finally:
+        _incentive_bulk.active = False
+    invalidate_incentive_views()
+    publish_event('incentive.rules')
+
+
+@receiver([post_save, post_delete], sender=Incentive)
+def invalidate_incentive_cache(sender, **kwargs):
+    if getattr(_incentive_bulk, 'active', False):
+        return
+    invalidate_incentive_views()
+    publish_event('incentive.rules')
+
+
+@receiver([post_save, post_delete], sender=SiteConfiguration)
+def invalidate_site_config_etag(sender, **kwargs):
+    invalidate_site_config_views()
+
+
+@receiver([post_save, post_delete], sender=AttendanceRecord)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_staff_etag(sender, raw=False, **kwargs):
+    """직원 목록(이름, 출근 여부)이 바뀔 수 있는 변경입니다."""
+    if not raw:
+        invalidate_staff_views()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """로그아웃/토큰 재발급 시 캐시된 인증 정보를 지웁니다."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_on_user_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        invalidate_user_tokens(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_tokens_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # group.user_set.clear()의 post_clear에는 pk_set이 없으므로 지우기 전에 구성원을 기억해 둡니다.
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    invalidate_staff_views()
+    if not reverse:
+        invalidate_user_tokens(instance.pk)
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_user_ids', None)
+    for user_id in pk_set or ():
+        invalidate_user_tokens(user_id)
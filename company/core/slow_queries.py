@@ -0,0 +1,167 @@
+# core/slow_queries.py
+"""
+느린 쿼리 샘플링과 실행 계획(EXPLAIN) 수집
+
+SLOW_QUERY_MS(밀리초)를 설정하면 모든 DB 연결에 실행 래퍼(slow_query_wrapper)를 붙여
+그보다 오래 걸린 쿼리의 SQL, 파라미터, 실행 시간, 요청 라우트(MetricsMiddleware가 켜져 있을 때)를
+프로세스별 링 버퍼(최근 SLOW_QUERY_BUFFER_SIZE건)에 남깁니다. 요청 밖(백그라운드 작업)의 쿼리도 포함됩니다.
+
+- 실행 계획은 요청을 늦추지 않도록 별도 스레드 하나에서 별도 DB 연결로 구합니다.
+  SQLite는 EXPLAIN QUERY PLAN, PostgreSQL은 EXPLAIN (ANALYZE 없이 계획만, 쿼리를 다시 실행하지 않음)을 사용합니다.
+- SELECT만 EXPLAIN 하고, 같은 모양의 쿼리는 EXPLAIN_REUSE_SECONDS 동안 구해 둔 계획을 다시 씁니다.
+- 파라미터에는 토큰 키, 비밀번호 해시 같은 값이 들어갈 수 있으므로 기본으로는 값 대신 타입과 길이만 남기고
+  ('<str len=40>'), PostgreSQL 실행 계획의 문자열 상수도 '?'로 가립니다. 실제 값은 SLOW_QUERY_PARAMS=True일 때만 남깁니다.
+- 버퍼는 관리자 전용 GET /api/slow-queries/ 로 조회하고 DELETE로 비웁니다.
+  gunicorn 워커가 여러 개면 요청을 받은 워커의 버퍼만 보입니다.
+"""
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_REUSE_SECONDS = 60
+MAX_PARAM_LENGTH = 200
+# 실행 계획에 채워진 문자열 상수 ('...', 안의 ''는 따옴표 이스케이프)
+_PLAN_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+_lock = threading.Lock()
+_samples = None
+_plans = {}
+# EXPLAIN 스레드가 실행하는 쿼리는 다시 샘플링하지 않습니다.
+_local = threading.local()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='core-explain')
+
+
+def install_slow_query_wrapper(connection, **kwargs):
+    """connection_created 시그널 수신자. SLOW_QUERY_MS가 0이면 붙이지 않습니다."""
+    if settings.SLOW_QUERY_MS > 0 and slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_local, 'explaining', False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        if duration * 1000 >= settings.SLOW_QUERY_MS:
+            _record(context['connection'], sql, None if many else params, duration)
+
+
+def _record(connection, sql, params, duration):
+    request_metrics = metrics.current()
+    sample = {
+        'sql': sql,
+        'params': _json_safe(params) if settings.SLOW_QUERY_PARAMS else _redacted(params),
+        'duration_ms': round(duration * 1000, 3),
+        'route': request_metrics.route if request_metrics is not None else None,
+        'database': connection.alias,
+        'vendor': connection.vendor,
+        'captured_at': timezone.now().isoformat(),
+        'plan': None,
+    }
+    with _lock:
+        _buffer().append(sample)
+    if sql.lstrip()[:6].upper() == 'SELECT':
+        _submit(_explain, sample, params)
+
+
+def _buffer():
+    global _samples
+    if _samples is None or _samples.maxlen != settings.SLOW_QUERY_BUFFER_SIZE:
+        _samples = deque(_samples or (), maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+    return _samples
+
+
+def _json_safe(params):
+    if params is None:
+        return None
+    values = params.values() if isinstance(params, dict) else params
+    return [
+        value if value is None or isinstance(value, (bool, int, float)) else str(value)[:MAX_PARAM_LENGTH]
+        for value in values
+    ]
+
+
+def _redacted(params):
+    """파라미터 값 대신 타입(문자열/바이트는 길이 포함)만 남깁니다."""
+    if params is None:
+        return None
+    values = params.values() if isinstance(params, dict) else params
+    return [
+        None if value is None
+        else f'<{type(value).__name__} len={len(value)}>' if isinstance(value, (str, bytes))
+        else f'<{type(value).__name__}>'
+        for value in values
+    ]
+
+
+def _submit(func, *args):
+    _executor.submit(func, *args)
+
+
+def _explain(sample, params):
+    shape = metrics.query_shape(sample['sql'])
+    with _lock:
+        cached = _plans.get(shape)
+    if cached is not None and time.monotonic() - cached[1] < EXPLAIN_REUSE_SECONDS:
+        plan = cached[0]
+    else:
+        try:
+            plan = explain(sample['database'], sample['sql'], params)
+            if not settings.SLOW_QUERY_PARAMS:
+                plan = _PLAN_LITERAL.sub("'?'", plan)
+        except Exception as e:
+            logger.warning('느린 쿼리 EXPLAIN 실패: %s', e)
+            plan = f'EXPLAIN 실패: {e}'
+        with _lock:
+            _plans[shape] = (plan, time.monotonic())
+    with _lock:
+        sample['plan'] = plan
+
+
+def explain(alias, sql, params):
+    """현재 스레드의 (별도) DB 연결로 실행 계획을 텍스트로 구합니다."""
+    _local.explaining = True
+    try:
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                # (id, parent, notused, detail): parent를 따라 들여쓰기 합니다.
+                depth = {0: -1}
+                lines = []
+                for node_id, parent, _, detail in cursor.fetchall():
+                    depth[node_id] = depth.get(parent, -1) + 1
+                    lines.append('  ' * depth[node_id] + detail)
+                return '\n'.join(lines)
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    finally:
+        _local.explaining = False
+        if threading.current_thread().name.startswith('core-explain'):
+            connections.close_all()
+
+
+def samples():
+    """최근 샘플 목록 (최신순)"""
+    with _lock:
+        return [dict(sample) for sample in reversed(_buffer())]
+
+
+def clear():
+    with _lock:
+        _buffer().clear()
+        _plans.clear()
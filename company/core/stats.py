@@ -0,0 +1,178 @@
+# core/stats.py
+"""
+고객 일별 통계(ClientDailyStat) 집계 테이블 관리
+
+ClientData 한 건은 (등록일, 담당 직원, 현황, 시/도, 배분여부) 셀 하나에 new_clients=1로,
+계약(1차/2차 성공) 고객이면 contracts=1로도 집계됩니다.
+통계 API는 ClientData 대신 이 테이블을 합산하므로 응답 시간이 고객 수에 비례해 늘어나지 않습니다.
+
+- 개별 저장/삭제: signals.py의 save/delete 시그널에서 record_client_change / record_client_delete
+- 일괄 처리: record_clients_created(엑셀 업로드), deltas_for_update(배분 UPDATE 직전)
+- 재계산: rebuild_daily_stats (manage.py rebuild_client_stats)
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import SUCCESS_STATUSES, ClientData, ClientDailyStat
+
+
+def stat_key(created_at, owner_id, status, sido, is_distributed):
+    """집계 셀의 키 (day, owner_id, status, sido, is_distributed)"""
+    return (timezone.localdate(created_at), owner_id, status, sido or '', bool(is_distributed))
+
+
+def key_from_values(values):
+    return stat_key(*(values[name] for name in ClientData.STAT_FIELDS))
+
+
+def key_from_instance(instance):
+    return stat_key(*(getattr(instance, name) for name in ClientData.STAT_FIELDS))
+
+
+def _delta(key, sign=1):
+    status = key[2]
+    return {key: (sign, sign if status in SUCCESS_STATUSES else 0)}
+
+
+def apply_deltas(deltas):
+    """
+    {키: (new_clients 증감, contracts 증감)} 를 집계 테이블에 반영합니다.
+    owner가 삭제되어 같은 키의 행이 여러 개가 될 수 있으므로 첫 번째 행에만 더하고, 조회는 항상 Sum으로 합니다.
+    """
+    with transaction.atomic():
+        for (day, owner_id, status, sido, is_distributed), (new_clients, contracts) in deltas.items():
+            if not new_clients and not contracts:
+                continue
+            cells = ClientDailyStat.objects.filter(
+                day=day, owner_id=owner_id, status=status, sido=sido, is_distributed=is_distributed
+            )
+            cell_id = cells.order_by('id').values_list('id', flat=True).first()
+            if cell_id is None:
+                ClientDailyStat.objects.create(
+                    day=day, owner_id=owner_id, status=status, sido=sido, is_distributed=is_distributed,
+                    new_clients=new_clients, contracts=contracts,
+                )
+            else:
+                ClientDailyStat.objects.filter(id=cell_id).update(
+                    new_clients=F('new_clients') + new_clients, contracts=F('contracts') + contracts
+                )
+
+
+def merge_deltas(*delta_dicts):
+    merged = defaultdict(lambda: (0, 0))
+    for deltas in delta_dicts:
+        for key, (new_clients, contracts) in deltas.items():
+            current = merged[key]
+            merged[key] = (current[0] + new_clients, current[1] + contracts)
+    return dict(merged)
+
+
+def previous_key(instance):
+    """저장/삭제 직전(DB 기준)의 집계 키를 반환합니다. DB에서 읽은 값이 불완전하면 다시 조회합니다."""
+    loaded = getattr(instance, '_loaded_stat_values', None)
+    if loaded is not None and len(loaded) == len(ClientData.STAT_FIELDS):
+        return key_from_values(loaded)
+    values = ClientData.objects.filter(pk=instance.pk).values(*ClientData.STAT_FIELDS).first()
+    return key_from_values(values) if values else None
+
+
+def remember_stat_values(instance):
+    instance._loaded_stat_values = {name: getattr(instance, name) for name in ClientData.STAT_FIELDS}
+
+
+def record_client_change(instance, created, old_key=None):
+    """ClientData 한 건의 생성/수정을 집계 테이블에 반영합니다."""
+    new_key = key_from_instance(instance)
+    if created:
+        apply_deltas(_delta(new_key))
+    elif old_key != new_key:
+        deltas = [_delta(new_key)]
+        if old_key is not None:
+            deltas.append(_delta(old_key, -1))
+        apply_deltas(merge_deltas(*deltas))
+    remember_stat_values(instance)
+
+
+def record_client_delete(instance):
+    """ClientData 한 건의 삭제를 집계 테이블에 반영합니다. (pre_delete 시점에 호출)"""
+    key = previous_key(instance)
+    if key is not None:
+        apply_deltas(_delta(key, -1))
+
+
+def record_clients_created(clients):
+    """bulk_create로 생성된 ClientData 목록을 집계 테이블에 반영합니다."""
+    apply_deltas(merge_deltas(*(_delta(key_from_instance(client)) for client in clients)))
+
+
+def _grouped_cells(queryset):
+    """QuerySet의 고객들을 집계 셀 단위로 묶어 (키, 고객 수, 계약 수)를 돌려줍니다. (GROUP BY 쿼리 1회)"""
+    rows = (
+        queryset.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'owner_id', 'status', 'sido', 'is_distributed')
+        .annotate(new_clients=Count('id'), contracts=Count('id', filter=Q(status__in=SUCCESS_STATUSES)))
+    )
+    for row in rows:
+        key = (row['day'], row['owner_id'], row['status'], row['sido'] or '', bool(row['is_distributed']))
+        yield key, row['new_clients'], row['contracts']
+
+
+def deltas_for_clients(queryset):
+    """QuerySet의 고객 전체를 집계 셀 증감값으로 변환합니다."""
+    return merge_deltas(*({key: (new_clients, contracts)} for key, new_clients, contracts in _grouped_cells(queryset)))
+
+
+def deltas_for_update(queryset, owner_id, is_distributed):
+    """
+    QuerySet의 고객들의 담당 직원/배분여부를 일괄 UPDATE 할 때 필요한 증감값을 반환합니다.
+    UPDATE 전에 호출해야 하며, 기존 셀에서 빼고 바뀐 셀에 더합니다.
+    """
+    deltas = []
+    for key, new_clients, contracts in _grouped_cells(queryset):
+        day, _, status, sido, _ = key
+        deltas.append({key: (-new_clients, -contracts)})
+        deltas.append({(day, owner_id, status, sido, is_distributed): (new_clients, contracts)})
+    return merge_deltas(*deltas)
+
+
+def day_range_bounds(start_date, end_date):
+    """[start_date, end_date] 날짜 구간을 현재 시간대 기준 datetime 반열린 구간으로 변환합니다."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def rebuild_daily_stats(start_date=None, end_date=None):
+    """
+    지정한 등록일 구간(없으면 전체)의 집계 행을 지우고 ClientData에서 다시 계산합니다.
+    반환값: 생성된 집계 행 수
+    """
+    clients = ClientData.objects.all()
+    cells = ClientDailyStat.objects.all()
+    if start_date is not None:
+        cells = cells.filter(day__gte=start_date)
+        clients = clients.filter(created_at__gte=day_range_bounds(start_date, start_date)[0])
+    if end_date is not None:
+        cells = cells.filter(day__lte=end_date)
+        clients = clients.filter(created_at__lt=day_range_bounds(end_date, end_date)[1])
+    with transaction.atomic():
+        cells.delete()
+        created = ClientDailyStat.objects.bulk_create(
+            [
+                ClientDailyStat(
+                    day=day, owner_id=owner_id, status=status, sido=sido, is_distributed=is_distributed,
+                    new_clients=new_clients, contracts=contracts,
+                )
+                for (day, owner_id, status, sido, is_distributed), (new_clients, contracts)
+                in deltas_for_clients(clients).items()
+            ],
+            batch_size=1000,
+        )
+    return len(created)
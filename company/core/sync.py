@@ -0,0 +1,118 @@
+# core/sync.py
+"""
+고객 목록 변경분 동기화 (?updated_since=)
+
+브라우저는 마지막으로 받은 next_updated_since 값을 보내고, 그 이후에
+- 수정/생성된 고객(updated_at 기준, (updated_at, id) 인덱스 사용)과
+- 목록에서 빠진 고객 id(ClientTombstone: 삭제, 다른 직원으로 담당 변경)만 받아 로컬 캐시를 고칩니다.
+
+다음 기준 시각(next_updated_since)은 요청 시각과, 다른 연결에서 아직 커밋되지 않은 쓰기 트랜잭션의
+시작 시각 중 이른 쪽에서 SYNC_OVERLAP만큼 앞당긴 값입니다. 대량 배분처럼 오래 걸리는 트랜잭션은 updated_at을
+트랜잭션 초반에 기록하고 한참 뒤에 커밋하므로, 요청 시각만 기준으로 하면 커밋된 뒤에도 그 행들을 영영 받지 못합니다.
+(PostgreSQL의 pg_stat_activity로 확인합니다. SQLite(개발용)는 확인하지 않습니다)
+
+제거 기록은 다음 경로에서 남깁니다.
+- 개별 삭제/저장: signals.py의 ClientData delete/save 시그널
+- 일괄 UPDATE: distribution.apply_distribution (record_reassignments)
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ClientData, ClientTombstone
+
+# 다음 기준 시각을 이만큼 더 앞당깁니다. 저장 시각(updated_at)을 트랜잭션 시작 직전에 구하는 경우와
+# 앱 서버와 DB 서버의 시계 차이를 흡수합니다. 겹치는 구간의 행은 다시 내려가지만, 브라우저는 id 기준으로 덮어쓰므로 결과는 같습니다.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def parse_since(value):
+    """updated_since 값(ISO 8601)을 aware datetime으로 변환합니다. 형식이 틀리면 None을 반환합니다."""
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        return None
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def is_expired(since, now=None):
+    """제거 기록 보관 기간보다 오래된 기준 시각이면 변경분만으로는 동기화할 수 없습니다."""
+    now = now or timezone.now()
+    return since < now - timedelta(days=settings.CLIENT_TOMBSTONE_RETENTION_DAYS)
+
+
+def oldest_open_write_start(using='default'):
+    """
+    다른 연결에서 아직 커밋되지 않은 쓰기 트랜잭션 중 가장 오래된 시작 시각을 반환합니다. (없거나 PostgreSQL이 아니면 None)
+    변경분을 읽기 전에 호출해야 합니다. 읽은 뒤에 커밋되는 쓰기는 이때 열려 있었거나 이후에 시작한 트랜잭션의 것입니다.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        # backend_xid는 트랜잭션이 처음 쓰기를 할 때 붙으므로, 읽기만 하는 트랜잭션은 제외됩니다.
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND pid <> pg_backend_pid() AND backend_xid IS NOT NULL"
+        )
+        return cursor.fetchone()[0]
+
+
+def next_since(now=None, open_since=None):
+    """다음 동기화 기준 시각. open_since(oldest_open_write_start)가 있으면 그 트랜잭션이 커밋할 행도 다음에 받도록 더 앞당깁니다."""
+    now = now or timezone.now()
+    if open_since is not None:
+        now = min(now, open_since)
+    return now - SYNC_OVERLAP
+
+
+def changed_clients(queryset, since):
+    """since 이후 수정/생성된 고객을 (updated_at, id) 순서로 반환합니다."""
+    return queryset.filter(updated_at__gt=since).order_by('updated_at', 'id')
+
+
+def removed_client_ids(user, since, admin=False):
+    """since 이후 user의 목록에서 빠진 고객 id 목록 (관리자는 삭제된 고객만 해당합니다)"""
+    tombstones = ClientTombstone.objects.filter(removed_at__gt=since)
+    if admin:
+        tombstones = tombstones.filter(reason='DELETED')
+    else:
+        tombstones = tombstones.filter(owner=user)
+    return list(tombstones.order_by().values_list('client_id', flat=True).distinct())
+
+
+def record_removals(pairs, reason):
+    """(고객 id, 이전 담당 직원 id) 목록을 제거 기록으로 저장합니다."""
+    now = timezone.now()
+    ClientTombstone.objects.bulk_create(
+        [ClientTombstone(client_id=client_id, owner_id=owner_id, reason=reason, removed_at=now)
+         for client_id, owner_id in pairs],
+        batch_size=1000,
+    )
+
+
+def record_reassignments(clients, owner_id):
+    """
+    clients(QuerySet)의 담당 직원을 owner_id로 바꾸는 일괄 UPDATE 직전에 호출하여,
+    다른 직원에게서 빠지는 고객을 제거 기록으로 남깁니다.
+    """
+    moved = clients.filter(owner__isnull=False).exclude(owner_id=owner_id).values_list('id', 'owner_id')
+    record_removals(moved, 'REASSIGNED')
+
+
+def prune_tombstones(now=None):
+    """보관 기간이 지난 제거 기록을 지우고, 지운 행 수를 반환합니다."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.CLIENT_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = ClientTombstone.objects.filter(removed_at__lt=cutoff).delete()
+    return deleted
+
+
+def touch_owner_clients(user_id):
+    """직원이 삭제되어 담당 고객의 owner가 NULL로 바뀌기 직전에 updated_at을 갱신해 관리자 동기화에 반영합니다."""
+    ClientData.objects.filter(owner_id=user_id).update(updated_at=timezone.now())
@@ -1,3 +1,1360 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+from decimal import Decimal
 
-# Create your tests here.
+import brotli
+import msgpack
+import openpyxl
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User, Group
+from django.urls import URLResolver, resolve, reverse
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import FileResponse, HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .distribution import apply_distribution
+from .caching import INCENTIVE_SCOPE, bump_version
+from .events import RESYNC_EVENT, InMemoryBroker, get_broker
+from .exporters import EXPORT_HEADERS, XLSX_CONTENT_TYPE
+from .importers import MAX_REPORTED_ERRORS, import_clients_from_excel
+from .incentives import IncentiveTable
+from . import async_views, slow_queries, views
+from .metrics import registry
+from .middleware import MetricsMiddleware
+from .models import (
+    AttendanceRecord, ClientData, ClientDailyStat, IdempotencyRecord, Incentive, Job, PerformanceRecord, SiteConfiguration,
+)
+from .renderers import ORJSONRenderer
+from .serializers import ClientDataSerializer
+from .stats import rebuild_daily_stats, record_clients_created
+
+
+class PerformanceStatisticsTests(APITestCase):
+    """관리자 대시보드 통계 API 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        staff = User.objects.create_user(username='staff', password='pw')
+        now = timezone.now()
+        ClientData.objects.bulk_create([
+            ClientData(name='고객1', contact='010', address='서울', status='SUCCESS_1', owner=staff, is_distributed=True),
+            ClientData(name='고객2', contact='010', address='서울', status='SUCCESS_2'),
+            ClientData(name='고객3', contact='010', address='부산', status='PENDING'),
+            ClientData(name='고객4', contact='010', address='부산', status='FAIL', owner=staff, is_distributed=True),
+        ])
+        # 90일 전에 등록된 계약 고객 (이번 달 통계에는 제외, 6개월 추이에는 포함)
+        old = ClientData.objects.create(name='고객5', contact='010', address='대구', status='SUCCESS_1')
+        ClientData.objects.filter(pk=old.pk).update(created_at=now - timedelta(days=90))
+        rebuild_daily_stats()
+        cls.old_month = (now - timedelta(days=90)).strftime('%Y-%m')
+        cls.this_month = now.strftime('%Y-%m')
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_statistics_contract(self):
+        response = self.client.get(reverse('performance-statistics'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['summary'], {'total_clients': 5, 'unassigned_clients': 3, 'total_contracts': 3})
+        self.assertEqual(data['monthly_performance'], {'new_clients': 4, 'contracts': 2})
+        self.assertEqual(data['region_top5'][0]['count'], 2)
+        self.assertEqual(len(data['region_top5']), 3)
+        trend = {item['month']: item['contracts'] for item in data['monthly_contract_trend']}
+        self.assertEqual(len(data['monthly_contract_trend']), 6)
+        self.assertEqual(list(trend)[-1], self.this_month)
+        self.assertEqual(trend[self.this_month], 2)
+        self.assertEqual(trend[self.old_month], 1)
+
+    def test_statistics_query_count(self):
+        # 권한 확인(Admin 그룹) 1회 + 통계 3회
+        with self.assertNumQueries(1 + 3):
+            self.client.get(reverse('performance-statistics'))
+
+
+class ClientImportTests(APITestCase):
+    """고객 엑셀 일괄 등록(core/importers.py) 테스트"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client.force_authenticate(self.admin)
+
+    def workbook(self, rows):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['고객명', '연락처', '주소', '메모'])
+        for row in rows:
+            workbook.active.append(row)
+        output = io.BytesIO()
+        workbook.save(output)
+        output.seek(0)
+        return output
+
+    def test_rows_are_flushed_in_batches(self):
+        rows = [[f'고객{i}', f'010-{i:04d}', '서울', ''] for i in range(5)]
+        progress = mock.Mock()
+        with mock.patch('core.importers.record_clients_created', wraps=record_clients_created) as recorded:
+            report = import_clients_from_excel(self.workbook(rows), batch_size=2, progress=progress)
+        self.assertEqual([len(call.args[0]) for call in recorded.call_args_list], [2, 2, 1])
+        self.assertEqual([call.args for call in progress.call_args_list], [(2, 5), (4, 5)])
+        self.assertEqual((report['created'], report['error_count']), (5, 0))
+        self.assertEqual(ClientData.objects.count(), 5)
+
+    def test_invalid_rows_are_reported_without_aborting_batch(self):
+        rows = [
+            ['홍길동', '010-1', '서울', ''],
+            ['', '010-2', '', ''],
+            ['김철수', 12345678.0, '', ''],
+            ['홍길동', '010-1', '부산', ''],
+            ['이영희', '', '', ''],
+            [None, None, None, None],
+        ]
+        report = import_clients_from_excel(self.workbook(rows), batch_size=10)
+        self.assertEqual((report['total_rows'], report['created'], report['skipped']), (5, 3, 1))
+        self.assertEqual([error['row'] for error in report['errors']], [3, 6])
+        # 같은 고객명/연락처가 다시 나와도 중복 검사는 하지 않습니다.
+        self.assertEqual(sorted(ClientData.objects.values_list('contact', flat=True)), ['010-1', '010-1', '12345678'])
+
+    def test_error_report_is_capped(self):
+        rows = [['', f'010-{i}', '', ''] for i in range(MAX_REPORTED_ERRORS + 20)] + [['홍길동', '010', '', '']]
+        report = import_clients_from_excel(self.workbook(rows))
+        self.assertEqual(report['error_count'], MAX_REPORTED_ERRORS + 20)
+        self.assertEqual(len(report['errors']), MAX_REPORTED_ERRORS)
+        self.assertEqual(report['created'], 1)
+
+    def test_upload_returns_throughput_summary(self):
+        upload = SimpleUploadedFile('clients.xlsx', self.workbook([['홍길동', '010', '서울', '']]).getvalue())
+        response = self.client.post(reverse('upload-clients'), {'excel_file': upload, 'batch_size': '50'}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['batch_size']), (1, 50))
+        self.assertGreater(response.data['rows_per_second'], 0)
+        self.assertGreaterEqual(response.data['elapsed_seconds'], 0)
+
+
+class ClientExportTests(APITestCase):
+    """고객 내보내기(core/exporters.py) CSV/XLSX 스트리밍 테스트"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client.force_authenticate(self.admin)
+        staff = [User.objects.create_user(username=f'staff{i}', first_name=f'직원{i}', password='pw') for i in range(2)]
+        ClientData.objects.bulk_create([
+            ClientData(name=f'고객{i}', contact=f'010-{i}', address='서울', status='FAIL' if i % 2 else 'PENDING',
+                       owner=staff[i % 2] if i % 3 else None, note='메모' if i == 0 else '')
+            for i in range(5)
+        ])
+        self.expected = [
+            [client.name, client.contact, client.address, client.owner.first_name if client.owner else '미지정',
+             client.get_status_display(), client.note]
+            for client in ClientData.objects.select_related('owner').order_by('-created_at')
+        ]
+
+    def rows_without_date(self, rows):
+        # 가입일(5번째 열)은 생성 시각이므로 형식만 확인하고 비교에서 뺍니다.
+        for row in rows:
+            self.assertRegex(row[4], r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$')
+        return [row[:4] + row[5:] for row in rows]
+
+    def test_csv_is_streamed_with_owner_names(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('download-clients'), {'file_format': 'csv'})
+            content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(response.streaming)
+        self.assertIn('.csv', response['Content-Disposition'])
+        # 권한 확인(Admin 그룹) 1회 + 내보내기 1회
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertEqual(len(rows) - 1, 5)
+        self.assertEqual(self.rows_without_date(rows[1:]), self.expected)
+
+    def test_xlsx_file_response_matches_data(self):
+        response = self.client.get(reverse('download-clients'))
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = [list(row) for row in workbook.active.iter_rows(values_only=True)]
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertEqual(self.rows_without_date([[value or '' for value in row] for row in rows[1:]]), self.expected)
+
+
+class DistributionTests(APITestCase):
+    """고객 배분(core/distribution.py) 테스트: 부하 균등 배분, 지역 우선, 상한, 미리보기(dry_run)"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        staff_group = Group.objects.create(name='Staff')
+        self.staff = []
+        for name in ('a', 'b', 'c'):
+            user = User.objects.create_user(username=name, first_name=name, password='pw')
+            user.groups.add(staff_group)
+            self.staff.append(user)
+        self.client.force_authenticate(self.admin)
+
+    def give(self, staff, count, status='PENDING', sido='서울'):
+        ClientData.objects.bulk_create([
+            ClientData(name='기존', contact='010', sido=sido, status=status, owner=staff, is_distributed=True)
+            for _ in range(count)
+        ])
+
+    def new_clients(self, *sidos):
+        return [ClientData.objects.create(name='신규', contact='010', sido=sido).id for sido in sidos]
+
+    def distribute(self, client_ids, staff=None, **options):
+        body = {
+            'client_ids': client_ids, 'staff_ids': [user.id for user in staff or self.staff],
+            'distribution_date': '2025-01-01', 'strategy': 'balanced', **options,
+        }
+        return self.client.post(reverse('distribute-clients'), body, format='json')
+
+    def assigned_counts(self, client_ids):
+        owners = ClientData.objects.filter(id__in=client_ids).values_list('owner_id', flat=True)
+        return [list(owners).count(user.id) for user in self.staff]
+
+    def test_balanced_evens_out_existing_load(self):
+        # 미처리 부하 a=3, b=0, c=1 (완료 고객은 부하에 포함하지 않음)
+        self.give(self.staff[0], 3)
+        self.give(self.staff[1], 4, status='FAIL')
+        self.give(self.staff[2], 1)
+        client_ids = self.new_clients(*['서울'] * 6)
+        response = self.distribute(client_ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assigned_counts(client_ids), [1, 3, 2])
+        self.assertEqual(response.data['unassigned_client_ids'], [])
+        client = ClientData.objects.get(id=client_ids[0])
+        self.assertEqual((client.is_distributed, str(client.distribution_date)), (True, '2025-01-01'))
+
+    def test_region_affinity_prefers_home_region_staff(self):
+        self.give(self.staff[0], 2, status='FAIL', sido='부산')
+        self.give(self.staff[1], 2, status='FAIL', sido='서울')
+        client_ids = self.new_clients('부산', '부산', '부산', '서울')
+        staff = self.staff[:2]
+
+        preview = self.distribute(client_ids, staff, dry_run=True).data['plan']
+        self.assertEqual([row['assigned_count'] for row in preview], [2, 2])
+
+        self.distribute(client_ids, staff, region_affinity='sido')
+        owners = dict(ClientData.objects.filter(id__in=client_ids).values_list('id', 'owner_id'))
+        self.assertEqual([owners[client_id] for client_id in client_ids], [staff[0].id] * 3 + [staff[1].id])
+
+    def test_cap_leaves_remaining_clients_unassigned(self):
+        self.give(self.staff[0], 1)
+        client_ids = self.new_clients(*['서울'] * 6)
+        response = self.distribute(client_ids, self.staff[:2], max_open_per_staff=2)
+        self.assertEqual(self.assigned_counts(client_ids), [1, 2, 0])
+        self.assertEqual(response.data['unassigned_client_ids'], client_ids[3:])
+        self.assertFalse(ClientData.objects.filter(id__in=client_ids[3:], is_distributed=True).exists())
+
+    def test_dry_run_does_not_write(self):
+        self.give(self.staff[0], 2)
+        client_ids = self.new_clients('서울', '서울')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.distribute(client_ids, dry_run='true')
+        writes = [q['sql'] for q in queries.captured_queries if not q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(writes, [])
+        self.assertTrue(response.data['dry_run'])
+        self.assertEqual([row['current_load'] for row in response.data['plan']], [2, 0, 0])
+        self.assertEqual([row['client_ids'] for row in response.data['plan']], [[], [client_ids[0]], [client_ids[1]]])
+        self.assertFalse(ClientData.objects.filter(id__in=client_ids, is_distributed=True).exists())
+
+    def test_round_robin_writes_all_clients_with_bounded_queries(self):
+        query_counts = []
+        for size in (6, 30):
+            client_ids = self.new_clients(*['서울'] * size)
+            # 권한 확인(그룹 조회) 결과가 사용자 객체에 캐시되지 않도록 요청마다 새로 불러옵니다.
+            self.client.force_authenticate(User.objects.get(pk=self.admin.pk))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.distribute(client_ids, strategy='round_robin')
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(queries))
+            self.assertEqual(self.assigned_counts(client_ids), [size // 3] * 3)
+            distributed = ClientData.objects.filter(
+                id__in=client_ids, is_distributed=True, distribution_date='2025-01-01', owner__isnull=False,
+            )
+            self.assertEqual(distributed.count(), size)
+        # 상담사별 UPDATE로 저장하므로 고객 수가 늘어도 쿼리 수는 같습니다.
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_boolean_options_are_parsed_strictly(self):
+        client_ids = self.new_clients('서울', '서울')
+        body = {'client_ids': client_ids, 'staff_ids': [user.id for user in self.staff], 'distribution_date': '2025-01-01'}
+        with mock.patch('core.distribution.random.shuffle') as shuffle:
+            response = self.client.post(reverse('distribute-clients'), {**body, 'dry_run': 'false', 'randomize': 'false'})
+        self.assertEqual(response.status_code, 200)
+        shuffle.assert_not_called()
+        # 폼 요청의 client_ids 여러 값이 모두 배분됩니다.
+        self.assertEqual(self.assigned_counts(client_ids), [1, 1, 0])
+
+        response = self.client.post(reverse('distribute-clients'), {**body, 'dry_run': 'maybe'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_payloads_are_rejected(self):
+        client_ids = self.new_clients('서울', '서울')
+        self.assertEqual(self.distribute(client_ids[0]).status_code, 400)
+        self.assertEqual(self.distribute(['a']).status_code, 400)
+        self.assertEqual(self.distribute(client_ids, distribution_date='2025/01/01').status_code, 400)
+        # 순차 배분에서는 무시될 옵션을 받지 않습니다.
+        response = self.distribute(client_ids, strategy='round_robin', max_open_per_staff=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('max_open_per_staff', response.data['error'])
+        self.assertFalse(ClientData.objects.filter(id__in=client_ids, is_distributed=True).exists())
+
+
+class ClientDailyStatTests(APITestCase):
+    """일별 통계 테이블 증분 갱신 테스트"""
+
+    def cube(self):
+        return sorted(
+            (row['day'], row['owner'], row['status'], row['sido'], row['is_distributed'], row['n'], row['c'])
+            for row in ClientDailyStat.objects.values('day', 'owner', 'status', 'sido', 'is_distributed')
+            .annotate(n=Sum('new_clients'), c=Sum('contracts')).filter(n__gt=0)
+        )
+
+    def test_incremental_updates_match_rebuild(self):
+        staff = User.objects.create_user(username='staff', password='pw')
+        client = ClientData.objects.create(name='고객1', contact='010', sido='서울')
+        other = ClientData.objects.create(name='고객2', contact='010')
+        client.status = 'SUCCESS_1'
+        client.save()
+        fetched = ClientData.objects.get(pk=client.pk)
+        fetched.owner = staff
+        fetched.save()
+        apply_distribution({staff.id: [other.pk]}, timezone.localdate())
+        ClientData.objects.create(name='고객3', contact='010').delete()
+
+        incremental = self.cube()
+        rebuild_daily_stats()
+        self.assertEqual(incremental, self.cube())
+        self.assertEqual(sum(row[5] for row in incremental), 2)
+        self.assertEqual(sum(row[6] for row in incremental), 1)
+
+
+class IncentiveBoardTests(APITestCase):
+    """시상금 규칙 테이블 및 시상 현황판 API 테스트"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_incentive_table_lookup(self):
+        table = IncentiveTable([('1~2', 10000), ('3~4건', 30000), ('10', 100000), ('잘못된 값', 999)])
+        self.assertEqual(
+            [table.reward_for(count) for count in (0, 1, 2, 3, 4, 5, 9, 10, 50)],
+            [0, 10000, 10000, 30000, 30000, 0, 0, 100000, 100000],
+        )
+
+    def test_board_query_count_does_not_grow_with_staff(self):
+        staff_group = Group.objects.create(name='Staff')
+        Incentive.objects.create(case_count='1~2', reward_amount=10000)
+        for i in range(5):
+            staff = User.objects.create_user(username=f'staff{i}', password='pw')
+            staff.groups.add(staff_group)
+            ClientData.objects.bulk_create(
+                [ClientData(name='고객', contact='010', owner=staff, status='SUCCESS_1') for _ in range(i)]
+            )
+        self.client.force_authenticate(User.objects.get(username='staff0'))
+        # 시상금 규칙 1회 + 상담사별 성공 건수 1회
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('incentive-board'))
+        self.assertEqual([row['success_count'] for row in response.json()], [4, 3, 2, 1, 0])
+        self.assertEqual([row['reward_amount'] for row in response.json()], [0, 0, 10000, 10000, 0])
+
+
+class ViewCacheTests(APITestCase):
+    """시상 현황판/직원 요약 캐시 및 무효화 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username='staff', password='pw')
+        self.staff.groups.add(Group.objects.create(name='Staff'))
+        self.client_data = ClientData.objects.create(name='고객', contact='010', owner=self.staff)
+        self.client.force_authenticate(self.staff)
+
+    def test_board_is_cached_until_status_changes(self):
+        self.client.get(reverse('incentive-board'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('incentive-board'))
+        self.assertEqual(response.json()[0]['success_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_data.status = 'SUCCESS_1'
+            self.client_data.save()
+        response = self.client.get(reverse('incentive-board'))
+        self.assertEqual(response.json()[0]['success_count'], 1)
+
+    def test_summary_is_invalidated_on_owner_change(self):
+        self.assertEqual(self.client.get(reverse('my-summary')).json()['total'], 1)
+        with self.assertNumQueries(0):
+            self.client.get(reverse('my-summary'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_data.owner = None
+            self.client_data.save()
+        self.assertEqual(self.client.get(reverse('my-summary')).json()['total'], 0)
+
+
+class KeysetPaginationTests(APITestCase):
+    """고객 목록 커서 페이지네이션 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        owner = User.objects.create_user(username='staff', password='pw', first_name='상담사')
+        ClientData.objects.bulk_create([
+            ClientData(
+                name=f'고객{i % 4}', contact='010', owner=owner if i % 3 else None,
+                distribution_date=None if i % 2 else timezone.localdate(),
+            )
+            for i in range(23)
+        ])
+
+    def walk(self, ordering):
+        self.client.force_authenticate(self.admin)
+        url = reverse('clientdata-list') + f'?pagination=cursor&page_size=5&ordering={ordering}'
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            last_url, url = url, response.data['next']
+        backwards = []
+        while last_url:
+            response = self.client.get(last_url)
+            backwards[:0] = [row['id'] for row in response.data['results']]
+            last_url = response.data['previous']
+        return ids, backwards
+
+    def test_walks_every_row_once_in_both_directions(self):
+        for ordering in ('-created_at', 'name', '-distribution_date', 'owner__first_name,-name'):
+            with self.subTest(ordering=ordering):
+                ids, backwards = self.walk(ordering)
+                self.assertEqual(sorted(ids), sorted(ClientData.objects.values_list('id', flat=True)))
+                self.assertEqual(ids, backwards)
+
+
+class ClientSearchTests(APITestCase):
+    """고객 목록 ?search= 검색(core/search.py) 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        cls.kim = ClientData.objects.create(name='Kim Minsu', contact='010-1111-2222', address='Seoul Gangnam-gu')
+        cls.lee = ClientData.objects.create(name='Lee Jiwon', contact='010-3333-4444', address='Busan Haeundae-gu',
+                                            note='VIP')
+        cls.park = ClientData.objects.create(name='Park Kim', contact='02-555-6666', address='Seoul Mapo-gu')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, query):
+        response = self.client.get(reverse('clientdata-list'), {'search': query})
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_matches_name_contact_address_and_note(self):
+        self.assertEqual(self.search('minsu'), [self.kim.id])
+        self.assertEqual(self.search('3333'), [self.lee.id])
+        self.assertEqual(self.search('mapo'), [self.park.id])
+        self.assertEqual(self.search('vip'), [self.lee.id])
+
+    def test_is_case_insensitive(self):
+        self.assertEqual(self.search('KIM'), self.search('kim'))
+        self.assertEqual(self.search('kIm'), [self.kim.id, self.park.id])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search('seoul'), [self.kim.id, self.park.id])
+        self.assertEqual(self.search('seoul kim'), [self.kim.id, self.park.id])
+        self.assertEqual(self.search('seoul 010'), [self.kim.id])
+        self.assertEqual(self.search('seoul busan'), [])
+
+
+class ClientListSerializerTests(APITestCase):
+    """고객 목록 전용 Serializer 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        staff = [User.objects.create_user(username=f'staff{i}', password='pw', first_name='' if i else '상담사') for i in range(3)]
+        ClientData.objects.bulk_create([
+            ClientData(
+                name=f'고객{i}', contact='010', owner=staff[i % 3] if i % 4 else None, gender='MF'[i % 2],
+                status=ClientData.STATUS_CHOICES[i % 6][0], distribution_date=timezone.localdate() if i % 2 else None,
+                audio_file='audio_files/a.mp3' if i % 5 == 0 else None,
+            )
+            for i in range(12)
+        ])
+
+    def test_list_matches_full_serializer_with_constant_queries(self):
+        self.client.force_authenticate(self.admin)
+        # 관리자 그룹 확인(1) + 전체 개수(1) + 목록 조회(1) 이며, 고객 수와 무관합니다.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('clientdata-list'))
+        request = response.wsgi_request
+        expected = ClientDataSerializer(ClientData.objects.all(), many=True, context={'request': request}).data
+        by_id = lambda rows: {row['id']: row for row in rows}
+        self.assertEqual(by_id(response.json()['results']), by_id(json.loads(json.dumps(expected))))
+
+
+class SparseFieldsetTests(APITestCase):
+    """?fields= / ?omit= 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        staff = User.objects.create_user(username='staff', password='pw', first_name='상담사')
+        ClientData.objects.bulk_create([
+            ClientData(name=f'고객{i}', contact='010', note='긴 메모' * 100, owner=staff if i % 2 else None)
+            for i in range(6)
+        ])
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), queries[-1]['sql']
+
+    def test_fields_trim_output_and_select_list(self):
+        data, sql = self.get(reverse('clientdata-list'), fields='name,status_display')
+        self.assertEqual(set(data['results'][0]), {'name', 'status_display'})
+        self.assertNotIn('"note"', sql)
+        self.assertNotIn('auth_user', sql)
+
+        data, sql = self.get(reverse('clientdata-list'), omit='note,employee_note')
+        self.assertEqual(set(data['results'][0]), set(ClientDataSerializer.readable_field_names()) - {'note', 'employee_note'})
+        self.assertNotIn('"note"', sql)
+        self.assertIn('auth_user', sql)
+
+        client = ClientData.objects.filter(owner__isnull=False).first()
+        data, _ = self.get(reverse('clientdata-detail', args=[client.pk]), fields='consultant')
+        self.assertEqual(data, {'consultant': '상담사 (staff)'})
+
+    def test_cursor_pages_with_ordering_outside_fields(self):
+        # 정렬/커서에 쓰이는 컬럼은 출력하지 않아도 함께 조회하므로, 지연 로딩 쿼리가 생기지 않습니다.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('clientdata-list'), {
+                'fields': 'name', 'pagination': 'cursor', 'ordering': 'owner__first_name', 'page_size': 4,
+            })
+        self.assertEqual(len(response.json()['results']), 4)
+        self.assertIsNotNone(response.json()['next'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('clientdata-list'), {'fields': 'name,owner'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ClientColumnsLayoutTests(APITestCase):
+    """?layout=columns 열 형식, MessagePack, 응답 압축 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        staff = User.objects.create_user(username='staff', password='pw', first_name='상담사')
+        ClientData.objects.bulk_create([
+            ClientData(name=f'고객{i}', contact='010', gender='F', status='FAIL', owner=staff if i % 2 else None)
+            for i in range(5)
+        ])
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_columns_match_object_layout(self):
+        objects = self.client.get(reverse('clientdata-list')).json()['results']
+        columns = self.client.get(reverse('clientdata-list'), {'layout': 'columns'}).json()['results']
+        self.assertNotIn('status_display', columns['columns'])
+        rows = [dict(zip(columns['columns'], row)) for row in columns['rows']]
+        for obj, row in zip(objects, rows):
+            consultant = columns['consultants'][str(row['owner'])] if row['owner'] else '미지정'
+            self.assertEqual(consultant, obj['consultant'])
+            self.assertEqual({key: row[key] for key in columns['columns'] if key != 'owner'},
+                             {key: obj[key] for key in columns['columns'] if key != 'owner'})
+
+        sparse = self.client.get(reverse('clientdata-list'), {'layout': 'columns', 'fields': 'name,status'}).json()
+        self.assertEqual(sparse['results']['columns'], ['name', 'status'])
+        self.assertNotIn('consultants', sparse['results'])
+
+    def test_msgpack_and_brotli(self):
+        response = self.client.get(reverse('clientdata-list'), {'layout': 'columns'},
+                                   HTTP_ACCEPT='application/msgpack', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        data = msgpack.unpackb(brotli.decompress(response.content))
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['results']['rows']), 5)
+
+    def test_orjson_renderer_matches_drf(self):
+        data = {'at': timezone.now(), 'day': timezone.localdate(), 'amount': Decimal('1.50'), 'name': '고객'}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class ClientSyncTests(APITestCase):
+    """?updated_since= 변경분 동기화 및 제거 기록 테스트"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.staff = User.objects.create_user(username='staff', password='pw')
+        self.other = User.objects.create_user(username='other', password='pw')
+        self.edited, self.deleted, self.moved, self.untouched = ClientData.objects.bulk_create([
+            ClientData(name=f'고객{i}', contact='010', owner=self.staff) for i in range(4)
+        ])
+        self.since = timezone.now()
+
+    def sync(self, user, since=None, **params):
+        self.client.force_authenticate(user)
+        since = (since or self.since).isoformat().replace('+00:00', 'Z')
+        return self.client.get(reverse('clientdata-list'), {'updated_since': since, **params})
+
+    def test_changes_and_tombstones_per_user(self):
+        self.edited.status = 'FAIL'
+        self.edited.save()
+        deleted_id = self.deleted.id
+        self.deleted.delete()
+        apply_distribution({self.other.id: [self.moved.id]}, timezone.localdate())
+
+        data = self.sync(self.staff).json()
+        self.assertEqual([row['id'] for row in data['results']], [self.edited.id])
+        self.assertEqual(sorted(data['deleted']), sorted([deleted_id, self.moved.id]))
+        self.assertIn('next_updated_since', data)
+
+        data = self.sync(self.other).json()
+        self.assertEqual(([row['id'] for row in data['results']], data['deleted']), ([self.moved.id], []))
+
+        data = self.sync(self.admin, fields='id').json()
+        self.assertEqual(data['results'], [{'id': self.edited.id}, {'id': self.moved.id}])
+        self.assertEqual(data['deleted'], [deleted_id])
+
+        # 다음 기준 시각 이후로 변경이 없으면 빈 응답입니다.
+        data = self.sync(self.staff, since=timezone.now()).json()
+        self.assertEqual((data['results'], data['deleted']), ([], []))
+
+    def test_distribution_committed_after_sync_read_is_picked_up_next_time(self):
+        # 배분 트랜잭션이 1분 전에 시작해 updated_at을 그 시각으로 기록했고, 동기화가 읽은 뒤에야 커밋되는 상황입니다.
+        started = timezone.now() - timedelta(minutes=1)
+        with mock.patch('core.views.oldest_open_write_start', return_value=started):
+            data = self.sync(self.other).json()
+        self.assertEqual(data['results'], [])
+        next_since = parse_datetime(data['next_updated_since'])
+        self.assertLessEqual(next_since, started)
+
+        with mock.patch('core.distribution.timezone.now', return_value=started):
+            apply_distribution({self.other.id: [self.moved.id]}, timezone.localdate())
+
+        data = self.sync(self.other, since=next_since).json()
+        self.assertEqual([row['id'] for row in data['results']], [self.moved.id])
+
+    def test_invalid_or_expired_since(self):
+        self.assertEqual(self.sync(self.staff, since=timezone.now() - timedelta(days=365)).status_code, 410)
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get(reverse('clientdata-list'), {'updated_since': 'yesterday'}).status_code, 400)
+
+
+class ConditionalRequestTests(APITestCase):
+    """ETag 조건부 요청(304) 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client_data = ClientData.objects.create(name='고객', contact='010')
+        self.client.force_authenticate(self.admin)
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_client_list_and_detail(self):
+        url = reverse('clientdata-list')
+        response = self.client.get(url, {'search': '고객'})
+        self.assertNotIn('Last-Modified', response)
+        # (MAX(updated_at), COUNT(*)) 만 실행하고 목록은 조회/직렬화하지 않습니다. (그룹은 첫 요청에서 조회됨)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.revalidate(url, response, search='고객').status_code, 304)
+        self.assertEqual(self.revalidate(url, response, search='없음').status_code, 200)
+
+        detail = reverse('clientdata-detail', args=[self.client_data.pk])
+        detail_response = self.client.get(detail)
+        self.assertEqual(self.revalidate(detail, detail_response).status_code, 304)
+
+        self.client_data.status = 'FAIL'
+        self.client_data.save()
+        self.assertEqual(self.revalidate(url, response, search='고객').status_code, 200)
+        self.assertEqual(self.revalidate(detail, detail_response).status_code, 200)
+        # 삭제는 updated_at에 드러나지 않지만 행 수가 달라집니다.
+        ClientData.objects.create(name='고객2', contact='010')
+        response = self.client.get(url)
+        ClientData.objects.filter(name='고객').delete()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_client_list_ignores_if_modified_since(self):
+        # 초 단위 시각으로는 같은 초 안의 수정이나 이전 행의 삭제를 알 수 없으므로 항상 본문을 보냅니다.
+        url = reverse('clientdata-list')
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_owner_rename_changes_client_etags(self):
+        staff = User.objects.create_user(username='staff', first_name='김상담', password='pw')
+        self.client_data.owner = staff
+        self.client_data.save()
+        url, detail = reverse('clientdata-list'), reverse('clientdata-detail', args=[self.client_data.pk])
+        response, detail_response = self.client.get(url), self.client.get(detail)
+        with self.captureOnCommitCallbacks(execute=True):
+            staff.first_name = '이상담'
+            staff.save()
+        renamed = self.revalidate(url, response)
+        self.assertEqual(renamed.status_code, 200)
+        self.assertEqual(renamed.data['results'][0]['consultant'], '이상담 (staff)')
+        self.assertEqual(self.revalidate(detail, detail_response).status_code, 200)
+
+    def test_versioned_endpoints(self):
+        url = reverse('incentive-list')
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Incentive.objects.create(case_count=1, reward_amount=1000)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        url = reverse('staff-list')
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.groups.add(Group.objects.create(name='Staff'))
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+
+class EventStreamTests(APITestCase):
+    """실시간 이벤트(SSE) 발행 및 스트림 테스트 (메모리 브로커)"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.staff = User.objects.create_user(username='staff', password='pw')
+        self.other = User.objects.create_user(username='other', password='pw')
+        self.token = Token.objects.create(user=self.staff)
+
+    def test_events_are_published_after_commit(self):
+        client = ClientData.objects.create(name='고객', contact='010', owner=self.staff)
+        with mock.patch.object(get_broker(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                client.status = 'FAIL'
+                client.save()
+                apply_distribution({self.other.id: [client.id]}, timezone.localdate())
+                Incentive.objects.create(case_count=1, reward_amount=1000)
+        events = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual([event['type'] for event in events], ['client.status', 'distribution.done', 'incentive.rules'])
+        self.assertEqual(events[0]['users'], [self.staff.id])
+        self.assertEqual(events[1]['data'], {'assigned': {str(self.other.id): 1}})
+
+    def test_incentive_bulk_update_publishes_once(self):
+        Incentive.objects.bulk_create([Incentive(case_count=f'{i}건', reward_amount=1000) for i in range(3)])
+        self.client.force_authenticate(self.admin)
+        rules = [{'case_count': f'{i}건', 'reward_amount': 2000} for i in range(4)]
+        with mock.patch.object(get_broker(), 'publish') as publish, \
+                mock.patch('core.caching.bump_version', wraps=bump_version) as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('incentive-bulk-update'), rules, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([call.args[0]['type'] for call in publish.call_args_list], ['incentive.rules'])
+        self.assertEqual([call.args[0] for call in bump.call_args_list].count(INCENTIVE_SCOPE), 1)
+        self.assertEqual(Incentive.objects.count(), 4)
+
+    def test_publish_skips_subscribers_with_closed_loop(self):
+        broker = InMemoryBroker()
+        closed_loop = asyncio.new_event_loop()
+        closed_loop.close()
+        dead = mock.Mock(loop=closed_loop)
+        alive = mock.Mock()
+        broker._register(dead)
+        broker._register(alive)
+        broker.publish(RESYNC_EVENT)
+        alive.loop.call_soon_threadsafe.assert_called_once()
+        self.assertEqual(broker._subscribers, {alive})
+
+    async def test_stream_delivers_visible_events(self):
+        response = await self.async_client.get(reverse('events'), {'token': self.token.key})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        # 첫 줄(retry)을 받았다면 구독은 이미 등록되어 있습니다.
+        next_message = asyncio.ensure_future(anext(stream))
+        get_broker().publish({'type': 'client.status', 'data': {'client_id': 1}, 'users': [self.other.id]})
+        get_broker().publish({'type': 'incentive.rules', 'data': {}, 'users': None})
+        message = await asyncio.wait_for(next_message, timeout=5)
+        self.assertEqual(message, b'event: incentive.rules\ndata: {}\n\n')
+        await stream.aclose()
+
+    def test_stream_is_not_served_under_wsgi(self):
+        # 테스트 클라이언트(self.client)는 WSGI 핸들러로 요청합니다. 스트림을 열지 않고 바로 501을 반환해야 합니다.
+        response = self.client.get(reverse('events'), {'token': self.token.key})
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+    async def test_stream_requires_token(self):
+        response = await self.async_client.get(reverse('events'), {'token': 'wrong'})
+        self.assertEqual(response.status_code, 401)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """토큰 인증 캐시 및 무효화 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin_group = Group.objects.create(name='Admin')
+        self.user = User.objects.create_user(username='admin', password='pw')
+        self.user.groups.add(self.admin_group)
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_request_needs_no_auth_queries(self):
+        self.client.get(reverse('site-configuration-list'))
+        # 인증(토큰, 사용자)과 권한(Admin 그룹) 확인 없이 설정 목록 조회 1회만 실행됩니다.
+        with self.assertNumQueries(1):
+            self.client.get(reverse('site-configuration-list'))
+
+    def test_group_change_and_logout_invalidate_cache(self):
+        self.assertEqual(self.client.get(reverse('site-configuration-list')).status_code, 200)
+        self.user.groups.remove(self.admin_group)
+        self.assertEqual(self.client.get(reverse('site-configuration-list')).status_code, 403)
+
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('my-summary')).status_code, 401)
+
+    def test_reverse_group_clear_invalidates_members(self):
+        self.assertEqual(self.client.get(reverse('site-configuration-list')).status_code, 200)
+        self.admin_group.user_set.clear()
+        self.assertEqual(self.client.get(reverse('site-configuration-list')).status_code, 403)
+
+
+class AsyncReadViewTests(APITestCase):
+    """
+    대시보드 조회 API 인증/권한 및 응답 테스트
+    기본(WSGI) 라우트는 views.py의 동기 뷰이고, SERVER_MODE=asgi에서 연결하는 async_views.py의 뷰는 직접 호출해 비교합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username='staff', password='pw')
+        self.token = Token.objects.create(user=self.staff)
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.admin_token = Token.objects.create(user=self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.factory = AsyncRequestFactory()
+
+    def call_async(self, view, token, method='get', **headers):
+        request = getattr(self.factory, method)('/', headers={'Authorization': f'Token {token}', **headers})
+        return async_to_sync(view)(request)
+
+    def test_routes_use_sync_views_under_wsgi(self):
+        routes = {
+            'my-summary': views.get_my_summary, 'performance-statistics': views.get_performance_statistics,
+            'incentive-board': views.get_incentive_board_data, 'attendance-today': views.get_today_attendance_status,
+        }
+        for name, view in routes.items():
+            self.assertIs(resolve(reverse(name)).func, view)
+
+    def test_token_auth_and_admin_permission(self):
+        self.assertEqual(self.client.get(reverse('my-summary')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('performance-statistics')).status_code, 403)
+        self.assertEqual(self.client.post(reverse('my-summary')).status_code, 405)
+        self.client.credentials(HTTP_AUTHORIZATION='Token wrong')
+        response = self.client.get(reverse('attendance-today'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    def test_async_views_auth_and_admin_permission(self):
+        self.assertEqual(self.call_async(async_views.get_my_summary, self.token.key).status_code, 200)
+        self.assertEqual(self.call_async(async_views.get_performance_statistics, self.token.key).status_code, 403)
+        self.assertEqual(self.call_async(async_views.get_my_summary, self.token.key, method='post').status_code, 405)
+        response = self.call_async(async_views.get_today_attendance_status, 'wrong')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    def test_async_views_match_sync_views(self):
+        self.client.post(reverse('attendance-check-in'))
+        ClientData.objects.create(name='고객', contact='010', owner=self.staff, status='SUCCESS_1')
+        self.staff.groups.add(Group.objects.create(name='Staff'))
+        Incentive.objects.create(case_count='1', reward_amount=10000)
+        cases = [
+            ('my-summary', async_views.get_my_summary, self.token.key),
+            ('performance-statistics', async_views.get_performance_statistics, self.admin_token.key),
+            ('incentive-board', async_views.get_incentive_board_data, self.token.key),
+            ('attendance-today', async_views.get_today_attendance_status, self.token.key),
+        ]
+        for name, view, token in cases:
+            with self.subTest(name=name):
+                cache.clear()
+                self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+                expected = self.client.get(reverse(name))
+                cache.clear()
+                self.assertEqual(json.loads(self.call_async(view, token).content), expected.json())
+
+    def test_board_answers_304_when_unchanged(self):
+        response = self.client.get(reverse('incentive-board'))
+        response = self.client.get(reverse('incentive-board'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.call_async(async_views.get_incentive_board_data, self.token.key)
+        response = self.call_async(async_views.get_incentive_board_data, self.token.key, **{'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+class JobTests(APITestCase):
+    """백그라운드 작업(core/jobs.py) 등록/실행/결과 재사용 테스트 (JOB_WORKERS=0: 커밋 직후 바로 실행)"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(JOB_WORKERS=0, MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client.force_authenticate(self.admin)
+
+    def submit(self, name, data, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(name), data, **kwargs)
+
+    def test_export_runs_and_result_is_reused_until_data_changes(self):
+        ClientData.objects.bulk_create([ClientData(name=f'고객{i}', contact='010') for i in range(3)])
+        response = self.submit('job-client-export', {'file_format': 'xlsx'})
+        self.assertEqual(response.status_code, 202)
+        job = self.client.get(reverse('job-detail', args=[response.data['id']])).data
+        self.assertEqual((job['status'], job['progress'], job['result']['rows']), ('SUCCEEDED', 100, 3))
+
+        download = self.client.get(job['download_url'])
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(download.streaming_content)), read_only=True)
+        self.assertEqual(len(list(workbook.active.iter_rows(values_only=True))), 4)
+
+        reused = self.submit('job-client-export', {'file_format': 'xlsx'})
+        self.assertEqual((reused.status_code, reused.data['id']), (200, job['id']))
+        ClientData.objects.create(name='고객', contact='010')
+        self.assertEqual(self.submit('job-client-export', {'file_format': 'xlsx'}).status_code, 202)
+
+    def test_import_job(self):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['고객명', '연락처', '주소', '메모'])
+        workbook.active.append(['홍길동', '010-1234-5678', '서울', ''])
+        workbook.active.append(['', '010', '', ''])
+        output = io.BytesIO()
+        workbook.save(output)
+        upload = SimpleUploadedFile('clients.xlsx', output.getvalue())
+        response = self.submit('job-client-import', {'excel_file': upload}, format='multipart')
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, 'SUCCEEDED')
+        self.assertEqual((job.result['created'], job.result['error_count']), (1, 1))
+        self.assertEqual(self.client.get(reverse('job-download', args=[job.pk])).status_code, 404)
+
+    def test_distribution_job(self):
+        staff = User.objects.create_user(username='staff', password='pw')
+        staff.groups.add(Group.objects.create(name='Staff'))
+        client = ClientData.objects.create(name='고객', contact='010')
+        self.assertEqual(self.submit('job-distribution', {'client_ids': [client.id]}, format='json').status_code, 400)
+
+        body = {'client_ids': [client.id], 'staff_ids': [staff.id], 'distribution_date': '2025-01-01'}
+        response = self.submit('job-distribution', body, format='json')
+        self.assertEqual(Job.objects.get(pk=response.data['id']).status, 'SUCCEEDED')
+        client.refresh_from_db()
+        self.assertEqual(client.owner, staff)
+
+    def test_distribution_job_keeps_form_lists(self):
+        staff = User.objects.create_user(username='staff', password='pw')
+        staff.groups.add(Group.objects.create(name='Staff'))
+        client_ids = [ClientData.objects.create(name='고객', contact='010').id for _ in range(3)]
+        body = {'client_ids': client_ids, 'staff_ids': [staff.id], 'distribution_date': '2025-01-01'}
+        response = self.submit('job-distribution', body)
+        self.assertEqual(Job.objects.get(pk=response.data['id']).params['client_ids'], [str(pk) for pk in client_ids])
+        self.assertEqual(ClientData.objects.filter(owner=staff).count(), 3)
+
+
+class IdempotencyKeyTests(APITestCase):
+    """Idempotency-Key 헤더로 배분/업로드 재시도를 한 번만 처리하는지 테스트"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, key, name='홍길동'):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['고객명', '연락처', '주소', '메모'])
+        workbook.active.append([name, '010-1234-5678', '서울', ''])
+        output = io.BytesIO()
+        workbook.save(output)
+        upload = SimpleUploadedFile('clients.xlsx', output.getvalue())
+        return self.client.post(reverse('upload-clients'), {'excel_file': upload}, format='multipart', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.upload('upload-1')
+        retry = self.upload('upload-1')
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(ClientData.objects.count(), 1)
+
+        self.assertEqual(self.upload('upload-1', name='김철수').status_code, 422)
+        self.upload('upload-2')
+        self.assertEqual(ClientData.objects.count(), 2)
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0)
+    def test_duplicate_of_in_progress_request_gets_conflict(self):
+        staff = User.objects.create_user(username='staff', password='pw')
+        staff.groups.add(Group.objects.create(name='Staff'))
+        client = ClientData.objects.create(name='고객', contact='010')
+        body = {'client_ids': [client.id], 'staff_ids': [staff.id], 'distribution_date': '2025-01-01'}
+        self.assertEqual(self.client.post(reverse('distribute-clients'), body, format='json', HTTP_IDEMPOTENCY_KEY='d-1').status_code, 200)
+
+        IdempotencyRecord.objects.filter(key='d-1').update(status='IN_PROGRESS')
+        response = self.client.post(reverse('distribute-clients'), body, format='json', HTTP_IDEMPOTENCY_KEY='d-1')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('Retry-After', response)
+
+
+class MetricsTests(APITestCase):
+    """요청 계측(Server-Timing) 및 /metrics 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.token = Token.objects.create(user=self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_server_timing_counts_sql_of_sync_and_async_views(self):
+        ClientData.objects.create(name='고객', contact='010')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('clientdata-list'))
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+        # 비동기 뷰의 ORM 쿼리(sync_to_async 스레드)도 같은 요청으로 집계됩니다.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('performance-statistics'))
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('clientdata-list'))
+        self.client.get(reverse('clientdata-list'))
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('http_requests_total{route="clientdata-list",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{route="clientdata-list",method="GET"} 2', body)
+        self.assertIn('http_request_sql_queries_bucket{route="clientdata-list",method="GET",le="+Inf"} 2', body)
+
+        staff = User.objects.create_user(username='staff', password='pw')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=staff).key}')
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(METRICS_TOKEN='scrape-secret'):
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+def _route_names(patterns):
+    """core/urls.py의 이름 있는 라우트 (라우터의 형식 접미사 패턴은 같은 이름이므로 한 번만)"""
+    names = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names += [name for name in _route_names(pattern.url_patterns) if name not in names]
+        elif pattern.name and pattern.name not in names:
+            names.append(pattern.name)
+    return names
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    라우트별 쿼리 예산: 데이터 양을 바꿔 같은 요청을 보내고, 쿼리 수가 행 수에 따라 늘지 않는지(N+1)와
+    선언한 예산을 넘지 않는지 확인합니다. 새 라우트를 추가하면 QUERY_BUDGETS나 NOT_MEASURED에 등록해야 합니다.
+    """
+    SIZES = (2, 8)
+
+    # 라우트 이름: 관리자 GET 요청 1회의 최대 쿼리 수 (캐시를 비운 상태, 권한 확인용 그룹 조회 포함)
+    QUERY_BUDGETS = {
+        'api-root': 0,
+        'clientdata-list': 3,
+        'clientdata-detail': 3,
+        'performance-list': 2,
+        'performance-detail': 1,
+        'incentive-list': 1,
+        'incentive-detail': 1,
+        'site-configuration-list': 2,
+        'site-configuration-detail': 2,
+        'user-list': 3,
+        'user-detail': 3,
+        'job-list': 3,
+        'job-detail': 2,
+        'staff-list': 2,
+        'download-clients': 2,
+        'my-summary': 1,
+        'performance-statistics': 4,
+        'range-statistics': 4,
+        'incentive-board': 2,
+        'attendance-today': 1,
+        'attendance-list': 2,
+        'slow-queries': 1,
+    }
+    # 데이터 양과 무관하게 측정하지 않는 라우트와 이유
+    NOT_MEASURED = {
+        'register': '사용자 생성 (쓰기)',
+        'login': '토큰 발급 (쓰기)',
+        'logout': '토큰 삭제 (쓰기)',
+        'incentive-bulk-update': '요청 본문 크기에 비례하는 쓰기',
+        'distribute-clients': '배분 대상 수에 비례하는 배치 쓰기 (DistributionTests 등)',
+        'upload-clients': '업로드 행 수에 비례하는 배치 쓰기',
+        'job-client-export': '작업 등록 (JobTests)',
+        'job-client-import': '작업 등록 (JobTests)',
+        'job-distribution': '작업 등록 (JobTests)',
+        'job-download': '결과 파일 응답 (JobTests)',
+        'attendance-check-in': '직원 본인 출근 기록 1건 쓰기',
+        'attendance-check-out': '직원 본인 퇴근 기록 1건 쓰기',
+        'events': 'SSE 스트림 (EventStreamTests)',
+    }
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.staff_group = Group.objects.create(name='Staff')
+        self.client.force_authenticate(self.admin)
+        self.seeded = 0
+
+    def _seed(self, size):
+        """직원 size명 규모가 되도록 직원, 고객, 출근/실적 기록, 작업, 설정을 추가합니다."""
+        statuses = [code for code, _ in ClientData.STATUS_CHOICES]
+        for i in range(self.seeded, size):
+            staff = User.objects.create_user(username=f'staff{i}', first_name=f'직원{i}', password='pw')
+            staff.groups.add(self.staff_group)
+            ClientData.objects.bulk_create([
+                ClientData(name=f'고객{i}-{n}', contact='010', address='서울', status=statuses[(i + n) % len(statuses)],
+                           owner=staff if n else None, is_distributed=bool(n))
+                for n in range(3)
+            ])
+            AttendanceRecord.objects.create(employee=staff)
+            PerformanceRecord.objects.create(employee=staff, date=timezone.localdate(), record_type='계약', value=i)
+            Incentive.objects.create(case_count=f'{i + 1}건', reward_amount=10000 * (i + 1))
+            SiteConfiguration.objects.create(key=f'key{i}', value='값')
+            Job.objects.create(kind='CLIENT_EXPORT', created_by=self.admin)
+        self.seeded = size
+        rebuild_daily_stats()
+
+    def _request(self, name):
+        today = timezone.localdate().isoformat()
+        kwargs = {
+            'clientdata-detail': lambda: {'pk': ClientData.objects.filter(owner__isnull=False).first().pk},
+            'performance-detail': lambda: {'pk': PerformanceRecord.objects.first().pk},
+            'incentive-detail': lambda: {'pk': Incentive.objects.first().pk},
+            'site-configuration-detail': lambda: {'key': 'key0'},
+            'user-detail': lambda: {'pk': self.staff_group.user_set.first().pk},
+            'job-detail': lambda: {'pk': Job.objects.first().pk},
+        }.get(name, dict)()
+        params = {'start_date': today, 'end_date': today} if name == 'range-statistics' else {}
+        url = reverse(name, kwargs=kwargs)
+        cache.clear()
+        # 요청마다 새로 인증한 것처럼 사용자 객체를 새로 읽습니다. (그룹 조회 결과가 객체에 남지 않도록)
+        self.client.force_authenticate(User.objects.get(pk=self.admin.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, name)
+        return len(queries)
+
+    def test_every_route_has_a_budget(self):
+        from . import urls
+        names = set(_route_names(urls.urlpatterns))
+        self.assertEqual(names - set(self.QUERY_BUDGETS) - set(self.NOT_MEASURED), set(), '예산이 없는 라우트')
+        self.assertEqual((set(self.QUERY_BUDGETS) | set(self.NOT_MEASURED)) - names, set(), '없는 라우트')
+
+    def test_query_count_is_constant_and_within_budget(self):
+        counts = {}
+        for size in self.SIZES:
+            self._seed(size)
+            counts[size] = {name: self._request(name) for name in self.QUERY_BUDGETS}
+        small, large = counts[self.SIZES[0]], counts[self.SIZES[-1]]
+        for name, budget in self.QUERY_BUDGETS.items():
+            with self.subTest(route=name):
+                self.assertEqual(small[name], large[name], f'{name}: 데이터가 늘어나면 쿼리 수가 늘어납니다 (N+1)')
+                self.assertLessEqual(large[name], budget, f'{name}: 쿼리 예산 초과')
+
+    @override_settings(NPLUSONE_DETECTION=True, NPLUSONE_THRESHOLD=3)
+    def test_runtime_detector_logs_lazy_loads_in_loop(self):
+        self._seed(3)
+
+        def view(request):
+            # 의도적인 N+1: 고객마다 담당 직원을 따로 조회합니다.
+            names = [client.owner.username for client in ClientData.objects.filter(owner__isnull=False)]
+            return HttpResponse(len(names))
+
+        request = RequestFactory().get('/n-plus-one/')
+        with self.assertLogs('core.metrics', level='WARNING') as logs:
+            MetricsMiddleware(view)(request)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('같은 SELECT 6회', logs.output[0])
+        self.assertIn('core/tests.py', logs.output[0])
+        self.assertIn('auth_user', logs.output[0])
+
+        # 실제 라우트는 미들웨어 스택을 거쳐도 경고가 없습니다.
+        with self.assertNoLogs('core.metrics', level='WARNING'):
+            self.client.get(reverse('attendance-list'))
+            self.client.get(reverse('user-list'))
+
+
+class SlowQueryTests(APITestCase):
+    """느린 쿼리 샘플링 및 실행 계획 수집 테스트"""
+
+    def setUp(self):
+        slow_queries.clear()
+        self.admin = User.objects.create_user(username='admin', password='pw')
+        self.admin.groups.add(Group.objects.create(name='Admin'))
+        self.client.force_authenticate(self.admin)
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_samples_include_route_params_and_plan(self):
+        ClientData.objects.create(name='고객', contact='010')
+        slow_queries.install_slow_query_wrapper(connection)
+        self.addCleanup(connection.execute_wrappers.remove, slow_queries.slow_query_wrapper)
+        # EXPLAIN 스레드 대신 바로 실행합니다. (테스트 DB 트랜잭션 안의 연결을 써야 하므로)
+        with mock.patch.object(slow_queries, '_submit', lambda func, *args: func(*args)):
+            self.client.get(reverse('clientdata-detail', args=[ClientData.objects.get().pk]))
+
+        data = self.client.get(reverse('slow-queries')).json()
+        sample = next(s for s in data['results'] if s['route'] == 'clientdata-detail' and 'core_clientdata' in s['sql'])
+        self.assertEqual(sample['vendor'], connection.vendor)
+        self.assertEqual(sample['params'][0], '<int>')
+        self.assertRegex(sample['plan'], 'SEARCH|Index Scan')
+        self.assertGreater(sample['duration_ms'], 0)
+
+        self.assertEqual(self.client.delete(reverse('slow-queries')).status_code, 204)
+        self.assertEqual(slow_queries.samples(), [])
+        staff = User.objects.create_user(username='staff', password='pw')
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.client.get(reverse('slow-queries')).status_code, 403)
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_params_are_redacted_unless_enabled(self):
+        token = Token.objects.create(user=self.admin)
+        slow_queries.install_slow_query_wrapper(connection)
+        self.addCleanup(connection.execute_wrappers.remove, slow_queries.slow_query_wrapper)
+        with mock.patch.object(slow_queries, '_submit', lambda func, *args: func(*args)):
+            Token.objects.filter(key=token.key).exists()
+            with self.settings(SLOW_QUERY_PARAMS=True):
+                Token.objects.filter(key=token.key).exists()
+
+        data = self.client.get(reverse('slow-queries')).json()
+        # 최신순이므로 설정을 켠 뒤의 쿼리가 먼저 옵니다.
+        raw, redacted = [sample for sample in data['results'] if 'authtoken_token' in sample['sql']]
+        self.assertNotIn(token.key, json.dumps(redacted))
+        self.assertIn(f'<str len={len(token.key)}>', redacted['params'])
+        self.assertIn(token.key, raw['params'])
+
+    def test_disabled_by_default(self):
+        slow_queries.install_slow_query_wrapper(connection)
+        self.assertNotIn(slow_queries.slow_query_wrapper, connection.execute_wrappers)
+
+
+class IndexPlanTests(APITestCase):
+    """
+    주요 조회가 인덱스를 타는지 실행 계획으로 확인합니다. API가 실제로 실행한 SQL(값이 채워진 형태)을 EXPLAIN 하므로
+    조건을 created_at__date, work_date__month 같은 변환 조회로 되돌리거나 인덱스를 지우면 실패합니다.
+    PostgreSQL은 테스트 데이터가 적어도 인덱스를 고르도록 순차 스캔을 끈 상태에서 계획을 구합니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='pw')
+        cls.admin.groups.add(Group.objects.create(name='Admin'))
+        staff_group = Group.objects.create(name='Staff')
+        cls.staff = []
+        for i in range(3):
+            user = User.objects.create_user(username=f'staff{i}', password='pw')
+            user.groups.add(staff_group)
+            AttendanceRecord.objects.create(employee=user)
+            cls.staff.append(user)
+        statuses = [code for code, _ in ClientData.STATUS_CHOICES]
+        ClientData.objects.bulk_create([
+            ClientData(name=f'고객{i}', contact='010', status=statuses[i % len(statuses)],
+                       owner=cls.staff[i % 3] if i % 4 else None, is_distributed=bool(i % 4))
+            for i in range(120)
+        ])
+        rebuild_daily_stats()
+        today = timezone.localdate().isoformat()
+        cls.date_range = {'start_date': today, 'end_date': today}
+
+    def setUp(self):
+        cache.clear()
+
+    def _plans(self, user, name, params=None):
+        """요청이 실행한 쿼리 중 고객/통계/출퇴근 테이블을 읽는 쿼리의 실행 계획 목록"""
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name), params or {})
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        tables = ('"core_clientdata"', '"core_clientdailystat"', '"core_attendancerecord"')
+        return [self._explain(query['sql']) for query in queries.captured_queries
+                if query['sql'].startswith('SELECT') and any(table in query['sql'] for table in tables)]
+
+    def _explain(self, sql):
+        if connection.vendor != 'postgresql':
+            return slow_queries.explain(connection.alias, sql, None)
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            try:
+                return slow_queries.explain(connection.alias, sql, None)
+            finally:
+                cursor.execute('RESET enable_seqscan')
+
+    def assertUsesIndex(self, plans, index_name):
+        self.assertTrue(plans)
+        for plan in plans:
+            # SQLite: 인덱스 없는 전체 스캔은 'SCAN 테이블'로만 표시됩니다. PostgreSQL: Seq Scan
+            full_scans = [line for line in plan.splitlines()
+                          if ('SCAN ' in line and 'USING' not in line) or 'Seq Scan on core_' in line]
+            self.assertEqual(full_scans, [], plan)
+        self.assertTrue(any(index_name in plan for plan in plans), '\n\n'.join(plans))
+
+    def test_client_list_date_range(self):
+        self.assertUsesIndex(self._plans(self.admin, 'clientdata-list', self.date_range), 'core_client_created_id_idx')
+        self.assertUsesIndex(self._plans(self.staff[0], 'clientdata-list', self.date_range), 'core_client_owner_created_idx')
+        self.assertUsesIndex(self._plans(self.admin, 'download-clients', self.date_range), 'core_client_created_id_idx')
+
+    def test_unassigned_client_list(self):
+        self.assertUsesIndex(self._plans(self.admin, 'clientdata-list', {'distributed': 'false'}), 'core_client_undist_created_idx')
+
+    def test_incentive_board_reads_success_index(self):
+        self.assertUsesIndex(self._plans(self.admin, 'incentive-board'), 'core_client_success_idx')
+
+    def test_stats_and_attendance_ranges(self):
+        self.assertUsesIndex(self._plans(self.staff[0], 'my-summary'), 'core_stat_owner_day_idx')
+        self.assertUsesIndex(self._plans(self.admin, 'attendance-list'), 'core_attendance_date_idx')
@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views 
+from . import async_views, views
 from .views import download_clients_excel
 
+# 대시보드 조회 API: ASGI 서버(SERVER_MODE=asgi)에서만 비동기 뷰를 연결합니다.
+# WSGI에서 비동기 뷰는 요청마다 이벤트 루프를 새로 만들어 더 느리므로 동기 DRF 뷰를 사용합니다.
+dashboard_views = async_views if settings.SERVER_MODE == 'asgi' else views
+
 # ViewSet을 위한 라우터 설정
 router = DefaultRouter()
 router.register('clientdata', views.ClientDataViewSet, basename='clientdata')
@@ -10,6 +15,7 @@ router.register('performance', views.PerformanceRecordViewSet, basename='perform
 router.register('incentives', views.IncentiveViewSet, basename='incentive')
 router.register('site-configurations', views.SiteConfigurationViewSet, basename='site-configuration')
 router.register('users', views.UserManagementViewSet, basename='user')
+router.register('jobs', views.JobViewSet, basename='job')
 
 # 각 기능별 API 엔드포인트 설정
 urlpatterns = [
@@ -29,12 +35,20 @@ urlpatterns = [
 
 
     # 4. 통계 및 대시보드 URL
-    path('my-summary/', views.get_my_summary, name='my-summary'),
-    path('statistics/', views.get_performance_statistics, name='performance-statistics'),
+    path('my-summary/', dashboard_views.get_my_summary, name='my-summary'),
+    path('statistics/', dashboard_views.get_performance_statistics, name='performance-statistics'),
+    path('statistics/range/', views.get_range_statistics, name='range-statistics'),
+    path('incentive-board/', dashboard_views.get_incentive_board_data, name='incentive-board'),
 
     # 5. 출퇴근 기록 관리 URL (신규 추가 및 수정)
-    path('attendance/today/', views.get_today_attendance_status, name='attendance-today'),
+    path('attendance/today/', dashboard_views.get_today_attendance_status, name='attendance-today'),
     path('attendance/check-in/', views.check_in_view, name='attendance-check-in'),
     path('attendance/check-out/', views.check_out_view, name='attendance-check-out'),
     path('attendance/', views.AttendanceRecordListView.as_view(), name='attendance-list'),
+
+    # 6. 실시간 이벤트 (SSE, ASGI 서버 필요: WSGI에서는 501)
+    path('events/', views.event_stream, name='events'),
+
+    # 7. 운영 진단 (관리자)
+    path('slow-queries/', views.slow_queries_view, name='slow-queries'),
 ]
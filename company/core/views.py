@@ -2,40 +2,60 @@
 # 1. Import 모듈
 # -------------------------------------------------------------------
 # Python 표준 라이브러리
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import random
+import asyncio
+import hmac
+import os
+from datetime import date, datetime
 
 # Django 및 서드파티 라이브러리
-from django.http import HttpResponse
+from asgiref.sync import sync_to_async
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User, Group
 from django.db import models, transaction
-from django.db.models import Count, Q, Sum, Exists, OuterRef
-from django.db.models.functions import Coalesce
+from django.db.models import Count, Q, Sum, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncMonth
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
 from rest_framework import viewsets, generics, status
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 # 로컬 앱 모듈
 from .models import (
     ClientData, EmployeeProfile, Incentive, PerformanceRecord, SiteConfiguration,
-    AttendanceRecord
+    AttendanceRecord, ClientDailyStat, Job, SUCCESS_STATUSES
 )
-from .permissions import IsAdminUser
+from .authentication import CachedTokenAuthentication
+from .permissions import IsAdminUser, is_admin
 from .serializers import (
-    ClientDataSerializer, IncentiveSerializer, PerformanceRecordSerializer,
+    ClientDataSerializer, ClientDataListSerializer, ClientDataColumnsSerializer, IncentiveSerializer, PerformanceRecordSerializer,
     SiteConfigurationSerializer, StaffSerializer, UserSerializer,
-    AttendanceRecordSerializer, UserManagementSerializer
+    AttendanceRecordSerializer, UserManagementSerializer, JobSerializer
 )
-from .pagination import FiftyResultsSetPagination
+from .pagination import FiftyResultsSetPagination, KeysetPagination
+from .renderers import MessagePackRenderer
+from .search import ClientSearchFilter
+from .events import format_sse, get_broker, is_visible, publish_event
+from .sync import changed_clients, is_expired, next_since, oldest_open_write_start, parse_since, removed_client_ids
+from . import metrics, slow_queries
+from .idempotency import idempotent
+from .importers import import_clients_from_excel
+from .jobs import EXPORT_FORMATS, export_cache_key, find_reusable_job, submit_job
+from .exporters import export_queryset, stream_clients_csv, stream_clients_xlsx
+from .incentives import get_incentive_table, refresh_incentive_table
+from .signals import incentive_bulk_change
+from .caching import BOARD_SCOPE, INCENTIVE_SCOPE, SITE_CONFIG_SCOPE, STAFF_SCOPE, get_or_compute, summary_scope
+from .conditional import VersionConditionalMixin, conditional_response, queryset_validators, version_validators
+from .distribution import distribution_params, parse_distribution_options, run_distribution
+from .stats import day_range_bounds
 
 
 # -------------------------------------------------------------------
@@ -45,13 +65,18 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
-class StaffListView(generics.ListAPIView):
+class StaffListView(VersionConditionalMixin, generics.ListAPIView):
     """ 'Staff' 그룹에 속한 모든 사용자의 목록과 출근 상태를 반환합니다. """
     serializer_class = StaffSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     filter_backends = [SearchFilter]
     search_fields = ['username', 'first_name']
     pagination_class = None
+    conditional_scopes = [STAFF_SCOPE]
+
+    def get_etag_parts(self):
+        # 출근 여부는 날짜가 바뀌면 달라집니다.
+        return super().get_etag_parts() + [timezone.now().date()]
 
     def get_queryset(self):
         today = timezone.now().date()
@@ -90,18 +115,101 @@ def logout_view(request):
 class ClientDataViewSet(viewsets.ModelViewSet):
     serializer_class = ClientDataSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter, OrderingFilter]
-    search_fields = ['name']
+    filter_backends = [ClientSearchFilter, OrderingFilter]
     ordering_fields = [
         'created_at', 'is_distributed', 'owner__first_name', 'distribution_date',
         'contact', 'address', 'name', 'gender', 'status', 'transmission_status'
     ]
     ordering = ['-created_at']
     pagination_class = FiftyResultsSetPagination
+    # Accept: application/msgpack 이면 MessagePack으로 응답합니다.
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+
+    @property
+    def paginator(self):
+        """ ?pagination=cursor 또는 ?cursor= 가 있으면 키셋(커서) 페이지네이션을, 아니면 페이지 번호 방식을 사용합니다. """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if self.is_sync_request() or params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+            if self.is_columns_layout():
+                # 열 형식은 가상 스크롤용이므로 한 페이지에 더 많은 행을 허용합니다.
+                self._paginator.max_page_size = settings.CLIENT_COLUMNS_MAX_PAGE_SIZE
+        return self._paginator
+
+    def is_sync_request(self):
+        """ 목록 조회에서 ?updated_since= 가 있으면 그 이후의 변경분만 반환하는 동기화 모드입니다. """
+        return self.action == 'list' and 'updated_since' in self.request.query_params
+
+    def is_columns_layout(self):
+        """ 목록 조회에서 ?layout=columns 이면 열 이름 목록 + 행 배열 형식으로 응답합니다. """
+        return self.action == 'list' and self.request.query_params.get('layout') == 'columns'
+
+    def get_serializer_class(self):
+        # 목록 조회는 출력 형식이 같은 빠른 읽기 전용 Serializer를 사용합니다.
+        if self.is_columns_layout():
+            return ClientDataColumnsSerializer
+        if self.action == 'list':
+            return ClientDataListSerializer
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_sparse_fields(self):
+        """
+        조회(list/retrieve) 시 ?fields=name,contact 또는 ?omit=note,employee_note 로 고른 출력 필드 목록을 반환합니다.
+        파라미터가 없으면 None(전체 필드)입니다.
+        """
+        if self.action not in ('list', 'retrieve'):
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            params = self.request.query_params
+            requested, omitted = (
+                [name.strip() for name in params.get(key, '').split(',') if name.strip()] for key in ('fields', 'omit')
+            )
+            if not requested and not omitted:
+                self._sparse_fields = None
+                return None
+            available = ClientDataSerializer.readable_field_names()
+            unknown = [name for name in requested + omitted if name not in available]
+            if unknown:
+                raise ValidationError({"error": f"알 수 없는 필드입니다: {', '.join(unknown)}"})
+            self._sparse_fields = [
+                name for name in available if (not requested or name in requested) and name not in omitted
+            ]
+        return self._sparse_fields
+
+    def filter_queryset(self, queryset):
+        if self.is_sync_request():
+            # 동기화는 검색/정렬 없이 담당 범위 전체의 변경분을 (updated_at, id) 순서로 반환합니다.
+            queryset = changed_clients(queryset, self.sync_since)
+        else:
+            queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        # 출력할 필드와 정렬(커서 위치 계산)에 필요한 컬럼만 SELECT 합니다.
+        columns = ClientDataSerializer.model_columns(fields)
+        columns.update(item.lstrip('-') for item in queryset.query.order_by if isinstance(item, str) and item != '?')
+        columns.discard('pk')
+        if any(column.startswith('owner__') for column in columns):
+            columns.add('owner')
+        else:
+            queryset = queryset.select_related(None)
+        return queryset.only(*columns)
 
     def get_queryset(self):
         user = self.request.user
-        queryset = ClientData.objects.all()
+        # consultant(담당 직원 이름) 출력을 위해 담당 직원을 함께 조회합니다. (행마다 쿼리하는 N+1 방지)
+        queryset = ClientData.objects.select_related('owner')
+        if self.is_sync_request():
+            return queryset if is_admin(user) else queryset.filter(owner=user)
         
         start_date_str = self.request.query_params.get('start_date')
         end_date_str = self.request.query_params.get('end_date')
@@ -109,19 +217,66 @@ class ClientDataViewSet(viewsets.ModelViewSet):
             try:
                 start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
                 end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__range=[start_date, end_date])
+                # created_at__date는 컬럼에 변환을 걸어 인덱스를 못 쓰므로 같은 구간의 created_at 범위로 조회합니다.
+                start, end = day_range_bounds(start_date, end_date)
+                queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
             except (ValueError, TypeError):
                 pass
 
         if self.request.query_params.get('distributed') == 'false':
             queryset = queryset.filter(is_distributed=False)
         
-        if user.groups.filter(name='Admin').exists():
+        if is_admin(user):
             return queryset
         return queryset.filter(owner=user)
 
+    def list(self, request, *args, **kwargs):
+        if self.is_sync_request():
+            return self.sync(request)
+        if isinstance(self.paginator, KeysetPagination):
+            # 커서 페이지네이션은 전체 범위를 집계하지 않도록 조건부 요청을 사용하지 않습니다.
+            return super().list(request, *args, **kwargs)
+        # 페이지 번호 방식은 어차피 COUNT(*)를 하므로, 같은 범위의 (MAX(updated_at), COUNT(*))로 변경 여부를 판단합니다.
+        # 담당 직원 이름(consultant)이 바뀌는 경우는 직원 버전으로 드러납니다.
+        last_modified, self.known_count = queryset_validators(self.filter_queryset(self.get_queryset()))
+        render = lambda: super(ClientDataViewSet, self).list(request, *args, **kwargs)
+        return conditional_response(request, render, [last_modified, self.known_count, *version_validators(STAFF_SCOPE)])
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        last_modified, count = queryset_validators(self.filter_queryset(self.get_queryset()).filter(**lookup))
+        render = lambda: super(ClientDataViewSet, self).retrieve(request, *args, **kwargs)
+        if not count:
+            return render()  # 404
+        return conditional_response(request, render, [last_modified, *version_validators(STAFF_SCOPE)])
+
+    def sync(self, request):
+        """
+        ?updated_since=<ISO 8601 시각> 변경분 동기화
+        - results: 그 이후 수정/생성된 고객 ((updated_at, id) 순서, 커서 페이지네이션)
+        - deleted: 그 이후 이 사용자의 목록에서 빠진 고객 id (첫 페이지에만 포함, results보다 먼저 반영)
+        - next_updated_since: 다음 동기화에 보낼 값 (첫 페이지 기준)
+        보관 기간보다 오래된 시각이면 410을 반환하며, 이때는 전체 목록을 다시 받아야 합니다.
+        """
+        now = timezone.now()
+        self.sync_since = parse_since(request.query_params['updated_since'])
+        if self.sync_since is None:
+            return Response({"error": "updated_since는 ISO 8601 시각이어야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if is_expired(self.sync_since, now):
+            return Response({"error": "동기화 기준 시각이 너무 오래되었습니다. 전체 목록을 다시 불러오세요."}, status=status.HTTP_410_GONE)
+
+        first_page = 'cursor' not in request.query_params
+        # 변경분을 읽기 전에, 아직 커밋되지 않은 쓰기(대량 배분 등)의 시작 시각을 확인해 둡니다.
+        open_since = oldest_open_write_start() if first_page else None
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        if first_page:
+            response.data['deleted'] = removed_client_ids(request.user, self.sync_since, admin=is_admin(request.user))
+            response.data['next_updated_since'] = next_since(now, open_since)
+        return response
+
 class PerformanceRecordViewSet(viewsets.ModelViewSet):
-    queryset = PerformanceRecord.objects.all().order_by('-date')
+    queryset = PerformanceRecord.objects.select_related('employee').order_by('-date')
     serializer_class = PerformanceRecordSerializer
     permission_classes = [IsAuthenticated]
     def list(self, request, *args, **kwargs):
@@ -143,125 +298,200 @@ class PerformanceRecordViewSet(viewsets.ModelViewSet):
 # -------------------------------------------------------------------
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminUser])
-@transaction.atomic
+@idempotent
 def distribute_clients(request):
-    """ 고객을 상담사에게 순차 또는 랜덤으로 배분합니다. """
-    client_ids = request.data.get('client_ids', [])
-    staff_ids = request.data.get('staff_ids', [])
-    distribution_date = request.data.get('distribution_date')
-    is_random = request.data.get('randomize', False) # 랜덤 배분 여부
-
-    if not all([client_ids, staff_ids, distribution_date]):
-        return Response({'error': '고객, 상담사, 배분날짜를 모두 선택해야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
-
+    """
+    고객을 상담사에게 배분합니다.
+    - strategy='round_robin'(기본): 순차 배분, randomize=true이면 상담사 순서를 섞은 뒤 순차 배분
+    - strategy='balanced': 미처리(PENDING) 고객이 적은 상담사부터 배분
+      (region_affinity='sido'|'gugun', max_open_per_staff 옵션 지원. round_robin에서 보내면 400)
+    - dry_run=true이면 저장하지 않고 배분 계획만 반환합니다.
+    - Idempotency-Key 헤더를 보내면 재시도 시 다시 배분하지 않고 첫 응답을 돌려줍니다. (core/idempotency.py)
+    - 대량 배분은 POST /api/jobs/distribution/ 으로 백그라운드 작업으로 실행할 수 있습니다.
+    """
     try:
-        staff_users = list(User.objects.filter(id__in=staff_ids, groups__name='Staff'))
-        clients_to_distribute = ClientData.objects.filter(id__in=client_ids)
-        
-        if not staff_users:
-            return Response({'error': '유효한 상담사가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # 랜덤 배분일 경우 상담사 목록을 섞습니다.
-        if is_random:
-            random.shuffle(staff_users)
-        
-        staff_count = len(staff_users)
-        for i, client in enumerate(clients_to_distribute):
-            client.owner = staff_users[i % staff_count]
-            client.is_distributed = True
-            client.distribution_date = distribution_date
-            client.save()
-
-        return Response({'message': f'{len(clients_to_distribute)}명의 고객을 {staff_count}명의 상담사에게 배분했습니다.'}, status=status.HTTP_200_OK)
+        options = parse_distribution_options(request.data)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return Response(run_distribution(options), status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminUser])
+@idempotent
 def client_excel_upload(request):
+    """
+    엑셀 파일의 고객 데이터를 스트리밍으로 읽어 배치 단위로 일괄 등록합니다. (큰 파일은 POST /api/jobs/client-import/)
+    Idempotency-Key 헤더를 보내면 재시도 시 다시 등록하지 않고 첫 응답을 돌려줍니다.
+    """
     excel_file = request.FILES.get('excel_file')
     if not excel_file:
         return Response({'error': '엑셀 파일이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        workbook = openpyxl.load_workbook(excel_file)
-        sheet = workbook.active
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            if not row or not row[1]: continue
-            name, contact, address, note = row[:4]
-            ClientData.objects.create(name=name, contact=contact, address=address, note=note)
-        return Response({'message': '엑셀 파일이 성공적으로 업로드되었습니다.'}, status=status.HTTP_201_CREATED)
+        report = import_clients_from_excel(excel_file, batch_size=request.data.get('batch_size'))
     except Exception as e:
         return Response({'error': f'파일 처리 중 오류 발생: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    message = f"{report['created']}건의 고객 데이터가 등록되었습니다."
+    if report['error_count']:
+        message += f" ({report['error_count']}건 오류)"
+    return Response({'message': message, **report}, status=status.HTTP_201_CREATED)
 
 
 # -------------------------------------------------------------------
 # 5. 통계 및 대시보드 API
 # -------------------------------------------------------------------
+# SERVER_MODE=asgi이면 urls.py가 직원 요약, 관리자 통계, 시상 현황판 조회를 같은 내용의 비동기 뷰(core/async_views.py)로 연결합니다.
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_my_summary(request):
+    """ 로그인한 직원의 이번 달 등록 고객 현황을 반환합니다. (캐시 사용) """
     user = request.user
-    today = datetime.now()
-    user_clients = ClientData.objects.filter(owner=user, created_at__year=today.year, created_at__month=today.month)
-    status_counts = user_clients.values('status').annotate(count=Count('status'))
-    summary = {'total': user_clients.count(), 'PENDING': 0, 'ABSENT': 0, 'FAIL': 0, 'SUCCESS_1': 0, 'SUCCESS_2': 0, 'PROMISING': 0}
+    this_month = timezone.localdate().replace(day=1)
+    render = lambda: Response(get_or_compute(
+        summary_scope(user.id), this_month.strftime('%Y-%m'), lambda: _compute_my_summary(user, this_month)
+    ))
+    return conditional_response(request, render, version_validators(summary_scope(user.id)) + [this_month])
+
+def _compute_my_summary(user, this_month):
+    """ 이번 달 등록 고객 현황을 일별 통계 테이블에서 합산합니다. """
+    status_counts = (
+        ClientDailyStat.objects.filter(owner=user, day__gte=this_month, day__lt=this_month + relativedelta(months=1))
+        .values('status').annotate(count=Sum('new_clients')).order_by()
+    )
+    summary = {'total': 0, 'PENDING': 0, 'ABSENT': 0, 'FAIL': 0, 'SUCCESS_1': 0, 'SUCCESS_2': 0, 'PROMISING': 0}
     for item in status_counts:
+        summary['total'] += item['count']
         if item['status'] in summary:
             summary[item['status']] = item['count']
     success_count = summary['SUCCESS_1'] + summary['SUCCESS_2']
     summary['success_rate'] = (success_count / summary['total'] * 100) if summary['total'] > 0 else 0
-    return Response(summary)
+    return summary
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def get_performance_statistics(request):
-    today = datetime.now()
-    SUCCESS_STATUSES = ['SUCCESS_1', 'SUCCESS_2']
-    summary_stats = {'total_clients': ClientData.objects.count(),'unassigned_clients': ClientData.objects.filter(is_distributed=False).count(),'total_contracts': ClientData.objects.filter(status__in=SUCCESS_STATUSES).count(),}
-    monthly_stats = {'new_clients': ClientData.objects.filter(created_at__year=today.year, created_at__month=today.month).count(),'contracts': ClientData.objects.filter(created_at__year=today.year, created_at__month=today.month, status__in=SUCCESS_STATUSES).count(),}
+    """
+    관리자 대시보드 통계를 반환합니다.
+    요약/이번 달 실적과 6개월 계약 추이는 일별 통계 테이블(ClientDailyStat)에서 합산하고,
+    지역 TOP5는 자유 입력 주소(address) 기준이므로 ClientData에서 그룹 집계합니다. (총 3회)
+    """
+    this_month = timezone.localdate().replace(day=1)
+    next_month = this_month + relativedelta(months=1)
+    trend_start = this_month - relativedelta(months=5)
+    in_this_month = Q(day__gte=this_month, day__lt=next_month)
+
+    counts = ClientDailyStat.objects.aggregate(
+        total_clients=Coalesce(Sum('new_clients'), 0),
+        unassigned_clients=Coalesce(Sum('new_clients', filter=Q(is_distributed=False)), 0),
+        total_contracts=Coalesce(Sum('contracts'), 0),
+        new_clients=Coalesce(Sum('new_clients', filter=in_this_month), 0),
+        contracts=Coalesce(Sum('contracts', filter=in_this_month), 0),
+    )
+    summary_stats = {key: counts[key] for key in ('total_clients', 'unassigned_clients', 'total_contracts')}
+    monthly_stats = {key: counts[key] for key in ('new_clients', 'contracts')}
+
     region_top5 = list(ClientData.objects.values('address').annotate(count=Count('id')).order_by('-count')[:5])
+
+    contracts_by_month = {
+        row['month'].strftime("%Y-%m"): row['contracts']
+        for row in ClientDailyStat.objects.filter(day__gte=trend_start, day__lt=next_month)
+        .annotate(month=TruncMonth('day')).values('month').annotate(contracts=Sum('contracts')).order_by()
+    }
     monthly_trend = []
-    for i in range(6):
-        date_cursor = today - relativedelta(months=i)
-        contracts_in_month = ClientData.objects.filter(created_at__year=date_cursor.year, created_at__month=date_cursor.month, status__in=SUCCESS_STATUSES).count()
-        monthly_trend.append({'month': date_cursor.strftime("%Y-%m"), 'contracts': contracts_in_month})
-    monthly_trend.reverse()
+    for i in range(5, -1, -1):
+        month = (this_month - relativedelta(months=i)).strftime("%Y-%m")
+        monthly_trend.append({'month': month, 'contracts': contracts_by_month.get(month, 0)})
     return Response({'summary': summary_stats,'monthly_performance': monthly_stats,'region_top5': region_top5,'monthly_contract_trend': monthly_trend,}, status=status.HTTP_200_OK)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def get_range_statistics(request):
+    """
+    임의 기간(start_date ~ end_date, 등록일 기준)의 신규 고객/계약 통계를 일별 통계 테이블에서 반환합니다.
+    owner=<직원 id>를 주면 해당 직원의 통계만 집계합니다.
+    """
+    try:
+        start_date = datetime.strptime(request.query_params.get('start_date', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.query_params.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return Response({'error': 'start_date, end_date를 YYYY-MM-DD 형식으로 입력해야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if start_date > end_date:
+        return Response({'error': '시작일이 종료일보다 늦을 수 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    cells = ClientDailyStat.objects.filter(day__gte=start_date, day__lte=end_date)
+    owner_id = request.query_params.get('owner')
+    if owner_id:
+        cells = cells.filter(owner_id=owner_id)
+
+    totals = {'new_clients': Sum('new_clients'), 'contracts': Sum('contracts')}
+    daily = [
+        {'day': row['day'].isoformat(), 'new_clients': row['new_clients'], 'contracts': row['contracts']}
+        for row in cells.values('day').annotate(**totals).order_by('day')
+    ]
+    by_status = {row['status']: row['new_clients'] for row in cells.values('status').annotate(new_clients=Sum('new_clients')).order_by()}
+    by_sido = [
+        {'sido': row['sido'] or '미지정', 'new_clients': row['new_clients'], 'contracts': row['contracts']}
+        for row in cells.values('sido').annotate(**totals).order_by('-new_clients')
+    ]
+    return Response({
+        'start_date': start_date.isoformat(), 'end_date': end_date.isoformat(),
+        'new_clients': sum(item['new_clients'] for item in daily),
+        'contracts': sum(item['contracts'] for item in daily),
+        'by_status': by_status, 'by_sido': by_sido, 'daily': daily,
+    }, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_incentive_board_data(request):
-    today = datetime.now()
-    SUCCESS_STATUSES = ['SUCCESS_1', 'SUCCESS_2']
-    incentive_rules = list(Incentive.objects.order_by('case_count').values('case_count', 'reward_amount'))
-    staff_users = User.objects.filter(groups__name='Staff')
-    board_data = []
-    for user in staff_users:
-        success_count = ClientData.objects.filter(owner=user, status__in=SUCCESS_STATUSES, updated_at__year=today.year, updated_at__month=today.month).count()
-        current_reward = 0
-        for rule in incentive_rules:
-            try:
-                if str(rule['case_count']).isdigit() and success_count >= int(rule['case_count']):
-                    current_reward = rule['reward_amount']
-                elif '~' in str(rule['case_count']):
-                    start, end = map(int, str(rule['case_count']).split('~'))
-                    if start <= success_count <= end:
-                        current_reward = rule['reward_amount']
-            except (ValueError, TypeError):
-                continue
-        board_data.append({'employee_name': user.first_name or user.username, 'success_count': success_count, 'reward_amount': current_reward})
-    sorted_board_data = sorted(board_data, key=lambda x: x['success_count'], reverse=True)
-    return Response(sorted_board_data, status=status.HTTP_200_OK)
+    """ 이번 달 상담사별 성공 건수와 해당 시상금을 반환합니다. (캐시 사용) """
+    this_month = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    render = lambda: Response(
+        get_or_compute(BOARD_SCOPE, this_month.strftime('%Y-%m'), lambda: _compute_incentive_board(this_month)),
+        status=status.HTTP_200_OK,
+    )
+    return conditional_response(request, render, version_validators(BOARD_SCOPE) + [this_month.date()])
+
+def _compute_incentive_board(this_month):
+    """
+    상담사별 성공 건수를 쿼리 한 번으로 집계하고 시상금 테이블에서 보상을 찾습니다. (쿼리 2회)
+    건수는 상담사마다 상관 서브쿼리로 세므로, 계약 고객 부분 인덱스(core_client_success_idx)의 (owner, updated_at) 범위만 읽습니다.
+    """
+    incentive_table = get_incentive_table()
+    success_counts = (
+        ClientData.objects.filter(
+            owner=OuterRef('pk'), status__in=SUCCESS_STATUSES,
+            updated_at__gte=this_month, updated_at__lt=this_month + relativedelta(months=1),
+        )
+        .order_by().values('owner').annotate(count=Count('id')).values('count')
+    )
+    staff_users = User.objects.filter(groups__name='Staff').annotate(
+        success_count=Coalesce(Subquery(success_counts), 0)
+    ).values('first_name', 'username', 'success_count')
+    board_data = [
+        {
+            'employee_name': user['first_name'] or user['username'],
+            'success_count': user['success_count'],
+            'reward_amount': incentive_table.reward_for(user['success_count']),
+        }
+        for user in staff_users
+    ]
+    return sorted(board_data, key=lambda x: x['success_count'], reverse=True)
 
 
 # -------------------------------------------------------------------
 # 6. 기타 설정 API (ViewSet)
 # -------------------------------------------------------------------
-class IncentiveViewSet(viewsets.ModelViewSet):
+class IncentiveViewSet(VersionConditionalMixin, viewsets.ModelViewSet):
     queryset = Incentive.objects.all().order_by('case_count')
     serializer_class = IncentiveSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = None
+    conditional_scopes = [INCENTIVE_SCOPE]
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             self.permission_classes = [IsAuthenticated]
@@ -270,18 +500,22 @@ class IncentiveViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
     @action(detail=False, methods=['post'], url_path='bulk-update')
     def bulk_update(self, request):
-        Incentive.objects.all().delete()
         serializer = self.get_serializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # 행마다 시그널이 이벤트를 보내고 버전을 올리지 않도록 묶어서, 커밋 후 한 번만 보냅니다.
+        with transaction.atomic(), incentive_bulk_change():
+            Incentive.objects.all().delete()
+            serializer.save()
+        refresh_incentive_table()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class SiteConfigurationViewSet(viewsets.ModelViewSet):
+class SiteConfigurationViewSet(VersionConditionalMixin, viewsets.ModelViewSet):
     queryset = SiteConfiguration.objects.all()
     serializer_class = SiteConfigurationSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     pagination_class = None
     lookup_field = 'key'
+    conditional_scopes = [SITE_CONFIG_SCOPE]
 
 
 # -------------------------------------------------------------------
@@ -290,7 +524,7 @@ class SiteConfigurationViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_today_attendance_status(request):
-    record = AttendanceRecord.objects.filter(employee=request.user, work_date=timezone.now().date()).first()
+    record = AttendanceRecord.objects.select_related('employee').filter(employee=request.user, work_date=timezone.now().date()).first()
     if record:
         serializer = AttendanceRecordSerializer(record)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -304,6 +538,7 @@ def check_in_view(request):
     if AttendanceRecord.objects.filter(employee=employee, work_date=today).exists():
         return Response({'error': '이미 오늘 출근 처리되었습니다.'}, status=status.HTTP_400_BAD_REQUEST)
     record = AttendanceRecord.objects.create(employee=employee)
+    publish_event('attendance.check_in', users=[employee.id], employee_id=employee.id)
     serializer = AttendanceRecordSerializer(record)
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -320,6 +555,7 @@ def check_out_view(request):
         return Response({'error': '이미 퇴근 처리되었습니다.'}, status=status.HTTP_400_BAD_REQUEST)
     record.check_out_time = timezone.now()
     record.save()
+    publish_event('attendance.check_out', users=[employee.id], employee_id=employee.id)
     serializer = AttendanceRecordSerializer(record)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -328,13 +564,17 @@ class AttendanceRecordListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
     pagination_class = None
     def get_queryset(self):
+        # employee_name(employee.first_name)을 행마다 조회하지 않도록 직원을 JOIN 합니다.
+        records = AttendanceRecord.objects.select_related('employee')
         month_str = self.request.query_params.get('month')
-        if not month_str:
-            today = timezone.now()
-            return AttendanceRecord.objects.filter(work_date__year=today.year, work_date__month=today.month)
         try:
-            year, month = map(int, month_str.split('-'))
-            return AttendanceRecord.objects.filter(work_date__year=year, work_date__month=month)
+            if month_str:
+                year, month = map(int, month_str.split('-'))
+                first_day = date(year, month, 1)
+            else:
+                first_day = timezone.localdate().replace(day=1)
+            # work_date__month(EXTRACT)는 인덱스를 못 쓰므로 [월초, 다음 달 월초) 범위로 조회합니다.
+            return records.filter(work_date__gte=first_day, work_date__lt=first_day + relativedelta(months=1))
         except (ValueError, TypeError):
             return AttendanceRecord.objects.none()
 
@@ -343,7 +583,7 @@ class AttendanceRecordListView(generics.ListAPIView):
 # 8. 관리자용 직원 관리 API
 # -------------------------------------------------------------------
 class UserManagementViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all().order_by('-date_joined')
+    queryset = User.objects.prefetch_related('groups').order_by('-date_joined')
     serializer_class = UserManagementSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     pagination_class = None
@@ -372,37 +612,159 @@ class UserManagementViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def download_clients_excel(request):
-    start_date_str = request.query_params.get('start_date')
-    end_date_str = request.query_params.get('end_date')
-    queryset = ClientData.objects.all().order_by('-created_at')
-    if start_date_str and end_date_str:
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            queryset = queryset.filter(created_at__date__range=[start_date, end_date])
-            filename = f"client_data_{start_date_str}_to_{end_date_str}.xlsx"
-        except (ValueError, TypeError):
-            filename = "client_data_all.xlsx"
-    else:
-        filename = "client_data_all.xlsx"
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = '고객 데이터'
-    headers = ['고객명', '연락처', '주소', '상담사', '가입일', '상태', '메모']
-    worksheet.append(headers)
-    for col_num, header in enumerate(headers, 1):
-        cell = worksheet.cell(row=1, column=col_num)
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    for client in queryset:
-        consultant_name = client.consultant if hasattr(client, 'consultant') else (client.owner.first_name if client.owner else '미지정')
-        row = [
-            client.name, client.contact, client.address, consultant_name,
-            client.created_at.strftime('%Y-%m-%d %H:%M'),
-            client.get_status_display(), client.note
-        ]
-        worksheet.append(row)
-    workbook.save(response)
+    """ 고객 데이터를 XLSX(기본) 또는 CSV(?file_format=csv)로 스트리밍 다운로드합니다. (큰 내보내기는 POST /api/jobs/client-export/) """
+    queryset, filename = export_queryset(request.query_params.get('start_date'), request.query_params.get('end_date'))
+    if request.query_params.get('file_format') == 'csv':
+        return stream_clients_csv(queryset, f"{filename}.csv")
+    return stream_clients_xlsx(queryset, f"{filename}.xlsx")
+
+
+# -------------------------------------------------------------------
+# 10. 실시간 이벤트 API (SSE, ASGI)
+# -------------------------------------------------------------------
+EVENT_HEARTBEAT_SECONDS = 15    # 프록시가 유휴 연결을 끊지 않도록 보내는 주석 줄 간격
+EVENT_RETRY_MILLISECONDS = 3000  # 연결이 끊기면 브라우저가 다시 연결하기까지 기다리는 시간
+
+async def event_stream(request):
+    """
+    대시보드 실시간 이벤트를 Server-Sent Events로 보냅니다. (core/events.py)
+    ASGI 서버(SERVER_MODE=asgi)에서만 동작하며, WSGI에서 요청하면 스트림을 열지 않고 501을 반환합니다.
+    EventSource는 Authorization 헤더를 보낼 수 없으므로 ?token= 으로도 인증합니다.
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI는 비동기 스트림을 끝까지 읽은 뒤에 보내므로, 끝나지 않는 이 스트림은 아무것도 보내지 못하고 워커 스레드만 점유합니다.
+        return JsonResponse({'detail': '실시간 이벤트는 ASGI 서버(SERVER_MODE=asgi)에서만 제공합니다.'},
+                            status=status.HTTP_501_NOT_IMPLEMENTED)
+    user = await sync_to_async(_authenticate_by_token)(request)
+    if user is None:
+        return JsonResponse({'detail': '인증이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+    admin = await sync_to_async(is_admin)(user)
+    response = StreamingHttpResponse(_event_messages(user.pk, admin), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 등 프록시가 응답을 모아 두지 않도록 합니다.
     return response
+
+def _authenticate_by_token(request):
+    authenticator = CachedTokenAuthentication()
+    try:
+        key = request.GET.get('token')
+        if key:
+            return authenticator.authenticate_credentials(key)[0]
+        result = authenticator.authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+async def _event_messages(user_id, admin):
+    # 구독을 먼저 등록한 뒤 첫 줄을 보내므로, 브라우저가 첫 줄을 받은 뒤의 이벤트는 빠지지 않습니다.
+    events = get_broker().subscribe()
+    pending = None
+    try:
+        yield f"retry: {EVENT_RETRY_MILLISECONDS}\n\n"
+        while True:
+            # 다음 이벤트를 기다리는 작업은 하트비트 시간 초과로 취소하지 않고 다음 반복에서 계속 기다립니다.
+            if pending is None:
+                pending = asyncio.ensure_future(anext(events))
+            done, _ = await asyncio.wait({pending}, timeout=EVENT_HEARTBEAT_SECONDS)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+            event, pending = pending.result(), None
+            if is_visible(event, user_id, admin):
+                yield format_sse(event)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
+
+
+
+# -------------------------------------------------------------------
+# 11. 백그라운드 작업 API (core/jobs.py)
+# -------------------------------------------------------------------
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    관리자 백그라운드 작업 등록/진행률 조회/결과 다운로드
+    - POST client-export/ {start_date, end_date, file_format}: 고객 내보내기 (같은 조건의 결과가 있으면 재사용, 200)
+    - POST client-import/ (excel_file, batch_size): 고객 엑셀 업로드
+    - POST distribution/ (distribute_clients와 같은 본문): 고객 배분
+    client-import/, distribution/ 은 Idempotency-Key 헤더를 보내면 재시도해도 작업을 다시 등록하지 않습니다.
+    등록하면 202와 작업 상태를 반환하며, GET <id>/ 로 진행률을, GET <id>/download/ 로 결과 파일을 받습니다.
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def _accepted(self, job):
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='client-export')
+    def client_export(self, request):
+        file_format = request.data.get('file_format') or 'xlsx'
+        if file_format not in EXPORT_FORMATS:
+            return Response({'error': f"file_format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        params = {'start_date': request.data.get('start_date'), 'end_date': request.data.get('end_date'), 'file_format': file_format}
+        cache_key = export_cache_key(params)
+        job = find_reusable_job(cache_key)
+        if job is not None:
+            return Response(self.get_serializer(job).data, status=status.HTTP_200_OK)
+        return self._accepted(submit_job('CLIENT_EXPORT', request.user, params, cache_key=cache_key))
+
+    @action(detail=False, methods=['post'], url_path='client-import')
+    @idempotent
+    def client_import(self, request):
+        excel_file = request.FILES.get('excel_file')
+        if not excel_file:
+            return Response({'error': '엑셀 파일이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        params = {'batch_size': request.data.get('batch_size')}
+        return self._accepted(submit_job('CLIENT_IMPORT', request.user, params, input_file=excel_file))
+
+    @action(detail=False, methods=['post'], url_path='distribution')
+    @idempotent
+    def distribution(self, request):
+        params = distribution_params(request.data)
+        try:
+            parse_distribution_options(params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._accepted(submit_job('DISTRIBUTION', request.user, params))
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != 'SUCCEEDED' or not job.result_file:
+            return Response({'error': '내려받을 결과 파일이 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        filename = (job.result or {}).get('filename') or os.path.basename(job.result_file.name)
+        return FileResponse(job.result_file.open('rb'), as_attachment=True, filename=filename)
+
+
+# -------------------------------------------------------------------
+# 12. 운영 지표 API (Prometheus, core/metrics.py)
+# -------------------------------------------------------------------
+def metrics_view(request):
+    """
+    라우트별 지연 시간/SQL 히스토그램을 Prometheus 텍스트 형식으로 반환합니다. (GET /metrics)
+    METRICS_TOKEN이 설정되어 있으면 `Authorization: Bearer <METRICS_TOKEN>`으로, 아니면 관리자 토큰으로 인증합니다.
+    """
+    authorization = request.headers.get('Authorization', '')
+    if not (settings.METRICS_TOKEN and hmac.compare_digest(authorization, f'Bearer {settings.METRICS_TOKEN}')):
+        user = _authenticate_by_token(request)
+        if user is None:
+            return JsonResponse({'detail': '인증이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+        if not is_admin(user):
+            return JsonResponse({'detail': '관리자만 조회할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def slow_queries_view(request):
+    """
+    SLOW_QUERY_MS보다 오래 걸린 최근 쿼리(SQL, 파라미터, 시간, 라우트, 실행 계획)를 최신순으로 반환합니다. (core/slow_queries.py)
+    DELETE는 버퍼를 비웁니다. 실행 계획은 따로 구하므로 막 기록된 쿼리는 plan이 null일 수 있습니다.
+    """
+    if request.method == 'DELETE':
+        slow_queries.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response({'threshold_ms': settings.SLOW_QUERY_MS, 'results': slow_queries.samples()})